@@ -0,0 +1,163 @@
+from jira_standin import jira_standin
+from datetime import datetime
+import multiprocessing
+import argparse
+import queue
+import tempfile
+import shutil
+import time
+import yaml
+import sys
+import os
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+STAGES = ["extract", "incremental", "report", "epics"]
+DEFAULT_STAGES = ["extract", "report", "epics"]
+OUTPUT_FILE = "bench_output.txt"
+FILTER_ID = 1
+RESULT_POLL_SECONDS = 5
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Time extract, report and epics against a synthetic Jira stand-in")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="number of issues for each run (default: 1000 10000 100000 1000000)")
+    parser.add_argument("-l", "--latency", type=float, default=0, help="seconds the stand-in waits before each response")
+    parser.add_argument("-t", "--throttle", type=float, default=0, help="fraction of requests that get a 429 response")
+    parser.add_argument("-s", "--stages", default=",".join(DEFAULT_STAGES), help="comma separated stages to run, from extract,incremental,report,epics (default: extract,report,epics)")
+    parser.add_argument("-p", "--partition", type=int, default=0, help="split the extract into this number of slices by created date")
+    parser.add_argument("-u", "--updated", type=float, default=0.01, help="fraction of issues updated in the last hour, fetched by the incremental stage (default: 0.01)")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE, help="file the results are appended to (default: bench_output.txt)")
+    parser.add_argument("-k", "--keep", action="store_true", help="keep the working folder of each run")
+    return parser.parse_args()
+
+
+def write_config(folder, url, partition = 0, incremental = False):
+    config = {
+        "jira": {"url": url, "user": "benchmark", "token": "benchmark"},
+        "request": {"backoff": 0.1, "max_backoff": 1},
+        "team": {"team1": "Team 1", "team2": "Team 2", "team3": "Team 3", "team4": "Team 4"},
+        "category": {"_unknown_": "Unknown,firebrick", "bau": "BAU,tab:blue", "project": "Project,peru", "improvement": "Improvement,tab:green"},
+        "status": {"To Do": "silver", "In Progress": "tab:blue", "Done": "tab:green", "Rejected": "tab:olive"},
+        "filter": {"bench": FILTER_ID}
+    }
+    if partition:
+        config["partition"] = {"bench": {"field": "created", "slices": partition}}
+    if incremental:
+        # The extract stage saves the watermark the incremental stage starts from
+        config["extract"] = {"incremental": True}
+    with open(os.path.join(folder, "jira_conf.yaml"), "w") as config_file:
+        yaml.safe_dump(config, config_file)
+
+
+def get_peak_memory():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage(stage, folder, filename, results):
+    os.chdir(folder)
+    sys.stdout = open(os.devnull, "w")
+    try:
+        from jira_config import jira_config
+        config = jira_config()
+
+        start = time.perf_counter()
+        if stage in ["extract", "incremental"]:
+            from jira_data import jira_data
+            filename = jira_data(config).save_filter_data(FILTER_ID)
+        elif stage == "report":
+            from jira_graph import jira_graph
+            jira_graph(config).create_ticket_graphs_by_team(filename, config.teams)
+        else:
+            from jira_epic import jira_epic
+            jira_epic(config).get_filter_data_and_plot(filename)
+        seconds = time.perf_counter() - start
+
+        results.put((seconds, get_peak_memory(), filename, None))
+    except Exception as err:
+        results.put((None, None, filename, repr(err)))
+
+
+def time_stage(context, stage, folder, filename):
+    # Each stage runs in a new process, so memory use isn't carried over from the stage before it
+    results = context.Queue()
+    process = context.Process(target=run_stage, args=(stage, folder, filename, results))
+    process.start()
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=RESULT_POLL_SECONDS)
+        except queue.Empty:
+            if not process.is_alive():
+                # Killed without reporting a result, e.g. by running out of memory
+                try:
+                    result = results.get(timeout=RESULT_POLL_SECONDS)
+                except queue.Empty:
+                    result = (None, None, filename, "process exited with code {0}".format(process.exitcode))
+    process.join()
+    return result
+
+
+def format_result(size, stage, seconds, peak_memory, requests, throttled):
+    memory = "n/a" if peak_memory is None else "{0:.0f}MB".format(peak_memory)
+    line = "{0:%Y-%m-%d %H:%M:%S} size={1} {2}: {3:.2f}s, {4:.0f} issues/s, peak {5}".format(datetime.now(), size, stage, seconds, size / seconds if seconds else 0, memory)
+    if stage in ["extract", "incremental"]:
+        line += ", {0} requests ({1} throttled)".format(requests, throttled)
+    return line
+
+
+def run_size(context, size, stages, args):
+    standin = jira_standin({"size": size, "latency": args.latency, "throttle_rate": args.throttle, "retry_after": 0, "recently_updated": args.updated})
+    url = standin.start()
+    folder = tempfile.mkdtemp(prefix="jira_bench_")
+    lines = []
+    try:
+        write_config(folder, url, args.partition, "incremental" in stages)
+        filename = ""
+        for stage in stages:
+            # Only the requests made during the stage are counted
+            requests, throttled = standin.requests, standin.throttled
+            seconds, peak_memory, filename, error = time_stage(context, stage, folder, filename)
+            if error:
+                lines.append("{0:%Y-%m-%d %H:%M:%S} size={1} {2}: failed - {3}".format(datetime.now(), size, stage, error))
+                print(lines[-1])
+                break
+            lines.append(format_result(size, stage, seconds, peak_memory, standin.requests - requests, standin.throttled - throttled))
+            print(lines[-1])
+            if stage == "extract" and len(filename) == 0:
+                break
+    finally:
+        standin.stop()
+        if args.keep:
+            print("Kept \"{0}\"".format(folder))
+        else:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    return lines
+
+
+def main():
+    args = parse_args()
+    stages = [stage for stage in STAGES if stage in args.stages.split(",")]
+    # Report and epics read the .CSV file the extract creates
+    if "extract" not in stages:
+        print("The extract stage is needed to create data for: {0}".format(", ".join(stages)))
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with open(args.output, "a") as output_file:
+        for size in args.sizes:
+            for line in run_size(context, size, stages, args):
+                output_file.write(line + "\n")
+                output_file.flush()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import time
+import os
+
+
+def get_process_age():
+    # How long ago Python was started, where the system records it, so startup includes loading the interpreter
+    try:
+        with open("/proc/self/stat") as stat_file:
+            start_ticks = int(stat_file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+START_TIME = time.perf_counter() - get_process_age()
+
+from jira_profile import jira_profile
+import argparse
+import importlib
+
+COMMANDS = ["extract", "report", "epics", "watch", "history"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Extract Jira filter data and create reports")
+    parser.add_argument("--timing", action="store_true", help="output how long startup and the command took")
+    parser.add_argument("--profile", action="store_true", help="save a JSON trace of where the time and memory went (see \"profile\" in jira_conf.yaml)")
+    parser.add_argument("command", choices=COMMANDS, help="the script to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options for the command (use -h to show them)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Only the modules the command needs are imported, pandas and matplotlib are imported when they're first used
+    command = importlib.import_module(args.command)
+    started = time.perf_counter()
+    if args.timing:
+        print("Started in {0:.2f}s".format(started - START_TIME))
+
+    profile = None
+    if args.profile:
+        # The same configuration the command uses, so it's only loaded once
+        from jira_config import get_lookup
+        profile = jira_profile(args.command, get_lookup().profile_settings, args.args).start()
+
+    try:
+        with jira_profile.span(args.command):
+            command.main(args.args)
+    finally:
+        if profile:
+            print("Saved profile to \"{0}\"".format(profile.stop()))
+
+    if args.timing:
+        print("Finished in {0:.2f}s ({1:.2f}s running {2})".format(time.perf_counter() - START_TIME, time.perf_counter() - started, args.command))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
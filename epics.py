@@ -1,36 +1,80 @@
-from jira_config import jira_config
-from jira_data import jira_data
-from jira_epic import jira_epic
+from jira_config import get_lookup
 import sys
 
-jira_lookup = jira_config()
-
 
 def get_filter_id(filter_param):
     # Try to lookup as filter name, otherwise assume it's an id
-    filter_id = jira_lookup.find_filter_id(filter_param)
+    filter_id = get_lookup().find_filter_id(filter_param)
     return filter_id if filter_id else filter_param
 
 
+def store_data_and_plot(filter_name):
+    # pandas and matplotlib are only imported when a graph is created
+    from jira_epic import jira_epic
+    from jira_store import jira_store
+
+    store_path = get_lookup().store_settings.get("path")
+    if store_path:
+        epic = jira_epic(get_lookup())
+        epic.get_store_data_and_plot(jira_store(store_path), filter_name)
+    else:
+        print("Error: no store is configured")
+
+
 def filter_data_and_plot(filter_id):
-    jira_query = jira_data(jira_lookup)
-    filename = jira_query.save_filter_data(filter_id)
+    from jira_data import jira_data
+    from jira_epic import jira_epic, COLUMNS
+
+    jira_query = jira_data(get_lookup())
+    filename = jira_query.save_filter_data(filter_id, COLUMNS, "epics")
 
     if filename:
-        epic = jira_epic(jira_lookup)
+        epic = jira_epic(get_lookup())
         epic.get_filter_data_and_plot(filename)
+    elif jira_query.filter_name:
+        # The .CSV export is turned off, so use the store
+        store_data_and_plot(jira_query.filter_name)
+
+
+def filters_data_and_plot(filter_ids):
+    # Tickets in more than one of the filters are only extracted once
+    from jira_data import jira_data
+    from jira_epic import jira_epic, COLUMNS
+
+    jira_query = jira_data(get_lookup())
+    epic = jira_epic(get_lookup())
+    for _, filename in jira_query.save_filters_data(filter_ids, COLUMNS, "epics"):
+        epic.get_filter_data_and_plot(filename)
+
+
+def get_filter_ids(filters_param = None):
+    # All the configured filters, or a comma separated list of filter names or ids
+    if filters_param is None:
+        return get_lookup().filter_ids
+    return [get_filter_id(filter_param.strip()) for filter_param in filters_param.split(",")]
 
 
 def show_usage():
     print("Usage:\r\n======")
     print("  epics.py \"<filter>\"")
+    print("  epics.py -s \"<filter_name>\"")
+    print("  epics.py -b")
+    print("  epics.py -b \"<filters>\"")
 
 
-def main():
-    args = sys.argv[1:]
-    if len(args) == 1:
+def main(args = None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) == 1 and (args[0] == "-h" or args[0] == "-help"):
+        show_usage()
+    elif len(args) == 1 and args[0] == "-b":
+        filters_data_and_plot(get_filter_ids())
+    elif len(args) == 1:
         filter_id = get_filter_id(args[0])
         filter_data_and_plot(filter_id)
+    elif len(args) == 2 and args[0] == "-s":
+        store_data_and_plot(args[1])
+    elif len(args) == 2 and args[0] == "-b":
+        filters_data_and_plot(get_filter_ids(args[1]))
     else:
         show_usage()
 
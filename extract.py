@@ -1,38 +1,56 @@
-from jira_config import jira_config
-from jira_data import jira_data
+from jira_config import get_lookup
 import sys
 
-jira_lookup = jira_config()
-
 
 def get_filter_id(filter_param):
     # Try to lookup as filter name, otherwise assume it's an id
-    filter_id = jira_lookup.find_filter_id(filter_param)
+    filter_id = get_lookup().find_filter_id(filter_param)
     return filter_id if filter_id else filter_param
 
 
+def get_filter_ids(filters_param = None):
+    # All the configured filters, or a comma separated list of filter names or ids
+    if filters_param is None:
+        return get_lookup().filter_ids
+    return [get_filter_id(filter_param.strip()) for filter_param in filters_param.split(",")]
+
+
 def show_usage():
     print("Usage:\r\n======")
     print("  extract.py")
     print("  extract.py \"<filter>\"")
+    print("  extract.py -c")
+    print("  extract.py -b")
+    print("  extract.py -b \"<filters>\"")
 
 
-def main():
-    jira_query = jira_data(jira_lookup)
+def main(args = None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) == 1 and (args[0] == "-h" or args[0] == "-help"):
+        show_usage()
+        return
+
+    # Imported here so showing the usage doesn't load pandas
+    from jira_data import jira_data
+    jira_query = jira_data(get_lookup())
 
-    args = sys.argv[1:]
     if len(args) == 0:
         # Try using the first filter configured
-        filter_id = jira_lookup.first_filter_id
+        filter_id = get_lookup().first_filter_id
         if filter_id:
             jira_query.save_filter_data(filter_id)
         else:
             print("Error: no filters are configured") 
     elif len(args) == 1:
-        if args[0] == "-h" or args[0] == "-help":
-            show_usage()
+        if args[0] == "-c":
+            jira_query.clear_metadata_cache()
+            print("Cleared metadata cache")
+        elif args[0] == "-b":
+            jira_query.save_filters_data(get_filter_ids())
         else:
             jira_query.save_filter_data(get_filter_id(args[0]))
+    elif len(args) == 2 and args[0] == "-b":
+        jira_query.save_filters_data(get_filter_ids(args[1]))
     else:
         print("Unknown args: " + str(args))
         show_usage()
@@ -0,0 +1,76 @@
+from jira_config import get_lookup
+from datetime import datetime
+import sys
+import os.path
+import os
+
+DATA_PATH = ".//data"
+
+
+def get_history():
+    # Imported here so showing the usage doesn't load pandas
+    from jira_history import jira_history
+    return jira_history(get_lookup().history_settings.get("path", ".//data//history.db"))
+
+
+def get_filter_folder(filter_name):
+    return "{0}//{1}".format(DATA_PATH, filter_name.replace("/", "_"))
+
+
+def import_snapshots(filter_names = None):
+    if filter_names is None:
+        folders = [entry.path for entry in os.scandir(DATA_PATH) if entry.is_dir()] if os.path.exists(DATA_PATH) else []
+    else:
+        folders = [get_filter_folder(filter_name) for filter_name in filter_names if os.path.exists(get_filter_folder(filter_name))]
+
+    history = get_history()
+    imported = history.import_folders(sorted(folders), get_lookup().history_settings.get("workers", 1))
+    print("Imported {0} snapshots from {1} filters into \"{2}\"".format(imported, len(folders), history.filename))
+
+
+def save_filter_state(filter_name, day):
+    try:
+        day_date = datetime.strptime(day, "%Y-%m-%d")
+    except ValueError:
+        print("Unknown date: \"{0}\", use yyyy-mm-dd".format(day))
+        return
+
+    history = get_history()
+    data = history.read_state(filter_name.replace("/", "_"), day)
+    filename = "{0}//{1:%Y_%m_%d}_history.csv".format(get_filter_folder(filter_name), day_date)
+    data.to_csv(filename, index=False)
+    print("Saved {0} tickets on {1} to \"{2}\"".format(len(data), day, filename))
+
+
+def save_cumulative_flow(filter_name):
+    history = get_history()
+    data = history.cumulative_flow(filter_name.replace("/", "_"))
+    filename = "{0}//{1:%Y_%m_%d}_cumulative_flow.csv".format(get_filter_folder(filter_name), datetime.now())
+    data.to_csv(filename, date_format="%Y-%m-%d")
+    print("Saved {0} days of cumulative flow to \"{1}\"".format(len(data), filename))
+
+
+def show_usage():
+    print("Usage:\r\n======")
+    print("  history.py")
+    print("  history.py -i \"<filter_names>\"")
+    print("  history.py \"<filter_name>\" <yyyy-mm-dd>")
+    print("  history.py -c \"<filter_name>\"")
+
+
+def main(args = None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) == 0:
+        import_snapshots()
+    elif len(args) == 2 and args[0] == "-i":
+        import_snapshots([filter_name.strip() for filter_name in args[1].split(",")])
+    elif len(args) == 2 and args[0] == "-c":
+        save_cumulative_flow(args[1])
+    elif len(args) == 2 and args[0] != "-h":
+        save_filter_state(args[0], args[1])
+    else:
+        show_usage()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
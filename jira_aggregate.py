@@ -0,0 +1,137 @@
+import pandas as pd
+
+AVERAGE = "Average"
+CATEGORY = "Category"
+CYCLE_DAYS = "Cycle Days"
+LEAD_DAYS = "Lead Days"
+RESOLVED = "Resolved"
+STORY_POINTS = "Story Points"
+TEAM = "Team"
+TICKETS = "Tickets"
+GRAIN = "Grain"
+MONTH = "month"
+WEEK = "week"
+
+WEEKLY_COLUMNS = [CYCLE_DAYS, LEAD_DAYS]
+WEEKLY_AGGREGATES = ["mean", "min", "max"]
+
+
+class jira_aggregate(object):
+
+
+    def __init__(self, data, cells = None):
+        # Split the rows by team once, each team keeps its rows in their original order
+        self.__team_rows = {}
+        if data is not None:
+            self.__team_rows = {team: rows for team, rows in data.groupby(TEAM, sort=False, observed=True)}
+
+        if cells is not None:
+            # A rollup's cells (see jira_rollup) already have the counts and sums, the rows are then only needed for team_rows
+            self.__aggregate_cells(cells)
+            return
+
+        self.__team_averages = {team: {column: rows[column].mean() for column in WEEKLY_COLUMNS} for team, rows in self.__team_rows.items()}
+
+        self.__monthly_categories = self.__split_by_team(self.__aggregate_monthly_categories(data))
+        self.__monthly_totals = self.__split_by_team(self.__aggregate_monthly_totals(data))
+        self.__weekly_stats = self.__split_by_team(self.__aggregate_weekly_stats(data))
+
+
+    def __split_by_team(self, aggregated):
+        return {team: frame.droplevel(TEAM) for team, frame in aggregated.groupby(level=TEAM, sort=False, observed=True)}
+
+
+    def __aggregate_monthly_categories(self, data):
+        return data.groupby([TEAM, pd.Grouper(key=RESOLVED, freq='ME'), CATEGORY], observed=True).size().to_frame(name=TICKETS)
+
+
+    def __aggregate_monthly_totals(self, data):
+        return data.groupby([TEAM, pd.Grouper(key=RESOLVED, freq='ME')], observed=True).agg(**{
+            TICKETS: (STORY_POINTS, "size"),
+            STORY_POINTS: (STORY_POINTS, "sum")
+        })
+
+
+    def __aggregate_weekly_stats(self, data):
+        # Each row carries its team's average, so the weekly average is calculated the same way as the other weekly values
+        teams = data[TEAM].astype(object)
+        weekly_data = data[[TEAM, RESOLVED] + WEEKLY_COLUMNS].copy()
+        aggregations = {}
+        for column in WEEKLY_COLUMNS:
+            average_column = "{0} {1}".format(column, AVERAGE)
+            weekly_data[average_column] = teams.map({team: averages[column] for team, averages in self.__team_averages.items()}).astype("float64")
+            aggregations[average_column] = (average_column, "mean")
+            for aggregate in WEEKLY_AGGREGATES:
+                aggregations["{0} {1}".format(column, aggregate)] = (column, aggregate)
+
+        return weekly_data.groupby([TEAM, pd.Grouper(key=RESOLVED, freq='W')], observed=True).agg(**aggregations)
+
+
+    def __aggregate_cells(self, cells):
+        cells = cells.dropna(subset=[TEAM])
+        if len(self.__team_rows) > 0:
+            # The same as the averages calculated from the rows, which are exported with them
+            self.__team_averages = {team: {column: rows[column].mean() for column in WEEKLY_COLUMNS} for team, rows in self.__team_rows.items()}
+        else:
+            team_cells = cells.loc[cells[GRAIN] == WEEK].groupby(TEAM, sort=False).sum(numeric_only=True)
+            self.__team_averages = {team: {column: self.__get_mean(totals, column) for column in WEEKLY_COLUMNS} for team, totals in team_cells.iterrows()}
+
+        # Tickets without a resolved date aren't in any month or week
+        monthly_cells = cells.loc[(cells[GRAIN] == MONTH) & cells[RESOLVED].notna()]
+        monthly_categories = monthly_cells.dropna(subset=[CATEGORY]).groupby([TEAM, RESOLVED, CATEGORY]).agg(**{TICKETS: (TICKETS, "sum")})
+        monthly_totals = monthly_cells.groupby([TEAM, RESOLVED]).agg(**{TICKETS: (TICKETS, "sum"), STORY_POINTS: (STORY_POINTS, "sum")})
+        self.__monthly_categories = self.__split_by_team(monthly_categories)
+        self.__monthly_totals = self.__split_by_team(monthly_totals)
+        self.__weekly_stats = self.__split_by_team(self.__aggregate_weekly_cells(cells.loc[(cells[GRAIN] == WEEK) & cells[RESOLVED].notna()]))
+
+
+    def __get_mean(self, totals, column):
+        count = totals["{0} count".format(column)]
+        return totals["{0} sum".format(column)] / count if count > 0 else float("nan")
+
+
+    def __aggregate_weekly_cells(self, cells):
+        aggregations = {}
+        for column in WEEKLY_COLUMNS:
+            for measure, aggregate in [("sum", "sum"), ("count", "sum"), ("min", "min"), ("max", "max")]:
+                name = "{0} {1}".format(column, measure)
+                aggregations[name] = (name, aggregate)
+        weeks = cells.groupby([TEAM, RESOLVED]).agg(**aggregations)
+
+        # Every week has tickets, so the average is the team's average (missing when the team has no values)
+        teams = weeks.index.get_level_values(TEAM)
+        weekly_stats = pd.DataFrame(index=weeks.index)
+        for column in WEEKLY_COLUMNS:
+            count = weeks["{0} count".format(column)]
+            weekly_stats["{0} {1}".format(column, AVERAGE)] = [self.__team_averages[team][column] for team in teams]
+            weekly_stats["{0} mean".format(column)] = (weeks["{0} sum".format(column)] / count).where(count > 0)
+            weekly_stats["{0} min".format(column)] = weeks["{0} min".format(column)]
+            weekly_stats["{0} max".format(column)] = weeks["{0} max".format(column)]
+
+        return weekly_stats
+
+
+    def team_rows(self, team):
+        return self.__team_rows[team]
+
+
+    def team_average(self, team, column):
+        return self.__team_averages[team][column]
+
+
+    def monthly_categories(self, team):
+        # Months without any tickets are not included
+        return self.__monthly_categories[team].reset_index()
+
+
+    def monthly_totals(self, team):
+        # Months without any tickets are included as zero, from the first to the last month the team resolved a ticket
+        totals = self.__monthly_totals[team]
+        months = pd.date_range(totals.index.min(), totals.index.max(), freq='ME', name=RESOLVED)
+        return totals.reindex(months, fill_value=0)
+
+
+    def weekly_stats(self, team, column, aggregate):
+        # Weeks without a value are not included
+        name = "{0} {1}".format(column, aggregate)
+        return self.__weekly_stats[team][[name]].dropna().rename(columns={name: column})
\ No newline at end of file
@@ -0,0 +1,57 @@
+import unittest
+import pandas as pd
+from jira_aggregate import jira_aggregate
+
+MY_TEAM = "My team"
+ANOTHER_TEAM = "Another team"
+
+
+class jira_aggregate_test(unittest.TestCase):
+
+
+    def setUp(self):
+        data = pd.DataFrame({
+            "Team": [MY_TEAM, ANOTHER_TEAM, MY_TEAM, MY_TEAM],
+            "Category": ["BAU", "BAU", "Project", "BAU"],
+            "Resolved": pd.to_datetime(["2021-01-04", "2021-01-05", "2021-01-06", "2021-03-10"]),
+            "Story Points": [1.0, 2.0, None, 3.0],
+            "Lead Days": [2.0, 4.0, 6.0, 10.0],
+            "Cycle Days": [1.0, None, None, 5.0]
+        })
+        self.aggregate = jira_aggregate(data)
+
+
+    def test_team_rows_kept_in_order(self):
+        actual = self.aggregate.team_rows(MY_TEAM)
+        self.assertEqual(actual["Lead Days"].tolist(), [2.0, 6.0, 10.0])
+
+
+    def test_team_average_calculated(self):
+        actual = self.aggregate.team_average(MY_TEAM, "Lead Days")
+        self.assertEqual(actual, 6.0)
+
+
+    def test_monthly_categories_counted(self):
+        actual = self.aggregate.monthly_categories(MY_TEAM)
+        self.assertEqual(actual["Category"].tolist(), ["BAU", "Project", "BAU"])
+        self.assertEqual(actual["Tickets"].tolist(), [1, 1, 1])
+
+
+    def test_monthly_totals_include_empty_months(self):
+        actual = self.aggregate.monthly_totals(MY_TEAM)
+        self.assertEqual(actual["Tickets"].tolist(), [2, 0, 1])
+        self.assertEqual(actual["Story Points"].tolist(), [1.0, 0.0, 3.0])
+
+
+    def test_weekly_stats_exclude_weeks_without_a_value(self):
+        actual = self.aggregate.weekly_stats(ANOTHER_TEAM, "Cycle Days", "max")
+        self.assertEqual(len(actual), 0)
+
+
+    def test_weekly_stats_calculated_for_each_week(self):
+        actual = self.aggregate.weekly_stats(MY_TEAM, "Lead Days", "mean")
+        self.assertEqual(actual["Lead Days"].tolist(), [4.0, 10.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+import threading
+import hashlib
+import json
+import time
+import os
+import os.path
+
+
+class jira_metadata_cache(object):
+
+
+    def __init__(self, filename, ttl, offline):
+        self.__filename = filename
+        self.__ttl = ttl
+        self.__offline = offline
+        self.__lock = threading.Lock()
+        self.__entries = {}
+
+        if os.path.exists(filename):
+            with open(filename, "r", encoding="UTF-8") as cache_file:
+                self.__entries = json.load(cache_file)
+
+
+    @property
+    def offline(self):
+        return self.__offline
+
+
+    def get(self, key):
+        # Offline runs use whatever is cached, however old it is
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        if self.__offline or time.time() - entry["fetched"] < self.__ttl:
+            return entry["data"]
+        return None
+
+
+    def __save(self):
+        folder = os.path.dirname(self.__filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        temp_filename = "{0}.tmp".format(self.__filename)
+        with open(temp_filename, "w", encoding="UTF-8") as cache_file:
+            json.dump(self.__entries, cache_file)
+        os.replace(temp_filename, self.__filename)
+
+
+    def set(self, key, data):
+        with self.__lock:
+            self.__entries[key] = {"fetched": time.time(), "data": data}
+            self.__save()
+
+
+    def clear(self):
+        with self.__lock:
+            self.__entries = {}
+            if os.path.exists(self.__filename):
+                os.remove(self.__filename)
+
+
+class jira_response_cache(object):
+    __extension = ".json"
+
+
+    def __init__(self, path, max_size_mb):
+        self.__path = path
+        self.__max_bytes = max_size_mb * 1024 * 1024
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+        # Least recently used first, the modified time of each file is its last use so the order carries over between runs
+        self.__sizes = OrderedDict()
+        self.__total_bytes = 0
+        if os.path.exists(path):
+            entries = [entry for entry in os.scandir(path) if entry.name.endswith(self.__extension)]
+            for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+                self.__sizes[entry.name] = entry.stat().st_size
+                self.__total_bytes += entry.stat().st_size
+        else:
+            os.makedirs(path)
+
+
+    @property
+    def hits(self):
+        return self.__hits
+
+
+    @property
+    def misses(self):
+        return self.__misses
+
+
+    @property
+    def size(self):
+        return self.__total_bytes
+
+
+    def __get_filename(self, key):
+        # Named by a hash of the request, so any URL can be used as a key
+        return hashlib.sha256(key.encode("UTF-8")).hexdigest() + self.__extension
+
+
+    def get(self, key):
+        # Returns the response body exactly as it was received, or None
+        name = self.__get_filename(key)
+        with self.__lock:
+            if name not in self.__sizes:
+                self.__misses += 1
+                return None
+            self.__sizes.move_to_end(name)
+            self.__hits += 1
+
+        filename = os.path.join(self.__path, name)
+        try:
+            with open(filename, "rb") as response_file:
+                content = response_file.read()
+            os.utime(filename)
+        except FileNotFoundError:
+            return None
+        return content
+
+
+    def __evict(self, keep_name):
+        while self.__total_bytes > self.__max_bytes and len(self.__sizes) > 1:
+            name, size = next(iter(self.__sizes.items()))
+            if name == keep_name:
+                break
+            del self.__sizes[name]
+            self.__total_bytes -= size
+            try:
+                os.remove(os.path.join(self.__path, name))
+            except FileNotFoundError:
+                pass
+
+
+    def set(self, key, content):
+        name = self.__get_filename(key)
+        filename = os.path.join(self.__path, name)
+        temp_filename = "{0}.{1}.tmp".format(filename, threading.get_ident())
+        with open(temp_filename, "wb") as response_file:
+            response_file.write(content)
+        os.replace(temp_filename, filename)
+
+        with self.__lock:
+            self.__total_bytes += len(content) - self.__sizes.pop(name, 0)
+            self.__sizes[name] = len(content)
+            self.__evict(name)
+
+
+    def clear(self):
+        with self.__lock:
+            for name in self.__sizes:
+                try:
+                    os.remove(os.path.join(self.__path, name))
+                except FileNotFoundError:
+                    pass
+            self.__sizes.clear()
+            self.__total_bytes = 0
\ No newline at end of file
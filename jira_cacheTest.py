@@ -0,0 +1,79 @@
+import unittest
+import tempfile
+import os.path
+from jira_cache import jira_metadata_cache, jira_response_cache
+
+KEY = "https://your-domain.atlassian.net/rest/api/3/filter/12345"
+DATA = {"name": "Work Done", "jql": "project = ABC"}
+SEARCH_KEY = "https://your-domain.atlassian.net/rest/api/3/search/jql?jql=project%20%3D%20ABC"
+CONTENT = b'{"issues": []}'
+
+
+class jira_cache_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, "cache", "metadata.json")
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    def test_cached_data_returned_by_new_cache(self):
+        jira_metadata_cache(self.filename, 60, False).set(KEY, DATA)
+        actual = jira_metadata_cache(self.filename, 60, False).get(KEY)
+        self.assertEqual(actual, DATA)
+
+
+    def test_expired_data_not_returned(self):
+        jira_metadata_cache(self.filename, 0, False).set(KEY, DATA)
+        actual = jira_metadata_cache(self.filename, 0, False).get(KEY)
+        self.assertIsNone(actual)
+
+
+    def test_expired_data_returned_when_offline(self):
+        jira_metadata_cache(self.filename, 0, False).set(KEY, DATA)
+        actual = jira_metadata_cache(self.filename, 0, True).get(KEY)
+        self.assertEqual(actual, DATA)
+
+
+    def test_clear_removes_cached_data(self):
+        cache = jira_metadata_cache(self.filename, 60, False)
+        cache.set(KEY, DATA)
+        cache.clear()
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertIsNone(jira_metadata_cache(self.filename, 60, False).get(KEY))
+
+
+
+    def test_response_returned_by_new_cache(self):
+        folder = os.path.join(self.folder.name, "responses")
+        jira_response_cache(folder, 1).set(SEARCH_KEY, CONTENT)
+        cache = jira_response_cache(folder, 1)
+        self.assertEqual(cache.get(SEARCH_KEY), CONTENT)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+
+    def test_missing_response_counted(self):
+        cache = jira_response_cache(os.path.join(self.folder.name, "responses"), 1)
+        self.assertIsNone(cache.get(SEARCH_KEY))
+        self.assertEqual(cache.misses, 1)
+
+
+    def test_least_recently_used_response_evicted(self):
+        # Room for two responses
+        cache = jira_response_cache(os.path.join(self.folder.name, "responses"), 2 * len(CONTENT) / (1024 * 1024))
+        cache.set("first", CONTENT)
+        cache.set("second", CONTENT)
+        cache.get("first")
+        cache.set("third", CONTENT)
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("first"), CONTENT)
+        self.assertEqual(cache.get("third"), CONTENT)
+        self.assertEqual(cache.size, 2 * len(CONTENT))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+STATUS = "status"
+
+
+class jira_changelog(object):
+    # Docs https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issues/#api-rest-api-3-changelog-bulkfetch-post
+    __params_bulk_fetch = "changelog/bulkfetch"
+    __default_settings = {"batch_size": 1000, "workers": 4, "max_results": 10000}
+
+
+    def __init__(self, jira_api, transitions, settings = None):
+        self.__jira_api = jira_api
+        self.__transitions = transitions
+        self.__settings = dict(self.__default_settings)
+        if settings:
+            self.__settings.update(settings)
+
+
+    @property
+    def transitions(self):
+        return self.__transitions
+
+
+    def __format_date(self, created):
+        # Saved in UTC so the dates sort as text, Jira returns either an ISO date or milliseconds since 1970
+        if isinstance(created, (int, float)):
+            changed = datetime.fromtimestamp(created / 1000, timezone.utc)
+        else:
+            changed = datetime.strptime(created, DATE_FORMAT).astimezone(timezone.utc)
+        return changed.isoformat(timespec="milliseconds")
+
+
+    def __fetch_batch(self, issue_ids):
+        # Every page of status changes for up to batch_size issues, by issue id
+        status_changes = {}
+        body = {"issueIdsOrKeys": issue_ids, "fieldIds": [STATUS], "maxResults": self.__settings["max_results"]}
+        while True:
+            data = self.__jira_api.post_api3_request(self.__params_bulk_fetch, body)
+            for issue_changelog in data.get("issueChangeLogs", []):
+                changes = status_changes.setdefault(issue_changelog["issueId"], [])
+                for history in issue_changelog.get("changeHistories", []):
+                    changed = None
+                    for item in history.get("items", []):
+                        if item.get("fieldId", item.get("field")) == STATUS:
+                            changed = changed if changed else self.__format_date(history["created"])
+                            changes.append((changed, item.get("fromString"), item.get("toString")))
+
+            next_page_token = data.get("nextPageToken")
+            if not next_page_token:
+                return status_changes
+            body = dict(body, nextPageToken=next_page_token)
+
+
+    def update(self, issues):
+        # issues has the (id, updated) of each key, only those not fetched before or updated since are fetched
+        fetched_updated = self.__transitions.get_updated()
+        stale_keys = [key for key, (_, updated) in issues.items()
+                      if key not in fetched_updated or (updated is not None and updated != fetched_updated[key])]
+
+        batch_size = self.__settings["batch_size"]
+        batches = [stale_keys[index:index + batch_size] for index in range(0, len(stale_keys), batch_size)]
+        transition_count = 0
+        with ThreadPoolExecutor(max_workers=self.__settings["workers"]) as executor:
+            status_changes = executor.map(self.__fetch_batch, [[issues[key][0] for key in batch] for batch in batches])
+            for batch, batch_changes in zip(batches, status_changes):
+                transitions = {}
+                for key in batch:
+                    # Changes in the same second keep the order Jira returned them in
+                    transitions[key] = sorted(batch_changes.get(issues[key][0], []), key=lambda change: change[0])
+                    transition_count += len(transitions[key])
+                self.__transitions.save_transitions([(key, issues[key][0], issues[key][1]) for key in batch], transitions)
+
+        return len(stale_keys), transition_count
\ No newline at end of file
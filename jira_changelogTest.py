@@ -0,0 +1,71 @@
+import unittest
+import tempfile
+import os.path
+from jira_standin import jira_standin
+from jira_request import jira_request
+from jira_transitions import jira_transitions
+from jira_changelog import jira_changelog
+
+
+class jira_changelog_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.standin = jira_standin({"size": 50})
+        api = jira_request(self.standin.start(), ("user", "token"))
+        self.transitions = jira_transitions(os.path.join(self.folder.name, "transitions.db"))
+        self.changelog = jira_changelog(api, self.transitions, {"batch_size": 20, "max_results": 10})
+        issues = [self.standin.get_issue(index) for index in range(50)]
+        self.issues = {issue["key"]: (issue["id"], issue["fields"]["updated"]) for issue in issues}
+
+
+    def tearDown(self):
+        self.standin.stop()
+        self.transitions.close()
+        self.folder.cleanup()
+
+
+    def test_all_changelogs_fetched_the_first_time(self):
+        fetched, transitions = self.changelog.update(self.issues)
+        self.assertEqual(fetched, 50)
+        expected = sum(len(self.standin.get_changelog(index)["changeHistories"]) for index in range(50))
+        self.assertEqual(transitions, expected)
+
+
+    def test_only_updated_issues_fetched_again(self):
+        self.changelog.update(self.issues)
+        self.issues["BENCH-7"] = (self.issues["BENCH-7"][0], "2030-01-01T00:00:00.000+0000")
+        fetched, _ = self.changelog.update(self.issues)
+        self.assertEqual(fetched, 1)
+
+
+    def test_unchanged_issues_not_fetched_again(self):
+        self.changelog.update(self.issues)
+        requests = self.standin.requests
+        fetched, transitions = self.changelog.update(self.issues)
+        self.assertEqual((fetched, transitions, self.standin.requests), (0, 0, requests))
+
+
+    def test_only_new_issues_fetched_after_filter_grows(self):
+        self.changelog.update({key: self.issues[key] for key in list(self.issues)[0:40]})
+        fetched, _ = self.changelog.update(self.issues)
+        self.assertEqual(fetched, 10)
+
+
+    def test_issue_without_updated_date_not_fetched_again(self):
+        self.changelog.update(self.issues)
+        self.issues["BENCH-7"] = (self.issues["BENCH-7"][0], None)
+        fetched, _ = self.changelog.update(self.issues)
+        self.assertEqual(fetched, 0)
+
+
+    def test_status_changes_saved_in_date_order(self):
+        self.changelog.update(self.issues)
+        data = self.transitions.read_transitions()
+        for _, changes in data.groupby("Key"):
+            self.assertTrue(changes["Changed"].is_monotonic_increasing)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,5 +1,13 @@
+from functools import lru_cache
+import threading
 import yaml
 
+LOOKUP_CACHE_SIZE = 4096
+UNMATCHED_EXAMPLES = 3
+# Jira custom field ids can differ between sites
+DEFAULT_CUSTOM_FIELDS = {"story_points": "customfield_10016", "story_point_estimate": "customfield_10024", "time_in_status": "customfield_10023"}
+DEFAULT_STATUS_COLOUR = "tab:red"
+
 
 class jira_config(object):
     __jira_config_file = "jira_conf.yaml"
@@ -8,6 +16,20 @@ class jira_config(object):
     __category_colours = {}
     __filters = {}
     __status_colours = {}
+    __request_settings = {}
+    __extract_settings = {}
+    __partitions = {}
+    __store_settings = {}
+    __metadata_settings = {}
+    __response_cache_settings = {}
+    __report_settings = {}
+    __epic_settings = {}
+    __changelog_settings = {}
+    __history_settings = {}
+    __watch_settings = {}
+    __profile_settings = {}
+    __custom_fields = DEFAULT_CUSTOM_FIELDS
+    __time_in_status = {"To Do": ["to do"], "In Progress": ["in progress"]}
 
 
     def __init__(self, config_file = None):
@@ -15,6 +37,11 @@ class jira_config(object):
             self.__jira_config_file = config_file
         self.__load_config()
 
+        # Issues share a small number of label sets, so each set is only resolved once
+        self.__resolve_labels = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self.__find_category_and_team)
+        self.__unmatched_teams = {}
+        self.__unmatched_lock = threading.Lock()
+
 
     def __load_config(self):
         with open(self.__jira_config_file, "r") as config_file:
@@ -24,7 +51,8 @@ class jira_config(object):
             self.__auth_values = jira_config["jira"]["user"], jira_config["jira"]["token"]
 
             try:
-                self.__teams = jira_config["team"]
+                # Keys are matched against casefolded labels, so normalise them once here
+                self.__teams = {str(key).casefold(): team for key, team in jira_config["team"].items()}
             except KeyError:
                 pass
             try:
@@ -39,12 +67,70 @@ class jira_config(object):
                 self.__filters = jira_config["filter"]
             except KeyError:
                 pass
+            try:
+                self.__request_settings = jira_config["request"]
+            except KeyError:
+                pass
+            try:
+                self.__extract_settings = jira_config["extract"]
+            except KeyError:
+                pass
+            try:
+                self.__partitions = jira_config["partition"]
+            except KeyError:
+                pass
+            try:
+                self.__store_settings = jira_config["store"]
+            except KeyError:
+                pass
+            try:
+                self.__metadata_settings = jira_config["metadata"]
+            except KeyError:
+                pass
+            try:
+                self.__response_cache_settings = jira_config["response_cache"]
+            except KeyError:
+                pass
+            try:
+                self.__report_settings = jira_config["report"]
+            except KeyError:
+                pass
+            try:
+                self.__epic_settings = jira_config["epics"]
+            except KeyError:
+                pass
+            try:
+                self.__changelog_settings = jira_config["changelog"]
+            except KeyError:
+                pass
+            try:
+                self.__history_settings = jira_config["history"]
+            except KeyError:
+                pass
+            try:
+                self.__watch_settings = jira_config["watch"]
+            except KeyError:
+                pass
+            try:
+                self.__profile_settings = jira_config["profile"]
+            except KeyError:
+                pass
+            try:
+                self.__custom_fields = dict(DEFAULT_CUSTOM_FIELDS, **jira_config["fields"])
+            except KeyError:
+                pass
+            try:
+                self.__load_time_in_status_config(jira_config["time_in_status"])
+            except KeyError:
+                pass
 
 
     def __load_category_config(self, categories):
+        self.__categories = {}
+        self.__category_colours = {}
         for key in categories:
             category = categories.get(key).split(",")[0].strip()
-            self.__categories[key] = category
+            self.__categories[str(key).casefold()] = category
             colour = categories.get(key).split(",")[1].strip()
             self.__category_colours[category] = colour
 
@@ -54,6 +140,13 @@ class jira_config(object):
             self.__category_colours["Unknown"] = "red"
 
 
+    def __load_time_in_status_config(self, buckets):
+        # "To Do" and "In Progress" are always the first buckets, the configured statuses replace the defaults
+        self.__time_in_status = dict(self.__time_in_status)
+        for bucket in buckets:
+            self.__time_in_status[bucket] = [status.casefold() for status in buckets.get(bucket)]
+
+
     @property
     def auth_values(self):
         return self.__auth_values
@@ -69,6 +162,31 @@ class jira_config(object):
         return self.__category_colours
 
 
+    @property
+    def changelog_settings(self):
+        return self.__changelog_settings
+
+
+    @property
+    def history_settings(self):
+        return self.__history_settings
+
+
+    @property
+    def custom_fields(self):
+        return self.__custom_fields
+
+
+    @property
+    def epic_settings(self):
+        return self.__epic_settings
+
+
+    @property
+    def extract_settings(self):
+        return self.__extract_settings
+
+
     @property
     def first_filter_id(self):
         if len(self.__filters) > 0:
@@ -76,6 +194,73 @@ class jira_config(object):
         return None
 
 
+    @property
+    def filter_ids(self):
+        return list(self.__filters.values())
+
+
+    @property
+    def metadata_settings(self):
+        return self.__metadata_settings
+
+
+    @property
+    def lookup_stats(self):
+        cache_info = self.__resolve_labels.cache_info()
+        return {"hits": cache_info.hits, "misses": cache_info.misses, "size": cache_info.currsize}
+
+
+    @property
+    def unmatched_teams(self):
+        with self.__unmatched_lock:
+            return {lookup_key: (count, list(keys)) for lookup_key, (count, keys) in self.__unmatched_teams.items()}
+
+
+    def clear_unmatched_teams(self):
+        with self.__unmatched_lock:
+            self.__unmatched_teams = {}
+
+
+    @property
+    def profile_settings(self):
+        return self.__profile_settings
+
+
+    @property
+    def report_settings(self):
+        return self.__report_settings
+
+
+    @property
+    def request_settings(self):
+        return self.__request_settings
+
+
+    @property
+    def response_cache_settings(self):
+        return self.__response_cache_settings
+
+
+    @property
+    def status_colours(self):
+        return self.__status_colours
+
+
+    @property
+    def store_settings(self):
+        return self.__store_settings
+
+
+    @property
+    def watch_settings(self):
+        return self.__watch_settings
+
+
+    @property
+    def time_in_status_buckets(self):
+        return self.__time_in_status
+
+
     @property
     def teams(self):
         # don't return duplicates
@@ -97,14 +282,59 @@ class jira_config(object):
                 return category
         return self.__categories.get("_unknown_")
 
+
+    def __find_category_and_team(self, labels, project):
+        team = self.find_team(labels)
+        if len(team) == 0:
+            team = self.find_team([project])
+
+        return self.find_category(labels), team
+
+
+    def resolve(self, key, labels):
+        # Returns the category and team for an issue, using the project key when no label matches a team
+        lookup_key = (tuple(labels), key.split("-")[0])
+        category, team = self.__resolve_labels(*lookup_key)
+        if len(team) == 0:
+            # Only the number of issues and a few example keys are kept for each label set
+            with self.__unmatched_lock:
+                unmatched = self.__unmatched_teams.setdefault(lookup_key, [0, []])
+                unmatched[0] += 1
+                if len(unmatched[1]) < UNMATCHED_EXAMPLES:
+                    unmatched[1].append(key)
+
+        return category, team
+
     
     def find_filter_id(self, filter):
         return self.__filters.get(filter)
 
 
+    def find_partition(self, filter_id):
+        # Partitions can be configured using the filter name or id
+        for filter_name, configured_id in self.__filters.items():
+            if str(configured_id) == str(filter_id) and filter_name in self.__partitions:
+                return self.__partitions.get(filter_name)
+
+        for key in self.__partitions:
+            if str(key) == str(filter_id):
+                return self.__partitions.get(key)
+        return None
+
+
     def find_status_colour(self, status):
         status_colour = self.__status_colours.get(status)
         if status_colour is None:
-            status_colour = "tab:red"
+            status_colour = DEFAULT_STATUS_COLOUR
+
+        return status_colour
+
+jira_lookup = None
+
 
-        return status_colour
\ No newline at end of file
+def get_lookup():
+    # The configuration is only loaded when a command needs it, and then shared by everything the command runs
+    global jira_lookup
+    if jira_lookup is None:
+        jira_lookup = jira_config()
+    return jira_lookup
\ No newline at end of file
@@ -49,6 +49,32 @@ class jira_config_test(unittest.TestCase):
         self.assertEqual(actual, UNKNOWN)
 
 
+    def test_team_resolved_from_project_key(self):
+        actual = self.config.resolve("TEAM2-1", ["misc"])
+        self.assertEqual(actual, (UNKNOWN, ANOTHER_TEAM))
+
+
+    def test_repeated_label_set_resolved_from_cache(self):
+        self.config.resolve("ABC-1", ["team1", "bau"])
+        actual = self.config.resolve("ABC-2", ["team1", "bau"])
+        self.assertEqual(actual, (BAU, MY_TEAM))
+        self.assertEqual(self.config.lookup_stats, {"hits": 1, "misses": 1, "size": 1})
+
+
+    def test_unmatched_teams_collected_by_label_set(self):
+        self.config.resolve("ABC-1", ["misc"])
+        self.config.resolve("ABC-2", ["misc"])
+        actual = self.config.unmatched_teams
+        self.assertEqual(actual, {(("misc",), "ABC"): (2, ["ABC-1", "ABC-2"])})
+
+
+    def test_unmatched_teams_keep_count_and_first_keys(self):
+        for index in range(10):
+            self.config.resolve("ABC-{0}".format(index), ["misc"])
+        actual = self.config.unmatched_teams
+        self.assertEqual(actual, {(("misc",), "ABC"): (10, ["ABC-0", "ABC-1", "ABC-2"])})
+
+
     def test_find_filter_id(self):
         actual = self.config.find_filter_id("work_done")
         self.assertEqual(actual, 12345)
@@ -94,5 +120,55 @@ class jira_config_test(unittest.TestCase):
         self.assertEqual(actual, "tab:red")
 
 
+    def test_request_settings_returned(self):
+        actual = self.config.request_settings
+        self.assertEqual(actual, {"pool_size": 4, "read_timeout": 30})
+
+
+    def test_all_filter_ids_returned(self):
+        actual = self.config.filter_ids
+        self.assertEqual(actual, [12345])
+
+
+    def test_default_custom_fields_if_not_configured(self):
+        actual = self.config.custom_fields
+        self.assertEqual(actual, {"story_points": "customfield_10016", "story_point_estimate": "customfield_10024", "time_in_status": "customfield_10023"})
+
+
+    def test_profile_settings_empty_if_not_configured(self):
+        actual = self.config.profile_settings
+        self.assertEqual(actual, {})
+
+
+    def test_watch_settings_empty_if_not_configured(self):
+        actual = self.config.watch_settings
+        self.assertEqual(actual, {})
+
+
+    def test_extract_settings_returned(self):
+        actual = self.config.extract_settings
+        self.assertEqual(actual, {"pipeline": True})
+
+
+    def test_partition_found_by_filter_name(self):
+        actual = self.config.find_partition("12345")
+        self.assertEqual(actual, {"field": "resolutiondate", "slices": 3})
+
+
+    def test_partition_found_by_filter_id(self):
+        actual = self.config.find_partition(11111)
+        self.assertEqual(actual, {"field": "project", "values": ["ABC"]})
+
+
+    def test_no_partition_for_unknown_filter(self):
+        actual = self.config.find_partition(99999)
+        self.assertIsNone(actual)
+
+
+    def test_default_time_in_status_buckets_returned(self):
+        actual = self.config.time_in_status_buckets
+        self.assertEqual(actual, {"To Do": ["to do"], "In Progress": ["in progress"]})
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,168 +1,652 @@
 from requests.models import HTTPError
 from jira_request import jira_request
-from datetime import datetime
+from jira_partition import jira_partition
+from jira_watermark import jira_watermark, find_missing_keys, merge_rows
+from jira_store import jira_store
+from jira_snapshot import jira_snapshot
+from jira_stream import jira_stream_writer
+from jira_transform import jira_transform
+from jira_transitions import jira_transitions
+from jira_rollup import jira_rollup
+from jira_changelog import jira_changelog
+from jira_jql import add_condition, keys_condition, split_order_by
+from jira_profile import jira_profile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+import threading
+import time
+import queue
 import csv
 import os
 import os.path
 
+FETCHER_NAME = "search_pages"
+
 
 class jira_data(object):
     # Docs https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-search/#api-rest-api-3-search-get
     __params_filter = "filter/{0}"
-    __params_search_jql = "search/jql?jql={0}&maxResults=500&fields=summary,status,created,resolutiondate,labels,issuetype,parent,customfield_10014,customfield_10016,customfield_10023,customfield_10024"
+    __params_search_fields = "search/jql?jql={{0}}&maxResults=500&fields={0}"
+    __params_search_keys = "search/jql?jql={0}&maxResults=5000&fields=id"
+    __params_search_oldest = "search/jql?jql={0}&maxResults=1&fields={1}"
     __params_next_page_token = "{0}&nextPageToken={1}"
+    __default_extract_settings = {"pipeline": False, "queue_size": 4, "incremental": False, "overlap_minutes": 10, "columnar": None, "streaming": False, "timings": False, "batch_workers": 4, "rollups": False}
+    __key_batch_size = 100
+    __store_batch_size = 5000
     __csv_columns = ["Key","Summary","Category","Team","Status","Created","Resolved","Epic","Epic ID","Issue Type","Story Points","Lead Time","To Do","In Progress","Lead Days","Cycle Days"]
 
 
     def __init__(self, jira_config):
         self.__config = jira_config
-        self.__jira_api = jira_request(jira_config.base_url, jira_config.auth_values)
-
-
-    def __create_folder(self, path):
-        if not os.path.exists(path):
-            os.makedirs(path)
+        self.__extract_settings = dict(self.__default_extract_settings)
+        self.__extract_settings.update(jira_config.extract_settings)
+        self.__jira_api = jira_request(jira_config.base_url, jira_config.auth_values, jira_config.request_settings,
+                                       jira_config.metadata_settings, jira_config.response_cache_settings)
+        self.__transform = jira_transform(jira_config, self.__jira_api.get_statuses)
 
+        # "To Do" and "In Progress" are the first time in status buckets, any others are added after them
+        to_do_index = self.__csv_columns.index("To Do")
+        self.__csv_columns = self.__csv_columns[:to_do_index] + self.__transform.time_in_status_columns + self.__csv_columns[to_do_index + 2:]
+        self.__filter_name = None
 
-    def __create_csv(self, rows, filter_name):
-        path = ".//data//{0}".format(filter_name.replace("/", "_"))
-        self.__create_folder(path)
-
-        filename = "{0}//{1:%Y_%m_%d}_tickets.csv".format(path, datetime.now())
-        with open(filename, 'w', newline='', encoding="UTF-8") as file:
-            writer = csv.writer(file)
-            writer.writerow(self.__csv_columns)
-            writer.writerows(rows)
+        # Status changes are only fetched when a changelog database is configured
+        self.__changelog = None
+        self.__changelog_issues = {}
+        self.__changelog_lock = threading.Lock()
+        self.__seen_keys_lock = threading.Lock()
+        changelog_settings = jira_config.changelog_settings
+        if changelog_settings.get("path"):
+            self.__changelog = jira_changelog(self.__jira_api, jira_transitions(changelog_settings["path"]), changelog_settings)
+        self.__set_columns(None)
 
-        print("Extracted {0} tickets to \"{1}\"".format(len(rows), filename))
+        # With a store configured the .CSV file is only an export, and can be turned off
+        self.__store = None
+        self.__export_csv = True
+        store_settings = jira_config.store_settings
+        if store_settings.get("path"):
+            self.__store = jira_store(store_settings["path"])
+            self.__export_csv = store_settings.get("csv", True)
 
-        return filename
 
+    @property
+    def filter_name(self):
+        return self.__filter_name
 
-    def __get_date_from_utc_string(self, date_string):
-        if date_string:
-            # 2019-03-25T15:26:30.000+0000
-            return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%f%z")
 
+    @property
+    def store(self):
+        return self.__store
 
-    def __calc_date_diff_milliseconds(self, start_date, end_date):
-        return int((end_date - start_date).total_seconds() * 1000)
 
+    @property
+    def transform_timings(self):
+        return self.__transform.timings
 
-    def __calc_days_from_milliseconds(self, milliseconds):
-        return round(milliseconds/(1000*60*60*24), 2)
 
+    def __create_folder(self, path):
+        if not os.path.exists(path):
+            os.makedirs(path)
 
-    def __get_time_in_statuses(self, time_in_status):
-        to_do, in_progress = "", ""
 
-        # '3_*:*_1_*:*_256892526_*|*_10000_*:*_1_*:*_258319828_*|*_10001_*:*_1_*:*_0'
-        if time_in_status:
-            data = time_in_status.split("_*|*_")
+    def __get_filter_path(self, filter_name):
+        return ".//data//{0}".format(filter_name.replace("/", "_"))
 
-            for value in data:
-                values = value.split("_*:*_")
 
-                status = self.__jira_api.get_status_name(values[0])
-                if status:
-                    status = status.lower()
-                    if status == "to do":
-                        to_do = int(values[2])
-                    elif status == "in progress":
-                        in_progress = int(values[2])
+    def __get_csv_filename(self, filter_name, name = "tickets"):
+        path = self.__get_filter_path(filter_name)
+        self.__create_folder(path)
 
-        return to_do, in_progress
+        return "{0}//{1:%Y_%m_%d}_{2}.csv".format(path, datetime.now(), name)
 
 
-    def __get_team_name(self, key, labels):
-        team = self.__config.find_team(labels)
-        if (len(team) == 0):
-            project = key.split("-")[0].lower()
-            team = self.__config.find_team({project})
+    def __set_columns(self, columns):
+        # Only the Jira fields needed for the columns are requested, the key is always the first column
+        if columns is None:
+            self.__extract_columns = None
+            self.__output_columns = self.__csv_columns
+            self.__column_indexes = None
+        else:
+            self.__output_columns = [column for column in self.__csv_columns if column == self.__csv_columns[0] or column in columns]
+            self.__extract_columns = set(self.__output_columns)
+            self.__column_indexes = [self.__csv_columns.index(column) for column in self.__output_columns]
 
-        if (len(team) == 0):
-            print("** Team Not Found [key:{0}, labels:{1}] ".format(key, labels))
+        fields = self.__transform.get_fields(self.__output_columns)
+        if self.__changelog and columns is None:
+            # Used to only fetch the changelogs of issues updated since the last extract
+            fields.append("updated")
+        self.__params_search_jql = self.__params_search_fields.format(",".join(fields))
 
-        return team
 
+    def __create_csv(self, rows, filter_name, name):
+        filename = self.__get_csv_filename(filter_name, name)
+        writer = jira_stream_writer(filename, self.__output_columns)
+        with jira_profile.span("csv_write"):
+            writer.open(None, resume=False)
+            try:
+                for row in rows:
+                    writer.write_row(row)
+            finally:
+                writer.close()
+            writer.commit()
+        jira_profile.count("csv_bytes", os.path.getsize(filename))
 
-    def __extract_search_results(self, issues, rows):
-        for issue in issues:
-            jira_key = issue["key"]
-            summary = issue["fields"]["summary"]
-            status = issue["fields"]["status"]["name"]
-            labels = issue["fields"]["labels"]
-            issue_type = issue["fields"]["issuetype"]["name"]
-            created = self.__get_date_from_utc_string(issue["fields"]["created"])
-            resolved = self.__get_date_from_utc_string(issue["fields"]["resolutiondate"])
-            time_in_status = issue["fields"]["customfield_10023"]
+        print("Extracted {0} tickets to \"{1}\"".format(len(rows), filename))
 
-            epic_id, epic_name = "", ""
-            try:
-                parent = issue["fields"]["parent"]
-                if parent:
-                    epic_id = issue["fields"]["parent"]["key"]
-                    epic_name = issue["fields"]["parent"]["fields"]["summary"]
-            except KeyError:
-                pass
+        return filename
 
-            # for team-managed projects, story point estimate is now in custom field 16
-            story_points = issue["fields"]["customfield_10016"]
-            if not story_points:
-                story_points = issue["fields"]["customfield_10024"]
 
-            category = self.__config.find_category(labels)
-            team = self.__get_team_name(jira_key, labels)
-            to_do, in_progress = self.__get_time_in_statuses(time_in_status)
+    def __remove_seen_issues(self, issues, seen_keys):
+        # Issues can move between slices while they are being fetched, only the first copy is converted (and counted)
+        with self.__seen_keys_lock:
+            issues = [issue for issue in issues if issue["key"] not in seen_keys]
+            seen_keys.update(issue["key"] for issue in issues)
+        return issues
 
-            resolution_date, lead_time, lead_days, cycle_days = "", "", "", ""
-            if resolved:
-                resolution_date = resolved.date()
-                lead_time = self.__calc_date_diff_milliseconds(created, resolved)
-                lead_days = self.__calc_days_from_milliseconds(lead_time)
-                if to_do:
-                    cycle_days = lead_days - self.__calc_days_from_milliseconds(to_do)
 
-            rows.append([jira_key, summary, category, team, status, created.date(), resolution_date, epic_name,
-                         epic_id, issue_type, story_points, lead_time, to_do, in_progress, lead_days, cycle_days])
+    def __extract_search_results(self, issues, rows, seen_keys = None):
+        if seen_keys is not None:
+            issues = self.__remove_seen_issues(issues, seen_keys)
+        with jira_profile.span("transform"):
+            page_rows = self.__transform.transform_page(issues, self.__extract_columns)
+            if self.__column_indexes:
+                page_rows = [[row[index] for index in self.__column_indexes] for row in page_rows]
+            rows.extend(page_rows)
+        if self.__changelog and self.__extract_columns is None:
+            self.__add_changelog_issues(issues)
+        jira_profile.count("rows_extracted", len(issues))
 
 
-    def __search_jql_jira(self, jql, next_page_token):
-        url_query = self.__params_search_jql.format(jql)
+    def __search_jql_jira(self, jql, next_page_token, params):
+        url_query = params.format(jql)
         if next_page_token:
             url_query = self.__params_next_page_token.format(url_query, next_page_token)
         return self.__jira_api.get_api3_request(url_query)
 
 
-    def __extract_paged_search_data(self, jql, csv_rows):
-        next_page_token = None
+    def __get_search_pages(self, jql, params = None, next_page_token = None):
+        # Each page is returned with the token for the page after it (None for the last page)
         is_last_page = False
 
         while not is_last_page:
-            data = self.__search_jql_jira(jql, next_page_token)
-            self.__extract_search_results(data["issues"], csv_rows)
+            data = self.__search_jql_jira(jql, next_page_token, params if params else self.__params_search_jql)
 
             try:
                 next_page_token = data["nextPageToken"]
             except KeyError:
+                next_page_token = None
                 is_last_page = True
 
+            yield data["issues"], next_page_token
+
+
+    def __put_page(self, page_queue, item, stop_fetching):
+        # Give up if the consumer has stopped reading, otherwise wait for space in the queue
+        while not stop_fetching.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+
+    def __fetch_search_pages(self, jql, next_page_token, page_queue, stop_fetching):
+        try:
+            for page in self.__get_search_pages(jql, None, next_page_token):
+                if not self.__put_page(page_queue, page, stop_fetching):
+                    return
+            self.__put_page(page_queue, None, stop_fetching)
+        except Exception as err:
+            self.__put_page(page_queue, err, stop_fetching)
+
+
+    def __get_pipelined_search_pages(self, jql, next_page_token = None):
+        # Fetch the next page in the background while the previous page is being converted to rows
+        page_queue = queue.Queue(maxsize=self.__extract_settings["queue_size"])
+        stop_fetching = threading.Event()
+        fetcher = threading.Thread(target=self.__fetch_search_pages, args=(jql, next_page_token, page_queue, stop_fetching), name=FETCHER_NAME, daemon=True)
+        fetcher.start()
+
+        try:
+            while True:
+                page = page_queue.get()
+                if page is None:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            # Not joined, a request that's under way can take as long as the read timeout, the fetcher stops by itself once it returns
+            stop_fetching.set()
+
+
+    def __get_pages(self, jql, next_page_token = None):
+        if self.__extract_settings["pipeline"]:
+            return self.__get_pipelined_search_pages(jql, next_page_token)
+        return self.__get_search_pages(jql, None, next_page_token)
+
+
+    def __extract_paged_search_data(self, jql, csv_rows, seen_keys = None):
+        for issues, _ in self.__get_pages(jql):
+            self.__extract_search_results(issues, csv_rows, seen_keys)
+
+
+    def __stream_search_data(self, jql, writer, seen_keys = None):
+        # Continue from the last page written if a previous extract failed part way through
+        next_page_token = writer.open(jql)
+        if writer.complete:
+            return
+
+        for issues, next_page_token in self.__get_pages(jql, next_page_token):
+            rows = []
+            self.__extract_search_results(issues, rows, seen_keys)
+            with jira_profile.span("csv_write"):
+                writer.write_page(rows, next_page_token)
+
+
+    def __stream_slice_data(self, writer, jql, seen_keys):
+        start = time.perf_counter()
+        try:
+            self.__stream_search_data(jql, writer, seen_keys)
+        finally:
+            writer.close()
+        return time.perf_counter() - start
+
+
+    def __stream_partitioned_search_data(self, partition, jql, filename, writer):
+        slice_jql = partition.get_slice_jql(jql)
+        conditions = partition.get_conditions()
+        slice_writers = [jira_stream_writer("{0}.slice{1}".format(filename, index + 1), self.__output_columns) for index in range(len(slice_jql))]
+
+        seen_keys = set()
+        with ThreadPoolExecutor(max_workers=partition.workers) as executor:
+            timings = list(executor.map(self.__stream_slice_data, slice_writers, slice_jql, [seen_keys] * len(slice_jql)))
+
+        for index, seconds in enumerate(timings):
+            print("Slice {0}/{1}: {2} tickets in {3:.2f}s [{4}]".format(index + 1, len(timings), slice_writers[index].rows, seconds, conditions[index]))
+
+        # Merge in slice order, only the issue keys are kept in memory. A resumed slice can still have issues found by another slice
+        keys = set()
+        writer.open(jql, resume=False)
+        for slice_writer in slice_writers:
+            for row in slice_writer.read_rows():
+                if row[0] not in keys:
+                    keys.add(row[0])
+                    writer.write_row(row)
+            slice_writer.discard()
+
+
+    def __extract_slice_data(self, jql, seen_keys):
+        start = time.perf_counter()
+        rows = []
+        self.__extract_paged_search_data(jql, rows, seen_keys)
+        return rows, time.perf_counter() - start
+
+
+    def __extract_partitioned_search_data(self, partition, jql, csv_rows):
+        slice_jql = partition.get_slice_jql(jql)
+        conditions = partition.get_conditions()
+
+        seen_keys = set()
+        with ThreadPoolExecutor(max_workers=partition.workers) as executor:
+            results = list(executor.map(self.__extract_slice_data, slice_jql, [seen_keys] * len(slice_jql)))
+
+        for index, (rows, seconds) in enumerate(results):
+            print("Slice {0}/{1}: {2} tickets in {3:.2f}s [{4}]".format(index + 1, len(results), len(rows), seconds, conditions[index]))
+
+        # Each issue is only in one slice's rows, they're merged in slice order
+        for rows, _ in results:
+            csv_rows.extend(rows)
+
+
+    def __get_oldest_date(self, jql, field):
+        query, _ = split_order_by(jql)
+        data = self.__jira_api.get_api3_request(self.__params_search_oldest.format("({0}) AND {1} is not EMPTY ORDER BY {1} ASC".format(query, field), field))
+        oldest = data["issues"][0]["fields"].get(field) if len(data["issues"]) > 0 else None
+        return date.fromisoformat(oldest[0:10]) if oldest else None
+
+
+    def __create_partition(self, partition_settings, jql):
+        partition = jira_partition(partition_settings)
+        if partition.date_field:
+            oldest = self.__get_oldest_date(jql, partition.date_field)
+            if oldest:
+                partition.set_oldest_date(oldest)
+                print("Partition slices are {0} months wide, the oldest {1} is {2}".format(partition.months, partition.date_field, oldest))
+        return partition
+
+
+    def __extract_filter_data(self, filter_id, jql, csv_rows):
+        partition_settings = self.__config.find_partition(filter_id)
+        if partition_settings:
+            self.__extract_partitioned_search_data(self.__create_partition(partition_settings, jql), jql, csv_rows)
+        else:
+            self.__extract_paged_search_data(jql, csv_rows)
+
+
+    def __add_changelog_issues(self, issues):
+        with self.__changelog_lock:
+            for issue in issues:
+                updated = issue["fields"].get("updated") if "fields" in issue else None
+                if updated or issue["key"] not in self.__changelog_issues:
+                    self.__changelog_issues[issue["key"]] = (issue["id"], updated)
+
+
+    def __get_filter_keys(self, jql):
+        keys = []
+        for issues, _ in self.__get_search_pages(jql, self.__params_search_keys):
+            keys.extend(issue["key"] for issue in issues)
+            if self.__changelog:
+                # Unchanged issues are included, so any without a saved changelog are still fetched
+                self.__add_changelog_issues(issues)
+
+        return keys
+
+
+    def __read_csv_rows(self, filename):
+        with open(filename, 'r', newline='', encoding="UTF-8") as file:
+            reader = csv.reader(file)
+            if next(reader, None) != self.__csv_columns:
+                return None
+            return {row[0]: row for row in reader}
+
+
+    def __read_previous_rows(self, filter_name, watermark):
+        if self.__store:
+            return self.__store.read_filter_rows(filter_name, self.__csv_columns)
+        if watermark.snapshot and os.path.exists(watermark.snapshot):
+            return self.__read_csv_rows(watermark.snapshot)
+        return None
+
+
+    def __extract_incremental_data(self, filter_id, filter_name, jql, watermark, csv_rows):
+        rows_by_key = self.__read_previous_rows(filter_name, watermark)
+        if rows_by_key is None:
+            return False
+
+        minutes = watermark.minutes_since(self.__extract_settings["overlap_minutes"])
+        changed_rows = []
+        self.__extract_filter_data(filter_id, add_condition(jql, "updated >= -{0}m".format(minutes)), changed_rows)
+
+        # Key only sweep to find issues that were deleted or moved out of the filter, or joined it without being updated
+        filter_keys = self.__get_filter_keys(jql)
+        missing_keys = find_missing_keys(rows_by_key, changed_rows, filter_keys)
+        added_rows = []
+        for index in range(0, len(missing_keys), self.__key_batch_size):
+            batch = missing_keys[index:index + self.__key_batch_size]
+            self.__extract_paged_search_data(add_condition(jql, keys_condition(batch)), added_rows)
+
+        rows, removed = merge_rows(rows_by_key, changed_rows + added_rows, filter_keys)
+        csv_rows.extend(rows)
+
+        print("Incremental extract: {0} changed, {1} added, {2} removed (last {3} minutes)".format(len(changed_rows), len(missing_keys), removed, minutes))
+        return True
+
 
     def __get_jql_for_filter(self, filter_id):
-        data = self.__jira_api.get_api3_request(self.__params_filter.format(filter_id))
+        data = self.__jira_api.get_api3_metadata(self.__params_filter.format(filter_id))
         return data["jql"], data["name"]
 
 
-    def save_filter_data(self, filter_id):
+    def __stream_filter_data(self, filter_id, filter_name, jql, name):
+        filename = self.__get_csv_filename(filter_name, name)
+        writer = jira_stream_writer(filename, self.__output_columns)
+        partition_settings = self.__config.find_partition(filter_id)
+
+        try:
+            if partition_settings:
+                self.__stream_partitioned_search_data(self.__create_partition(partition_settings, jql), jql, filename, writer)
+            else:
+                self.__stream_search_data(jql, writer)
+        finally:
+            writer.close()
+        writer.commit()
+        jira_profile.count("csv_bytes", os.path.getsize(filename))
+
+        print("Extracted {0} tickets to \"{1}\"".format(writer.rows, filename))
+        return filename
+
+
+    def __read_csv_batches(self, filename):
+        with open(filename, 'r', newline='', encoding="UTF-8") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            batch = []
+            for row in reader:
+                batch.append(row)
+                if len(batch) == self.__store_batch_size:
+                    yield batch
+                    batch = []
+            if len(batch) > 0:
+                yield batch
+
+
+    def __save_csv_to_store(self, filename, filter_name):
+        rows = self.__store.save_filter_batches(filter_name, self.__csv_columns, self.__read_csv_batches(filename), from_csv=True)
+
+        print("Saved {0} tickets to \"{1}\"".format(rows, self.__store.filename))
+
+
+    def __create_columnar_snapshot(self, rows, filter_name):
+        snapshot_format = self.__extract_settings["columnar"]
+        csv_filename = self.__get_csv_filename(filter_name)
+        if rows is None:
+            filename = jira_snapshot().write_from_csv(csv_filename, snapshot_format)
+        else:
+            filename = jira_snapshot().write(rows, self.__csv_columns, csv_filename, snapshot_format)
+        if filename:
+            print("Created snapshot \"{0}\"".format(filename))
+
+
+    def __create_rollup(self, rows, filter_name, name):
+        # Reports read the counts and sums from the rollup instead of grouping every ticket again, streamed rows are read back from the .CSV file
+        csv_filename = self.__get_csv_filename(filter_name, name)
+        rollup = jira_rollup(self.__output_columns)
+        with jira_profile.span("rollup_write"):
+            if rows is None:
+                for batch in self.__read_csv_batches(csv_filename):
+                    rollup.add_rows(batch)
+            else:
+                rollup.add_rows(rows)
+            filename = rollup.save(csv_filename)
+        print("Created rollup \"{0}\"".format(filename))
+
+
+    def __print_request_stats(self):
+        if self.__jira_api.retries > 0:
+            print("Retried {0} requests ({1:.1f}s throttled)".format(self.__jira_api.retries, self.__jira_api.throttled_seconds))
+
+        response_cache = self.__jira_api.response_cache
+        if response_cache:
+            print("Response cache: {0} hits, {1} misses ({2:.1f}MB cached)".format(response_cache.hits, response_cache.misses, response_cache.size / (1024 * 1024)))
+
+        if self.__extract_settings["timings"]:
+            timings = self.__transform.timings
+            print("Transform timings: {0}".format(", ".join("{0} {1:.3f}s".format(stage, seconds) for stage, seconds in timings.items())))
+            lookup_stats = self.__config.lookup_stats
+            print("Label lookups: {0} hits, {1} misses, {2} label sets".format(lookup_stats["hits"], lookup_stats["misses"], lookup_stats["size"]))
+
+
+    def __print_unmatched_teams(self):
+        # One line for each label set, rather than one for every ticket
+        unmatched_teams = self.__config.unmatched_teams
+        self.__config.clear_unmatched_teams()
+        if len(unmatched_teams) == 0:
+            return
+
+        print("** Team Not Found for {0} tickets:".format(sum(count for count, _ in unmatched_teams.values())))
+        for (labels, project), (count, keys) in unmatched_teams.items():
+            print("   [project:{0}, labels:{1}] {2} tickets, e.g. {3}".format(project, list(labels), count, ", ".join(keys)))
+
+
+    def __update_changelog(self):
+        try:
+            with jira_profile.span("changelog"):
+                start = time.perf_counter()
+                fetched, transitions = self.__changelog.update(self.__changelog_issues)
+                seconds = time.perf_counter() - start
+            print("Fetched {0} changelogs ({1} status changes) in {2:.2f}s, {3} unchanged, saved to \"{4}\"".format(
+                fetched, transitions, seconds, len(self.__changelog_issues) - fetched, self.__changelog.transitions.filename))
+        except HTTPError as err:
+            print("Failed to fetch changelogs - {0}".format(err))
+        finally:
+            self.__changelog_issues = {}
+
+
+    def __save_rows(self, csv_rows, filter_name, all_columns, name):
         created_filename = ""
+        if self.__export_csv or not all_columns:
+            created_filename = self.__create_csv(csv_rows, filter_name, name)
+        if self.__extract_settings["rollups"]:
+            self.__create_rollup(csv_rows, filter_name, name)
+        if self.__extract_settings["columnar"] and all_columns:
+            with jira_profile.span("snapshot_write"):
+                self.__create_columnar_snapshot(csv_rows, filter_name)
+        if self.__store and all_columns:
+            with jira_profile.span("store_write"):
+                self.__store.save_filter_rows(filter_name, self.__csv_columns, csv_rows)
+            print("Saved {0} tickets to \"{1}\"".format(len(csv_rows), self.__store.filename))
+
+        return created_filename
+
+
+    def __save_streamed_csv(self, filename, filter_name, all_columns, name):
+        if self.__extract_settings["rollups"]:
+            self.__create_rollup(None, filter_name, name)
+        if self.__extract_settings["columnar"] and all_columns:
+            with jira_profile.span("snapshot_write"):
+                self.__create_columnar_snapshot(None, filter_name)
+        if self.__store and all_columns:
+            with jira_profile.span("store_write"):
+                self.__save_csv_to_store(filename, filter_name)
+
+
+    def clear_metadata_cache(self):
+        self.__jira_api.clear_metadata_cache()
+
+
+    def save_filter_data(self, filter_id, columns = None, name = "tickets"):
+        # Extracting only some columns (to "<date>_<name>.csv") doesn't update the store, snapshot or watermark
+        with jira_profile.span("extract"):
+            self.__set_columns(columns)
+            try:
+                return self.__save_filter_data(filter_id, columns is None, name)
+            finally:
+                self.__set_columns(None)
+
+
+    def __save_filter_data(self, filter_id, all_columns, name):
+        created_filename = ""
+        self.__filter_name = None
+        self.__changelog_issues = {}
         try:
             jql, filter_name = self.__get_jql_for_filter(filter_id)
             print("Using filter: {0} ({1})".format(filter_name, filter_id))
 
+            extracted = datetime.now(timezone.utc)
+            self.__config.clear_unmatched_teams()
             csv_rows = []
-            self.__extract_paged_search_data(jql, csv_rows)
-            created_filename = self.__create_csv(csv_rows, filter_name)
+            watermark = None
+            if self.__extract_settings["incremental"] and all_columns:
+                watermark = jira_watermark(self.__get_filter_path(filter_name))
+
+            if watermark and watermark.is_valid_for(jql) and self.__extract_incremental_data(filter_id, filter_name, jql, watermark, csv_rows):
+                streamed = False
+            elif self.__extract_settings["streaming"]:
+                # Rows are written to the .CSV file page by page, so they're read back from it for the store and snapshot
+                created_filename = self.__stream_filter_data(filter_id, filter_name, jql, name)
+                streamed = True
+            else:
+                self.__extract_filter_data(filter_id, jql, csv_rows)
+                streamed = False
+
+            if streamed:
+                self.__save_streamed_csv(created_filename, filter_name, all_columns, name)
+            else:
+                created_filename = self.__save_rows(csv_rows, filter_name, all_columns, name)
+            self.__filter_name = filter_name
+            if self.__changelog and all_columns:
+                self.__update_changelog()
+
+            if watermark:
+                watermark.save(jql, extracted, created_filename)
+            self.__print_unmatched_teams()
+            self.__print_request_stats()
         except HTTPError as err:
             print("Failed to find filter (id: {0}) - {1}".format(filter_id, err))
 
-        return created_filename
\ No newline at end of file
+        return created_filename
+
+
+    def __extract_key_batch(self, keys):
+        rows = []
+        self.__extract_paged_search_data(keys_condition(keys), rows)
+        return rows
+
+
+    def __extract_union_data(self, filter_keys):
+        # Each ticket is only requested once, however many of the filters it's in
+        unique_keys = list(dict.fromkeys(key for keys in filter_keys for key in keys))
+        batches = [unique_keys[index:index + self.__key_batch_size] for index in range(0, len(unique_keys), self.__key_batch_size)]
+
+        rows_by_key = {}
+        with ThreadPoolExecutor(max_workers=self.__extract_settings["batch_workers"]) as executor:
+            for rows in executor.map(self.__extract_key_batch, batches):
+                for row in rows:
+                    rows_by_key[row[0]] = row
+        return rows_by_key
+
+
+    def save_filters_data(self, filter_ids, columns = None, name = "tickets"):
+        # Returns the filter name and created .CSV filename for each filter that was extracted
+        with jira_profile.span("extract"):
+            self.__set_columns(columns)
+            try:
+                return self.__save_filters_data(filter_ids, columns is None, name)
+            finally:
+                self.__set_columns(None)
+
+
+    def __save_filters_data(self, filter_ids, all_columns, name):
+        self.__filter_name = None
+        self.__changelog_issues = {}
+        self.__config.clear_unmatched_teams()
+
+        filters = []
+        for filter_id in filter_ids:
+            try:
+                jql, filter_name = self.__get_jql_for_filter(filter_id)
+                filters.append((filter_id, jql, filter_name))
+            except HTTPError as err:
+                print("Failed to find filter (id: {0}) - {1}".format(filter_id, err))
+
+        # Key only sweeps find which tickets are in each filter (in the filter's order), then the tickets are fetched once
+        try:
+            start = time.perf_counter()
+            extracted = datetime.now(timezone.utc)
+            with ThreadPoolExecutor(max_workers=self.__extract_settings["batch_workers"]) as executor:
+                filter_keys = list(executor.map(self.__get_filter_keys, [jql for _, jql, _ in filters]))
+            rows_by_key = self.__extract_union_data(filter_keys)
+        except HTTPError as err:
+            print("Failed to extract filters - {0}".format(err))
+            return []
+
+        print("Extracted {0} tickets for {1} filters ({2} filter tickets) in {3:.2f}s".format(
+            len(rows_by_key), len(filters), sum(len(keys) for keys in filter_keys), time.perf_counter() - start))
+
+        saved = []
+        for (filter_id, jql, filter_name), keys in zip(filters, filter_keys):
+            print("Using filter: {0} ({1})".format(filter_name, filter_id))
+            created_filename = self.__save_rows([rows_by_key[key] for key in keys if key in rows_by_key], filter_name, all_columns, name)
+            if self.__extract_settings["incremental"] and all_columns:
+                # So the next extract of the filter on its own can be incremental
+                jira_watermark(self.__get_filter_path(filter_name)).save(jql, extracted, created_filename)
+            saved.append((filter_name, created_filename))
+            self.__filter_name = filter_name
+
+        if self.__changelog and all_columns:
+            self.__update_changelog()
+        self.__print_unmatched_teams()
+        self.__print_request_stats()
+
+        return saved
\ No newline at end of file
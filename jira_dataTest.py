@@ -0,0 +1,72 @@
+import unittest
+import contextlib
+import tempfile
+import threading
+import time
+import io
+import os
+import yaml
+from jira_standin import jira_standin
+from jira_config import jira_config
+from jira_data import jira_data, FETCHER_NAME
+
+LATENCY = 0.5
+
+
+class jira_data_test(unittest.TestCase):
+    # The second page of issues can't be converted, while the pipeline is fetching the page after it
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+        self.standin = jira_standin({"size": 1000, "page_size": 100, "latency": LATENCY, "broken_from": 150})
+        self.standin.start()
+
+        config = {
+            "jira": {"url": self.standin.url, "user": "user", "token": "token"},
+            "team": {"team1": "Team 1", "team2": "Team 2"},
+            "category": {"bau": "BAU,tab:blue", "project": "Project,peru"},
+            "filter": {"stand_in": 1},
+            "extract": {"pipeline": True, "queue_size": 4}
+        }
+        with open("jira_conf.yaml", "w") as config_file:
+            yaml.safe_dump(config, config_file)
+
+
+    def tearDown(self):
+        self.standin.stop()
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+
+    def __get_fetchers(self):
+        return [thread for thread in threading.enumerate() if thread.name == FETCHER_NAME]
+
+
+    def __extract_until_failed(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(KeyError):
+                jira_data(jira_config()).save_filter_data(1)
+
+
+    def test_pipelined_extract_fails_without_waiting_for_fetcher(self):
+        self.__extract_until_failed()
+
+        # The page after the one that failed is still being fetched
+        self.assertEqual(len(self.__get_fetchers()), 1)
+
+
+    def test_pipelined_extract_stops_fetching_when_conversion_fails(self):
+        self.__extract_until_failed()
+        requests = self.standin.requests
+        time.sleep(LATENCY * 3)
+
+        # Only the page being fetched when the extract failed is finished (it may not have reached the stand-in yet), then the fetcher stops
+        self.assertEqual(self.__get_fetchers(), [])
+        self.assertLessEqual(self.standin.requests, requests + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,26 +1,42 @@
-import pandas as pd
+from jira_snapshot import jira_snapshot
+from jira_profile import jira_profile
+from jira_config import DEFAULT_STATUS_COLOUR
+from jira_rollup import jira_rollup, EPIC_COLUMNS, TICKETS
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+import os.path
 
 COUNT = "Count"
 EPIC = "Epic"
+EPIC_ID = "Epic ID"
 STATUS = "Status"
 DONE = "Done"
 REJECTED = "Rejected"
 TODO = "To Do"
+# The only .CSV columns the graphs use, so epics.py only extracts these
+COLUMNS = ["Key", STATUS, EPIC, EPIC_ID]
+EPICS_SUFFIX = "_epics"
+TICKETS_SUFFIX = "_tickets"
+NO_EPIC = "▂▃▅▇█ ┗(°.°)┛ █▇▅▃▂   NO EPIC   ▂▃▅▇█ ┗(°.°)┛ █▇▅▃▂"
 
 
 class jira_epic(object):
+    __default_settings = {"page_size": 25, "workers": 1}
 
 
     def __init__(self, jira_config):
-        self.__config = jira_config
+        # Only keep the settings that are needed, so pages can be sent to other processes
+        self.__status_colours = jira_config.status_colours
+        self.__settings = dict(self.__default_settings)
+        self.__settings.update(jira_config.epic_settings)
 
 
     def __get_colours(self, labels):
         colours = []
         for status_label in labels:
-            colours.append(self.__config.find_status_colour(status_label))
+            colours.append(self.__status_colours.get(status_label, DEFAULT_STATUS_COLOUR))
 
         return colours
 
@@ -29,11 +45,10 @@ class jira_epic(object):
         return int(np.round(val * total / 100))
 
 
-    def __plot_data(self, epic_title, epic_data, axis, max_epic_size):
-        tickets_in_epic = len(epic_data)
+    def __plot_data(self, epic_title, status_data, axis, max_epic_size):
+        tickets_in_epic = status_data[COUNT].sum()
         radius = np.sqrt(tickets_in_epic / max_epic_size)
 
-        status_data = epic_data.groupby([pd.Grouper(key=STATUS)]).size().to_frame(name=COUNT)
         colours = self.__get_colours(status_data.index)
 
         status_data.plot.pie(y=COUNT, ax=axis, autopct=lambda val: self.__absolute_value(val, tickets_in_epic), colors=colours, radius=radius)
@@ -48,17 +63,9 @@ class jira_epic(object):
                 axes[last_row_index, axis_col_index].remove()
 
 
-    def __get_max_epic_size(self, data, epics):
-        filtered_data = data[data[EPIC].isin(epics)]
-        return filtered_data.groupby([pd.Grouper(key=EPIC)]).size().max()
-
-
-    def __graph_data(self, data, epics, type, output_file):
-        output_file_png = "{0}_{1}.png".format(output_file, type)
-        title = "{0} [{1}]".format(output_file.split("//")[2], type)
-
+    def write_page(self, epics, max_epic_size, output_file_png, title):
+        # epics is a list of (title, ticket count for each status)
         number_of_epics = len(epics)
-        max_epic_size = self.__get_max_epic_size(data, epics)
 
         num_cols = 5
         if number_of_epics > num_cols:
@@ -80,14 +87,7 @@ class jira_epic(object):
         epic_index = 0
         axis_col_index = 0
 
-        for epic_name in epics:
-            epic_data = data.loc[data[EPIC] == epic_name].copy()
-            epic_id = epic_data.iloc[0]["Epic ID"]
-            if isinstance(epic_id, str):
-                epic_title = "{0} [{1}]".format(epic_name, epic_id)
-            else:
-                epic_title = epic_name
-
+        for epic_title, status_data in epics:
             if number_of_epics == 1:
                 axis = axes
             elif num_rows > 1:
@@ -95,7 +95,7 @@ class jira_epic(object):
             else:
                 axis = axes[axis_col_index]
 
-            self.__plot_data(epic_title, epic_data, axis, max_epic_size)
+            self.__plot_data(epic_title, status_data, axis, max_epic_size)
 
             epic_index += 1
             axis_col_index += 1
@@ -105,63 +105,162 @@ class jira_epic(object):
         if num_rows > 1:
             self.__clear_unused_subplots(num_cols, number_of_epics, epic_index // num_cols, axes)
 
-        plt.savefig(output_file_png)
+        with jira_profile.span("savefig"):
+            fig.savefig(output_file_png)
+        plt.close(fig)
+
+
+    def __get_epic_title(self, epic_name, epic_ids):
+        epic_id = epic_ids[epic_name]
+        if isinstance(epic_id, str):
+            return "{0} [{1}]".format(epic_name, epic_id)
+        return epic_name
 
-        print("Created \"{0}\"".format(output_file_png))
 
+    def __get_status_data(self, status_counts, epic_name):
+        # The same table a groupby on the epic's tickets creates, statuses without tickets aren't included
+        epic_counts = status_counts.loc[epic_name]
+        return epic_counts[epic_counts > 0].to_frame(name=COUNT)
 
-    def __add_unique_values(self, epics, additional_epics):
-        for epic in additional_epics:
-            if epic not in epics:
-                epics.append(epic)
 
-        return epics
+    def __get_pages(self, status_counts, epic_ids, epics, type, output_file):
+        # Each page is a separate .PNG file, radiuses are relative to the largest epic on any page
+        max_epic_size = status_counts.loc[epics].sum(axis=1).max()
+        page_size = self.__settings["page_size"]
+        number_of_pages = (len(epics) + page_size - 1) // page_size
 
+        pages = []
+        filter_name = output_file.split("//")[2]
+        for page_index in range(number_of_pages):
+            page_epics = epics[page_index * page_size:(page_index + 1) * page_size]
+            epic_data = [(self.__get_epic_title(epic_name, epic_ids), self.__get_status_data(status_counts, epic_name)) for epic_name in page_epics]
+            if number_of_pages == 1:
+                output_file_png = "{0}_{1}.png".format(output_file, type)
+                title = "{0} [{1}]".format(filter_name, type)
+            else:
+                output_file_png = "{0}_{1}_{2}.png".format(output_file, type, page_index + 1)
+                title = "{0} [{1} {2}/{3}]".format(filter_name, type, page_index + 1, number_of_pages)
+            pages.append((epic_data, max_epic_size, output_file_png, title))
+
+        return pages
 
-    def __remove_matching_values(self, epics, epics_to_remove):
-        for epic in epics_to_remove:
-            if epic in epics:
-                epics.remove(epic)
 
-        return epics
+    def __write_pages(self, pages):
+        workers = self.__settings["workers"]
+        if workers > 1 and len(pages) > 1:
+            # Draw the pages in other processes (without a display)
+            with ProcessPoolExecutor(max_workers=workers, initializer=matplotlib.use, initargs=("Agg",)) as executor:
+                futures = [executor.submit(self.write_page, *page) for page in pages]
+                for future in futures:
+                    future.result()
+        else:
+            for page in pages:
+                self.write_page(*page)
+
+        for _, _, output_file_png, _ in pages:
+            jira_profile.count("png_bytes", os.path.getsize(output_file_png))
+            print("Created \"{0}\"".format(output_file_png))
 
 
-    def __get_complete_epics(self, data, active_epics):
+    def __get_ordered_epics(self, counts, status, ascending):
+        # Epics with tickets in the status, ordered by the number of them
+        if status not in counts.columns:
+            return []
+        status_counts = counts[status]
+        status_data = status_counts[status_counts > 0].rename_axis(EPIC).to_frame(name=COUNT).reset_index()
+        return list(status_data.sort_values([COUNT], ascending=ascending)[EPIC].unique())
+
+
+    def __get_complete_epics(self, counts, first_rows, active_epics):
         # order based on total number of tickets done
-        done_data = data[data[STATUS] == DONE].copy()
-        done_data = done_data.groupby([EPIC])[STATUS].count().to_frame(name=COUNT).reset_index()
-        done_epics = done_data.sort_values([COUNT], ascending=False)[EPIC].unique()
+        complete_epics = self.__get_ordered_epics(counts, DONE, False)
 
         # add rejected epics
-        rejected_epics = data[data[STATUS] == REJECTED][EPIC].unique()
-        complete_epics = self.__add_unique_values(list(done_epics), rejected_epics)
+        for epic in first_rows.loc[first_rows[STATUS] == REJECTED, EPIC]:
+            if epic not in complete_epics:
+                complete_epics.append(epic)
 
-        return self.__remove_matching_values(complete_epics, active_epics)
+        active = set(active_epics)
+        return [epic for epic in complete_epics if epic not in active]
 
 
-    def __get_active_epics(self, data):
+    def __get_active_epics(self, counts, first_rows):
         # order based on the total number of tickets left to do
-        todo_data = data[data[STATUS] == TODO].copy()
-        todo_data = todo_data.groupby([EPIC])[STATUS].count().to_frame(name=COUNT).reset_index()
-        ordered_todo_epics = todo_data.sort_values([COUNT])[EPIC].unique()
-    
-        # remove epics with only Done and Rejected tickets
-        all_active_epics = data[~data[STATUS].isin([DONE, REJECTED])][EPIC].unique()
-        active_without_todo = self.__remove_matching_values(list(all_active_epics), ordered_todo_epics)
+        ordered_todo_epics = self.__get_ordered_epics(counts, TODO, True)
 
-        return active_without_todo + list(ordered_todo_epics)
+        # remove epics with only Done and Rejected tickets, in the order they're first seen
+        todo = set(ordered_todo_epics)
+        all_active_epics = first_rows.loc[~first_rows[STATUS].isin([DONE, REJECTED]), EPIC].unique()
+        active_without_todo = [epic for epic in all_active_epics if epic not in todo]
 
+        return active_without_todo + ordered_todo_epics
+
+
+    def __plot_epics(self, data, filename):
+        data.loc[data[EPIC].isnull(), EPIC] = NO_EPIC
+
+        # One pass to count each epic's tickets by status, and one to find the first ticket of each epic and status
+        status_counts = data.groupby([EPIC, STATUS], observed=True).size().unstack(fill_value=0)
+        first_rows = data.drop_duplicates([EPIC, STATUS])
+        self.__plot_status_counts(status_counts, first_rows, filename)
 
-    def get_filter_data_and_plot(self, filename):
-        data = pd.read_csv(filename, delimiter=',', encoding="UTF-8")
-        output_file = filename[0:len(filename) - 4]
 
-        data.loc[data[EPIC].isnull(), EPIC] = "▂▃▅▇█ ┗(°.°)┛ █▇▅▃▂   NO EPIC   ▂▃▅▇█ ┗(°.°)┛ █▇▅▃▂"
+    def __plot_rollup_epics(self, rollup, filename):
+        # The rollup has a row for each epic and status, with the number of tickets, in the order they're first seen
+        first_rows = rollup.read_epics()
+        first_rows.loc[first_rows[EPIC].isnull(), EPIC] = NO_EPIC
+        status_counts = first_rows.dropna(subset=[STATUS]).set_index([EPIC, STATUS])[TICKETS].unstack(fill_value=0)
+        status_counts.columns.name = STATUS
+        self.__plot_status_counts(status_counts, first_rows, filename)
+
+
+    def __plot_status_counts(self, status_counts, first_rows, filename):
+        # The charts keep the names they had before epics.py saved its own "<date>_epics.csv", e.g. "<date>_tickets_active.png"
+        output_file = filename[0:len(filename) - 4]
+        if output_file.endswith(EPICS_SUFFIX):
+            output_file = output_file[0:len(output_file) - len(EPICS_SUFFIX)] + TICKETS_SUFFIX
+        epic_ids = first_rows.drop_duplicates(EPIC).set_index(EPIC)[EPIC_ID]
 
-        active_epics = self.__get_active_epics(data)
+        pages = []
+        active_epics = self.__get_active_epics(status_counts, first_rows)
         if len(active_epics) > 0:
-            self.__graph_data(data, active_epics, "active", output_file)
+            pages.extend(self.__get_pages(status_counts, epic_ids, active_epics, "active", output_file))
 
-        complete_epics = self.__get_complete_epics(data, active_epics)
+        complete_epics = self.__get_complete_epics(status_counts, first_rows, active_epics)
         if len(complete_epics) > 0:
-            self.__graph_data(data, complete_epics, "complete", output_file)
\ No newline at end of file
+            pages.extend(self.__get_pages(status_counts, epic_ids, complete_epics, "complete", output_file))
+
+        with jira_profile.span("plot"):
+            self.__write_pages(pages)
+
+
+    def __load_rollup(self, filename):
+        with jira_profile.span("rollup_load"):
+            rollup = jira_rollup.load(filename)
+        if rollup is None or not rollup.covers(EPIC_COLUMNS):
+            return None
+        return rollup
+
+
+    def get_filter_data_and_plot(self, filename):
+        rollup = self.__load_rollup(filename)
+        if rollup:
+            self.__plot_rollup_epics(rollup, filename)
+            return
+
+        with jira_profile.span("csv_load"):
+            data = jira_snapshot().read(filename)
+        jira_profile.count("rows_loaded", len(data))
+        self.__plot_epics(data, filename)
+
+
+    def get_store_data_and_plot(self, store, filter_name):
+        rollup = self.__load_rollup(store.get_snapshot_filename(filter_name))
+        if rollup:
+            self.__plot_rollup_epics(rollup, store.get_snapshot_filename(filter_name))
+            return
+
+        with jira_profile.span("store_load"):
+            data = store.read_filter_data(filter_name)
+        jira_profile.count("rows_loaded", len(data))
+        self.__plot_epics(data, store.get_snapshot_filename(filter_name))
\ No newline at end of file
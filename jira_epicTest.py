@@ -0,0 +1,69 @@
+import unittest
+import tempfile
+import os
+import os.path
+import pandas as pd
+import yaml
+from jira_config import jira_config
+from jira_epic import jira_epic, COUNT, STATUS
+
+FOLDER = os.path.join("data", "F")
+
+
+class jira_epic_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.config = jira_config("test_conf.yaml")
+        with open("test_conf.yaml", "r") as config_file:
+            self.settings = yaml.safe_load(config_file)
+        self.folder = tempfile.TemporaryDirectory()
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+        os.makedirs(FOLDER)
+
+
+    def tearDown(self):
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+
+    def __write_epics(self, name, epics):
+        # epics is a list of (epic, status, number of tickets)
+        rows = []
+        for epic, status, tickets in epics:
+            rows.extend({"Key": "ABC-{0}".format(len(rows) + index + 1), "Status": status, "Epic": epic, "Epic ID": epic.replace(" ", "-")} for index in range(tickets))
+        pd.DataFrame(rows).to_csv(os.path.join(FOLDER, name), index=False)
+        return ".//data//F//{0}".format(name)
+
+
+    def test_epics_extract_charts_keep_tickets_names(self):
+        filename = self.__write_epics("2021_06_01_epics.csv", [("Epic A", "To Do", 2), ("Epic B", "Done", 3)])
+        jira_epic(self.config).get_filter_data_and_plot(filename)
+        self.assertEqual(sorted(os.listdir(FOLDER)), ["2021_06_01_epics.csv", "2021_06_01_tickets_active.png", "2021_06_01_tickets_complete.png"])
+
+
+
+    def __read_png(self, filename):
+        with open(os.path.join(FOLDER, filename), "rb") as png_file:
+            return png_file.read()
+
+
+    def test_epics_split_into_pages(self):
+        # Epic A is drawn first (it has no tickets to do), the others are ordered by the number of tickets to do
+        self.settings["epics"] = {"page_size": 2}
+        with open("jira_conf.yaml", "w") as config_file:
+            yaml.safe_dump(self.settings, config_file)
+        epic = jira_epic(jira_config())
+        filename = self.__write_epics("2021_06_01_tickets.csv", [("Epic A", "In Progress", 4), ("Epic B", "To Do", 1), ("Epic C", "To Do", 2)])
+        epic.get_filter_data_and_plot(filename)
+        self.assertEqual(sorted(os.listdir(FOLDER)), ["2021_06_01_tickets.csv", "2021_06_01_tickets_active_1.png", "2021_06_01_tickets_active_2.png"])
+
+        # Epic C is alone on the second page, but its size is relative to Epic A on the first page
+        status_data = pd.Series([2], index=pd.Index(["To Do"], name=STATUS)).to_frame(name=COUNT)
+        epic.write_page([("Epic C [Epic-C]", status_data)], 4, os.path.join(FOLDER, "expected.png"), "F [active 2/2]")
+        self.assertEqual(self.__read_png("2021_06_01_tickets_active_2.png"), self.__read_png("expected.png"))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import pandas as pd
+
+EXPORT_FORMATS = ["xlsx", "csv", "parquet", "json", "none"]
+DATE_FORMAT = "yyyy-mm-dd hh:mm:ss"
+ROWS_PER_BLOCK = 10000
+
+
+class jira_export(object):
+
+
+    def __init__(self, filename, export_format):
+        # filename has no extension, each format adds its own
+        self.__filename = filename
+        self.__export_format = export_format
+        self.__filenames = []
+        self.__workbook = None
+        self.__excel_writer = None
+
+
+    def __enter__(self):
+        if self.__export_format == "xlsx":
+            self.__open_workbook("{0}.xlsx".format(self.__filename))
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    @property
+    def filenames(self):
+        return self.__filenames
+
+
+    def __open_workbook(self, filename):
+        try:
+            import xlsxwriter
+        except ImportError:
+            # Without xlsxwriter the whole workbook is built in memory by openpyxl
+            self.__excel_writer = pd.ExcelWriter(filename)
+        else:
+            # Rows are written to disk as they are added, so memory use doesn't grow with the number of rows
+            self.__workbook = xlsxwriter.Workbook(filename, {"constant_memory": True})
+            self.__date_format = self.__workbook.add_format({"num_format": DATE_FORMAT})
+        self.__filenames.append(filename)
+
+
+    def __get_row_values(self, data, is_date):
+        # Missing values become None, which leaves the cell empty
+        columns = []
+        for column_index, column in enumerate(data.columns):
+            values = data[column]
+            if is_date[column_index]:
+                # to_pydatetime can return a Series with a new index, so values are matched by position
+                values = pd.Series(list(values.dt.to_pydatetime()), index=values.index, dtype=object)
+            values = values.astype(object)
+            columns.append(values.where(values.notna(), None).tolist())
+        return zip(*columns)
+
+
+    def __write_worksheet(self, name, data):
+        # constant_memory only allows each row to be written once, in order, so cells are written row by row
+        worksheet = self.__workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, [str(column) for column in data.columns])
+
+        is_date = [pd.api.types.is_datetime64_any_dtype(data[column]) for column in data.columns]
+        for column_index in range(len(is_date)):
+            if is_date[column_index]:
+                # Cells without a format use the column's date format
+                worksheet.set_column(column_index, column_index, None, self.__date_format)
+
+        # Values are converted a block of rows at a time to keep memory use down
+        row_index = 1
+        for start in range(0, len(data), ROWS_PER_BLOCK):
+            for row in self.__get_row_values(data.iloc[start:start + ROWS_PER_BLOCK], is_date):
+                worksheet.write_row(row_index, 0, row)
+                row_index += 1
+
+
+    def __get_table_filename(self, name, extension):
+        return "{0}_{1}.{2}".format(self.__filename, name, extension)
+
+
+    def write(self, name, data, index = False):
+        if self.__export_format == "xlsx" and self.__workbook:
+            self.__write_worksheet(name, data.reset_index() if index else data)
+        elif self.__export_format == "xlsx":
+            data.to_excel(self.__excel_writer, sheet_name=name, index=index)
+        elif self.__export_format == "csv":
+            filename = self.__get_table_filename(name, "csv")
+            data.to_csv(filename, index=index, encoding="UTF-8")
+            self.__filenames.append(filename)
+        elif self.__export_format == "json":
+            filename = self.__get_table_filename(name, "json")
+            (data.reset_index() if index else data).to_json(filename, orient="records", date_format="iso", double_precision=15, indent=2)
+            self.__filenames.append(filename)
+        elif self.__export_format == "parquet":
+            filename = self.__get_table_filename(name, "parquet")
+            try:
+                (data.reset_index() if index else data).to_parquet(filename, index=False)
+                self.__filenames.append(filename)
+            except ImportError as err:
+                print("Failed to create \"{0}\" - {1}".format(filename, err))
+
+
+    def close(self):
+        if self.__workbook:
+            self.__workbook.close()
+            self.__workbook = None
+        if self.__excel_writer is not None:
+            self.__excel_writer.close()
+            self.__excel_writer = None
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+import tempfile
+import os.path
+import pandas as pd
+from jira_export import jira_export
+
+POINTS = pd.DataFrame({"Resolved": pd.to_datetime(["2021-01-31", "2021-02-28"]), "Story Points": [3.0, None]})
+
+
+class jira_export_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, "report")
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    def test_xlsx_sheet_matches_data(self):
+        with jira_export(self.filename, "xlsx") as export:
+            export.write("My team_Points", POINTS)
+
+        actual = pd.read_excel(export.filenames[0], sheet_name="My team_Points")
+        pd.testing.assert_frame_equal(actual, POINTS, check_dtype=False)
+
+
+    def test_xlsx_dates_kept_for_rows_filtered_from_larger_data(self):
+        tickets = pd.DataFrame({"Key": ["ABC-1", "ABC-2", "ABC-3", "ABC-4"], "Resolved": pd.to_datetime(["2020-11-08", "2021-05-14", None, "2021-06-01"])})
+        team = tickets.iloc[[1, 2, 3]]
+        with jira_export(self.filename, "xlsx") as export:
+            export.write("My team_LEAD", team)
+
+        actual = pd.read_excel(export.filenames[0], sheet_name="My team_LEAD")
+        pd.testing.assert_frame_equal(actual, team.reset_index(drop=True), check_dtype=False)
+
+
+    def test_xlsx_index_written_as_first_column(self):
+        tickets = pd.DataFrame({"BAU": [1.0, 0.0]}, index=pd.Index(["2021-01", "2021-02"], name="Resolved"))
+        with jira_export(self.filename, "xlsx") as export:
+            export.write("My team_Tickets", tickets, index=True)
+
+        actual = pd.read_excel(export.filenames[0], sheet_name="My team_Tickets")
+        self.assertEqual(list(actual.columns), ["Resolved", "BAU"])
+
+
+    def test_csv_file_created_for_each_table(self):
+        with jira_export(self.filename, "csv") as export:
+            export.write("My team_Points", POINTS)
+            export.write("My team_Total", POINTS)
+
+        self.assertEqual([os.path.basename(filename) for filename in export.filenames], ["report_My team_Points.csv", "report_My team_Total.csv"])
+
+
+    def test_json_records_written(self):
+        with jira_export(self.filename, "json") as export:
+            export.write("My team_Points", POINTS)
+
+        actual = pd.read_json(export.filenames[0], orient="records")
+        self.assertEqual(actual["Story Points"].iloc[0], 3.0)
+
+
+    def test_nothing_created_for_none(self):
+        with jira_export(self.filename, "none") as export:
+            export.write("My team_Points", POINTS)
+
+        self.assertEqual(export.filenames, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
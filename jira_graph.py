@@ -1,6 +1,13 @@
-import pandas as pd
+from jira_snapshot import jira_snapshot
+from jira_aggregate import jira_aggregate
+from jira_export import jira_export, EXPORT_FORMATS
+from jira_rollup import jira_rollup, CELL_COLUMNS
+from jira_profile import jira_profile
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
 import matplotlib.pyplot as plt
 from enum import Enum, auto
+import os.path
 
 
 AVERAGE = "Average"
@@ -30,22 +37,31 @@ class jira_graph(object):
         LEAD = auto()
 
 
-    def __init__(self, jira_config):
-        self.__config = jira_config
+    def __init__(self, jira_config, export_format = None):
+        # Only keep the settings that are needed, so the graph can be sent to another process
+        self.__category_colours = jira_config.category_colours
+        self.__parallel = jira_config.report_settings.get("parallel", False)
+        self.__export_format = export_format if export_format else jira_config.report_settings.get("export", "xlsx")
 
 
-    def __plot_monthly_team_ticket_categories(self, team_name, team_data, axis, writer, show_ylabel):
+    def __get_monthly_category_data(self, team_name, aggregate):
         # Get monthly ticket count for each category 
-        team_data = team_data.groupby([pd.Grouper(key=RESOLVED, freq='ME'), CATEGORY]).size().to_frame(name=TICKETS).reset_index()
+        team_data = aggregate.monthly_categories(team_name)
         # Change column to Year-Month (Bug: https://github.com/pandas-dev/pandas/issues/4387)
         team_data[RESOLVED] = team_data[RESOLVED].dt.strftime('%Y-%m')
-        team_data = team_data.pivot_table(values=TICKETS, index=[RESOLVED], columns=CATEGORY).fillna(0)
-        team_data.plot.bar(ax=axis, color=self.__config.category_colours, stacked=True)
+        team_data = team_data.pivot_table(values=TICKETS, index=[RESOLVED], columns=CATEGORY, observed=True).fillna(0)
 
         # Total tickets completed for each month
         ticket_total = team_data.sum(axis=1).to_frame(name=TOTAL).reset_index()
         average = ticket_total[TOTAL].mean()
         ticket_total.loc[:, AVERAGE] = average
+
+        return team_data, ticket_total, average
+
+
+    def __plot_monthly_team_ticket_categories(self, team_name, aggregate, axis, show_ylabel):
+        team_data, ticket_total, average = self.__get_monthly_category_data(team_name, aggregate)
+        team_data.plot.bar(ax=axis, color=self.__category_colours, stacked=True)
         ticket_total.plot.line(y=AVERAGE, x=RESOLVED, ax=axis, c=COLOUR_GREEN, lw=2, label=MONTHLY_AVG.format(average))
 
         ylabel = "Tickets Completed" if show_ylabel else ""
@@ -59,9 +75,6 @@ class jira_graph(object):
         for container in axis.containers:
             axis.bar_label(container, fontsize=9, label_type="center")
 
-        team_data.to_excel(writer, sheet_name="{0}_Tickets".format(team_name))
-        ticket_total.to_excel(writer, sheet_name="{0}_Total".format(team_name), index=False)
-
 
     def __set_ticket_yticks(self, axis, start_from_zero):
         next_tick = 0
@@ -79,19 +92,25 @@ class jira_graph(object):
         axis.yaxis.set_ticks(yticks)
 
 
-    def __plot_monthly_team_ticket_totals(self, team_name, team_data, axis, writer, show_ylabel):
-        ticket_data = team_data.groupby([pd.Grouper(key=RESOLVED, freq='ME')]).size().to_frame(name=TICKETS).reset_index()
-        ticket_data.plot.line(y=TICKETS, x=RESOLVED, ax=axis, c=COLOUR_OLIVE, lw=3, label="Total Tickets")
+    def __get_monthly_total_data(self, team_name, aggregate):
+        monthly_totals = aggregate.monthly_totals(team_name)
+        ticket_data = monthly_totals[[TICKETS]].reset_index()
+        ticket_data.loc[:, AVERAGE] = ticket_data[TICKETS].mean()
 
-        avg_tickets = ticket_data[TICKETS].mean()
-        ticket_data.loc[:, AVERAGE] = avg_tickets
-        ticket_data.plot.line(y=AVERAGE, x=RESOLVED, ax=axis, c=COLOUR_GREEN, lw=2, label=MONTHLY_AVG.format(avg_tickets))
+        points_data = monthly_totals[[STORY_POINTS]].reset_index()
+        points_data.loc[:, AVERAGE] = points_data[STORY_POINTS].mean()
 
-        points_data = pd.pivot_table(team_data, values=[STORY_POINTS], index=[pd.Grouper(key=RESOLVED, freq='ME')], aggfunc={STORY_POINTS: 'sum'}).reset_index()
-        points_data.plot.line(y=STORY_POINTS, x=RESOLVED, ax=axis, c=COLOUR_BLUE, lw=3, label="Total Story Points")
+        return ticket_data, points_data
 
-        avg_points = points_data[STORY_POINTS].mean()
-        points_data.loc[:, AVERAGE] = avg_points
+
+    def __plot_monthly_team_ticket_totals(self, team_name, aggregate, axis, show_ylabel):
+        ticket_data, points_data = self.__get_monthly_total_data(team_name, aggregate)
+        avg_tickets = ticket_data[AVERAGE].iloc[0]
+        avg_points = points_data[AVERAGE].iloc[0]
+
+        ticket_data.plot.line(y=TICKETS, x=RESOLVED, ax=axis, c=COLOUR_OLIVE, lw=3, label="Total Tickets")
+        ticket_data.plot.line(y=AVERAGE, x=RESOLVED, ax=axis, c=COLOUR_GREEN, lw=2, label=MONTHLY_AVG.format(avg_tickets))
+        points_data.plot.line(y=STORY_POINTS, x=RESOLVED, ax=axis, c=COLOUR_BLUE, lw=3, label="Total Story Points")
         points_data.plot.line(y=AVERAGE, x=RESOLVED, ax=axis, c=COLOUR_CYAN, lw=2, label=MONTHLY_AVG.format(avg_points))
 
         ylabel = "Number Completed" if show_ylabel else ""
@@ -101,9 +120,6 @@ class jira_graph(object):
         # Add key
         axis.legend(loc='best', fontsize='small', labelspacing=0.2)
 
-        # Save data as excel tab
-        points_data.to_excel(writer, sheet_name="{0}_Points".format(team_name), index=False)
-
 
     def __set_labels(self, axis, team_name, ylabel_text):
         axis.set_title(team_name, loc="left")
@@ -131,22 +147,20 @@ class jira_graph(object):
         axis.yaxis.set_ticks(yticks)
 
 
-    def __plot_weekly_team_stats(self, team_name, team_data, axis, writer, show_ylabel, column_type):
-        legend_label = ""
-        if column_type == self.Columns.CYCLE:
-            data_column = CYCLE_DAYS
-            legend_label = "Cycle Time"
-        elif column_type == self.Columns.LEAD:
-            data_column = LEAD_DAYS
-            legend_label = "Lead Time"
+    def __get_data_column(self, column_type):
+        return CYCLE_DAYS if column_type == self.Columns.CYCLE else LEAD_DAYS
 
-        average = team_data[data_column].mean()
-        team_data.loc[:, AVERAGE] = average
 
-        data_avg = pd.pivot_table(team_data, values=[AVERAGE], index=[pd.Grouper(key=RESOLVED, freq='W')]).reset_index()
-        data_time = pd.pivot_table(team_data, values=[data_column], index=[pd.Grouper(key=RESOLVED, freq='W')], aggfunc={data_column: 'mean'}).reset_index()
-        data_min = pd.pivot_table(team_data, values=data_column, index=[pd.Grouper(key=RESOLVED, freq='W')], aggfunc={data_column: 'min'}).reset_index()
-        data_max = pd.pivot_table(team_data, values=data_column, index=[pd.Grouper(key=RESOLVED, freq='W')], aggfunc={data_column: 'max'}).reset_index()
+    def __plot_weekly_team_stats(self, team_name, aggregate, axis, show_ylabel, column_type):
+        data_column = self.__get_data_column(column_type)
+        legend_label = "Cycle Time" if column_type == self.Columns.CYCLE else "Lead Time"
+
+        average = aggregate.team_average(team_name, data_column)
+
+        data_avg = aggregate.weekly_stats(team_name, data_column, AVERAGE).rename(columns={data_column: AVERAGE}).reset_index()
+        data_time = aggregate.weekly_stats(team_name, data_column, "mean").reset_index()
+        data_min = aggregate.weekly_stats(team_name, data_column, "min").reset_index()
+        data_max = aggregate.weekly_stats(team_name, data_column, "max").reset_index()
 
         data_avg.plot.line(y=AVERAGE, x=RESOLVED, ax=axis, c=COLOUR_RED, lw=2, label="Average ({0:.1f})".format(average))
         data_time.plot.line(y=data_column, x=RESOLVED, ax=axis, c=COLOUR_GREEN, lw=3, label=legend_label)
@@ -160,9 +174,67 @@ class jira_graph(object):
         # Add key
         axis.legend(loc='upper right', bbox_to_anchor=(1.01, 1.08), ncol=2, fontsize='small', labelspacing=0.2)
 
-        # Save data as excel tab
-        team_data.to_excel(writer, sheet_name="{0}_{1}".format(team_name, column_type.name), index=False)
-        
+
+    def write_data(self, aggregate, teams_to_show, filename):
+        # Save the data for each team as excel tabs (or a file for each table in the other formats)
+        if self.__export_format == "none":
+            return []
+
+        with jira_export(filename, self.__export_format) as export:
+            for team_name in teams_to_show:
+                team_data, ticket_total, _ = self.__get_monthly_category_data(team_name, aggregate)
+                export.write("{0}_Tickets".format(team_name), team_data, index=True)
+                export.write("{0}_Total".format(team_name), ticket_total)
+
+                _, points_data = self.__get_monthly_total_data(team_name, aggregate)
+                export.write("{0}_Points".format(team_name), points_data)
+
+                for column_type in [self.Columns.CYCLE, self.Columns.LEAD]:
+                    average = aggregate.team_average(team_name, self.__get_data_column(column_type))
+                    team_data = aggregate.team_rows(team_name).assign(**{AVERAGE: average})
+                    export.write("{0}_{1}".format(team_name, column_type.name), team_data)
+
+        return export.filenames
+
+
+    def write_png(self, aggregate, teams_to_show, output_file_png, title):
+        number_of_teams = len(teams_to_show)
+
+        # Use a single row for one team, otherwise use columns to represent each team
+        graph_rows = 4
+        graph_columns = number_of_teams
+        if number_of_teams == 1:
+            graph_rows = 1
+            graph_columns = 4
+
+        fig, axes = plt.subplots(nrows=graph_rows, ncols=graph_columns)
+        fig.suptitle(title, fontsize=24)
+
+        fig_width = (number_of_teams * 4) + (10 - number_of_teams)
+        fig_height = 40
+        if number_of_teams == 1:
+            fig_width = 30
+            fig_height = 12
+
+        fig.set_figwidth(fig_width)
+        fig.set_figheight(fig_height)
+
+        axis_index = 0
+        for team_name in teams_to_show:
+            show_ylabel = axis_index == 0
+
+            self.__plot_monthly_team_ticket_categories(team_name, aggregate, axes[0] if number_of_teams == 1 else axes[0, axis_index], show_ylabel)
+            self.__plot_monthly_team_ticket_totals(team_name, aggregate, axes[1] if number_of_teams == 1 else axes[1, axis_index], show_ylabel)
+            self.__plot_weekly_team_stats(team_name, aggregate, axes[2] if number_of_teams == 1 else axes[2,axis_index], show_ylabel, self.Columns.CYCLE)
+            self.__plot_weekly_team_stats(team_name, aggregate, axes[3] if number_of_teams == 1 else axes[3,axis_index], show_ylabel, self.Columns.LEAD)
+
+            axis_index += 1
+
+        # Save graph (saving through pyplot draws the whole figure a second time afterwards)
+        with jira_profile.span("savefig"):
+            fig.savefig(output_file_png)
+        plt.close(fig)
+
 
     def __get_teams_str(self, teams):
         teams_str = ""
@@ -186,62 +258,83 @@ class jira_graph(object):
         return teams_to_show
 
 
-    def create_ticket_graphs_by_team(self, input_file, teams):
-        if len(input_file) == 0:
-            print("Failed to create graph (empty filename)")
+    def __create_graphs(self, data, input_file, teams, cells = None):
+        # Without the rows (data is None) the graph is drawn from the rollup cells, and no data is exported
+        if (data is None and len(cells) == 0) or (data is not None and len(data) == 0):
+            return
+        if self.__export_format not in EXPORT_FORMATS:
+            print("Unknown export format: \"{0}\". Options are: {1}".format(self.__export_format, ", ".join(EXPORT_FORMATS)))
+            return
+
+        teams_in_data = cells[TEAM].unique() if data is None else data[TEAM].unique()
+        teams_to_show = self.__find_matching_teams_to_show(teams, teams_in_data)
+
+        filename = self.__generate_output_filename(input_file, teams_to_show)
+        output_file_png = "{0}.png".format(filename)
+        title = filename.split("//")[2]
+
+        # Every monthly and weekly value is calculated for all teams at once
+        with jira_profile.span("aggregate"):
+            aggregate = jira_aggregate(data, cells)
+
+        if self.__parallel:
+            # Draw the graph in another process (without a display) while the data is written
+            with ProcessPoolExecutor(max_workers=1, initializer=matplotlib.use, initargs=("Agg",)) as executor:
+                png_future = executor.submit(self.write_png, aggregate, teams_to_show, output_file_png, title)
+                with jira_profile.span("export"):
+                    data_files = self.write_data(aggregate, teams_to_show, filename)
+                with jira_profile.span("plot_wait"):
+                    png_future.result()
         else:
-            # Use parse_dates to correctly format column data as datetime
-            data = pd.read_csv(input_file, delimiter=',', encoding="UTF-8", parse_dates=[RESOLVED])
-        
-            # Only report on "Done" issues
-            data = data.loc[data[STATUS] == "Done"]
-            if len(data) == 0:
-                return
-
-            teams_to_show = self.__find_matching_teams_to_show(teams, data[TEAM].unique())
-            number_of_teams = len(teams_to_show)
+            with jira_profile.span("export"):
+                data_files = self.write_data(aggregate, teams_to_show, filename)
+            with jira_profile.span("plot"):
+                self.write_png(aggregate, teams_to_show, output_file_png, title)
+        jira_profile.count("export_bytes", sum(os.path.getsize(data_file) for data_file in data_files))
+        jira_profile.count("png_bytes", os.path.getsize(output_file_png))
+
+        if len(data_files) > 0:
+            print("Created {0} and \"{1}\"".format(", ".join("\"{0}\"".format(data_file) for data_file in data_files), output_file_png))
+        else:
+            print("Created \"{0}\"".format(output_file_png))
 
-            filename = self.__generate_output_filename(input_file, teams_to_show)
-            output_file_xlsx = "{0}.xlsx".format(filename)
-            output_file_png = "{0}.png".format(filename)
 
-            # Use a single row for one team, otherwise use columns to represent each team
-            graph_rows = 4
-            graph_columns = number_of_teams
-            if number_of_teams == 1:
-                graph_rows = 1
-                graph_columns = 4
+    def __load_rollup_cells(self, input_file):
+        # The extract's rollup has the monthly and weekly values, the rows are only loaded when they're exported
+        with jira_profile.span("rollup_load"):
+            rollup = jira_rollup.load(input_file)
+            if rollup is None or not rollup.covers(CELL_COLUMNS):
+                return None
+            return rollup.read_cells(status="Done")
 
-            fig, axes = plt.subplots(nrows=graph_rows, ncols=graph_columns)
-            title = filename.split("//")[2]
-            fig.suptitle(title, fontsize=24)
 
-            fig_width = (number_of_teams * 4) + (10 - number_of_teams)
-            fig_height = 40
-            if number_of_teams == 1:
-                fig_width = 30
-                fig_height = 12
+    def create_ticket_graphs_by_team(self, input_file, teams):
+        if len(input_file) == 0:
+            print("Failed to create graph (empty filename)")
+        else:
+            cells = self.__load_rollup_cells(input_file)
+            if cells is not None and self.__export_format == "none":
+                self.__create_graphs(None, input_file, teams, cells)
+                return
 
-            fig.set_figwidth(fig_width)
-            fig.set_figheight(fig_height)
+            # Use parse_dates to correctly format column data as datetime (a columnar snapshot is already typed)
+            with jira_profile.span("csv_load"):
+                data = jira_snapshot().read(input_file, parse_dates=[RESOLVED])
+            jira_profile.count("rows_loaded", len(data))
         
-            with pd.ExcelWriter(output_file_xlsx) as writer:
-                axis_index = 0
-
-                for team_name in teams_to_show:
-                    show_ylabel = axis_index == 0
-
-                    # Filter data for team
-                    team_data = data.loc[data[TEAM] == team_name].copy()
-
-                    self.__plot_monthly_team_ticket_categories(team_name, team_data, axes[0] if number_of_teams == 1 else axes[0, axis_index], writer, show_ylabel)
-                    self.__plot_monthly_team_ticket_totals(team_name, team_data, axes[1] if number_of_teams == 1 else axes[1, axis_index], writer, show_ylabel)
-                    self.__plot_weekly_team_stats(team_name, team_data, axes[2] if number_of_teams == 1 else axes[2,axis_index], writer, show_ylabel, self.Columns.CYCLE)
-                    self.__plot_weekly_team_stats(team_name, team_data, axes[3] if number_of_teams == 1 else axes[3,axis_index], writer, show_ylabel, self.Columns.LEAD)
+            # Only report on "Done" issues
+            data = data.loc[data[STATUS] == "Done"]
+            self.__create_graphs(data, input_file, teams, cells)
 
-                    axis_index += 1
 
-            # Save graph
-            plt.savefig(output_file_png)
+    def create_ticket_graphs_from_store(self, store, filter_name, teams):
+        snapshot_filename = store.get_snapshot_filename(filter_name)
+        cells = self.__load_rollup_cells(snapshot_filename)
+        if cells is not None and self.__export_format == "none":
+            self.__create_graphs(None, snapshot_filename, teams, cells)
+            return
 
-            print("Created \"{0}\" and \"{1}\"".format(output_file_xlsx, output_file_png))
\ No newline at end of file
+        with jira_profile.span("store_load"):
+            data = store.read_filter_data(filter_name, status="Done", parse_dates=[RESOLVED])
+        jira_profile.count("rows_loaded", len(data))
+        self.__create_graphs(data, snapshot_filename, teams, cells)
\ No newline at end of file
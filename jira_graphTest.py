@@ -0,0 +1,56 @@
+import unittest
+import contextlib
+import tempfile
+import shutil
+import glob
+import io
+import os
+import yaml
+from jira_config import jira_config
+from jira_graph import jira_graph
+
+INPUT_FILE = ".//data//F//2021_06_01_tickets.csv"
+
+
+class jira_graph_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        with open("test_conf.yaml", "r") as config_file:
+            self.settings = yaml.safe_load(config_file)
+        os.makedirs(os.path.join(self.folder.name, "data", "F"))
+        shutil.copyfile("test_tickets.csv", os.path.join(self.folder.name, "data", "F", "2021_06_01_tickets.csv"))
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+
+
+    def tearDown(self):
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+
+    def __create_png(self, report_settings):
+        self.settings["report"] = report_settings
+        with open("jira_conf.yaml", "w") as config_file:
+            yaml.safe_dump(self.settings, config_file)
+        config = jira_config()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            jira_graph(config).create_ticket_graphs_by_team(INPUT_FILE, config.teams)
+        output_file_png = glob.glob(os.path.join("data", "F", "*.png"))[0]
+        with open(output_file_png, "rb") as png_file:
+            png = png_file.read()
+        os.remove(output_file_png)
+        return os.path.basename(output_file_png), png
+
+
+    def test_parallel_png_same_as_serial(self):
+        # The parallel process uses the "Agg" backend, the .PNG file should be drawn the same whichever backend the serial path has
+        expected = self.__create_png({"parallel": False})
+        actual = self.__create_png({"parallel": True})
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,227 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import sqlite3
+import json
+import csv
+import re
+import os.path
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SNAPSHOT_FILENAME = re.compile(r"^(\d{4})_(\d{2})_(\d{2})_tickets\.csv$")
+KEY = "Key"
+STATUS = "Status"
+TEXT_COLUMNS = ["Key", "Summary", "Category", "Team", "Status", "Created", "Resolved", "Epic", "Epic ID", "Issue Type"]
+
+
+def to_json(values):
+    # orjson is optional, it's several times faster for the number of rows in a full import
+    if orjson:
+        return orjson.dumps(values).decode("UTF-8")
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_snapshot(filename):
+    # Module level so snapshots can be read in other processes, each row is kept as the JSON text it's stored as
+    with open(filename, 'r', newline='', encoding="UTF-8") as file:
+        reader = csv.reader(file)
+        columns = next(reader, None)
+        if not columns or columns[0] != KEY:
+            return None
+        status_index = columns.index(STATUS) if STATUS in columns else None
+
+        rows = []
+        for row in reader:
+            status = row[status_index] if status_index is not None else None
+            rows.append((row[0], status, to_json(row)))
+        return columns, rows
+
+
+class jira_history(object):
+    # Each issue's state is stored once for each period it didn't change, "valid_to" is the first day it changed (NULL while it's current).
+    # The values are stored as a JSON list, the columns are saved with the day the state started
+    __create_days = "CREATE TABLE IF NOT EXISTS history_days (filter TEXT, day TEXT, tickets INTEGER, columns TEXT, PRIMARY KEY (filter, day)) WITHOUT ROWID"
+    __create_intervals = "CREATE TABLE IF NOT EXISTS history (filter TEXT, key TEXT, valid_from TEXT, valid_to TEXT, position INTEGER, status TEXT, data TEXT, PRIMARY KEY (filter, key, valid_from)) WITHOUT ROWID"
+    __create_current_index = "CREATE INDEX IF NOT EXISTS idx_history_valid_to ON history (filter, valid_to)"
+    __select_state = ("SELECT history_days.columns, history.data FROM history JOIN history_days ON history_days.filter = history.filter AND history_days.day = history.valid_from "
+                      "WHERE history.filter = ? AND history.valid_from <= ? AND (history.valid_to IS NULL OR history.valid_to > ?) ORDER BY history.position, history.key")
+
+
+    def __init__(self, filename):
+        folder = os.path.dirname(filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.__filename = filename
+        self.__current = (None, None)
+        self.__connection = sqlite3.connect(filename, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        with self.__connection:
+            self.__connection.execute(self.__create_days)
+            self.__connection.execute(self.__create_intervals)
+            self.__connection.execute(self.__create_current_index)
+
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    def close(self):
+        self.__connection.close()
+
+
+    def get_filters(self):
+        return [row[0] for row in self.__connection.execute("SELECT DISTINCT filter FROM history_days ORDER BY filter")]
+
+
+    def get_days(self, filter_name):
+        return [row[0] for row in self.__connection.execute("SELECT day FROM history_days WHERE filter = ? ORDER BY day", (filter_name,))]
+
+
+    def get_interval_count(self, filter_name):
+        return self.__connection.execute("SELECT COUNT(*) FROM history WHERE filter = ?", (filter_name,)).fetchone()[0]
+
+
+    def __get_last_day(self, filter_name):
+        return self.__connection.execute("SELECT MAX(day) FROM history_days WHERE filter = ?", (filter_name,)).fetchone()[0]
+
+
+    def __get_current(self, filter_name):
+        # The current state is kept between days, so importing a filter's snapshots only reads it once
+        if self.__current[0] != filter_name:
+            current = {key: (valid_from, data) for key, valid_from, data in
+                       self.__connection.execute("SELECT key, valid_from, data FROM history WHERE filter = ? AND valid_to IS NULL", (filter_name,))}
+            self.__current = (filter_name, current)
+        return self.__current[1]
+
+
+    def add_snapshot(self, filter_name, day, columns, rows):
+        # rows are (key, status, JSON list of values) in the snapshot's order, days can only be added after the last day in the history
+        last_day = self.__get_last_day(filter_name)
+        if last_day and day <= last_day:
+            return False
+
+        current = self.__get_current(filter_name)
+        if last_day and self.__get_columns(filter_name, last_day) != columns:
+            # Every ticket's state starts again when the columns change
+            current = {key: (valid_from, None) for key, (valid_from, _) in current.items()}
+
+        closed, added = [], []
+        states = {}
+        for position, (key, status, data) in enumerate(rows):
+            if key in states:
+                continue
+            previous = current.get(key)
+            if previous and previous[1] == data:
+                states[key] = previous
+                continue
+            if previous:
+                closed.append((day, filter_name, key, previous[0]))
+            added.append((filter_name, key, day, position, status, data))
+            states[key] = (day, data)
+        # Issues no longer in the filter
+        closed.extend((day, filter_name, key, valid_from) for key, (valid_from, _) in current.items() if key not in states)
+
+        try:
+            with self.__connection:
+                self.__connection.executemany("UPDATE history SET valid_to = ? WHERE filter = ? AND key = ? AND valid_from = ?", closed)
+                self.__connection.executemany("INSERT INTO history (filter, key, valid_from, valid_to, position, status, data) VALUES (?, ?, ?, NULL, ?, ?, ?)", added)
+                self.__connection.execute("INSERT INTO history_days (filter, day, tickets, columns) VALUES (?, ?, ?, ?)", (filter_name, day, len(states), to_json(columns)))
+        except sqlite3.Error:
+            self.__current = (None, None)
+            raise
+        self.__current = (filter_name, states)
+
+        return True
+
+
+    def __get_columns(self, filter_name, day):
+        row = self.__connection.execute("SELECT columns FROM history_days WHERE filter = ? AND day = ?", (filter_name, day)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+    def __find_snapshots(self, folder):
+        snapshots = []
+        for filename in os.listdir(folder):
+            match = SNAPSHOT_FILENAME.match(filename)
+            if match:
+                snapshots.append((date(*[int(part) for part in match.groups()]).isoformat(), os.path.join(folder, filename)))
+        return sorted(snapshots)
+
+
+    def import_folders(self, folders, workers = 1):
+        # The filter's data folder name is used as the filter name, only days after the last one imported are added
+        snapshots = []
+        for folder in folders:
+            filter_name = os.path.basename(os.path.normpath(folder))
+            last_day = self.__get_last_day(filter_name)
+            snapshots.extend((filter_name, day, filename) for day, filename in self.__find_snapshots(folder) if last_day is None or day > last_day)
+
+        # The .CSV files are read in parallel, and added to the history in date order as they're read
+        filenames = [filename for _, _, filename in snapshots]
+        imported = 0
+        if workers > 1 and len(snapshots) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                imported = self.__add_snapshots(snapshots, executor.map(read_snapshot, filenames, chunksize=4))
+        else:
+            imported = self.__add_snapshots(snapshots, map(read_snapshot, filenames))
+
+        return imported
+
+
+    def __add_snapshots(self, snapshots, snapshot_rows):
+        imported = 0
+        for (filter_name, day, filename), snapshot in zip(snapshots, snapshot_rows):
+            if snapshot is None:
+                print("Skipped \"{0}\", it isn't a tickets .CSV file".format(filename))
+            elif self.add_snapshot(filter_name, day, *snapshot):
+                imported += 1
+        return imported
+
+
+    def read_state(self, filter_name, day):
+        # The tickets in the filter on the day (or the last day before it in the history), as they were in that day's .CSV file
+        import pandas as pd
+
+        day = day.isoformat() if isinstance(day, date) else day
+        # Rows are in the order the tickets were first seen, the columns can change between days
+        columns = {}
+        rows = []
+        for columns_json, data in self.__connection.execute(self.__select_state, (filter_name, day, day)):
+            if columns_json not in columns:
+                columns[columns_json] = json.loads(columns_json)
+            rows.append(dict(zip(columns[columns_json], json.loads(data))))
+        data = pd.DataFrame(rows)
+        for column in data.columns:
+            if column not in TEXT_COLUMNS:
+                data[column] = pd.to_numeric(data[column], errors="coerce")
+
+        return data
+
+
+    def cumulative_flow(self, filter_name, start = None, end = None):
+        # The number of tickets in each status on each day in the history
+        import pandas as pd
+
+        days = [day for day in self.get_days(filter_name) if (start is None or day >= str(start)) and (end is None or day <= str(end))]
+        intervals = pd.read_sql_query("SELECT valid_from, valid_to, status FROM history WHERE filter = ?", self.__connection, params=[filter_name])
+        if len(days) == 0 or len(intervals) == 0:
+            return pd.DataFrame(index=pd.Index(pd.to_datetime(days), name="Day"))
+
+        # +1 on the day a ticket enters a status and -1 on the day it leaves, the running total is the count on each day
+        intervals["status"] = intervals["status"].fillna("")
+        starts = intervals.groupby(["valid_from", "status"]).size()
+        ends = intervals.dropna(subset=["valid_to"]).groupby(["valid_to", "status"]).size()
+        changes = starts.unstack(fill_value=0).add(-ends.unstack(fill_value=0), fill_value=0).fillna(0).sort_index()
+        all_days = changes.index.union(days)
+        counts = changes.reindex(all_days, fill_value=0).cumsum().loc[days].astype("int64")
+
+        counts.index = pd.to_datetime(counts.index)
+        counts.index.name = "Day"
+        counts.columns.name = None
+        return counts
\ No newline at end of file
@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import os.path
+import os
+from jira_history import jira_history
+
+COLUMNS = "Key,Summary,Status,Lead Time\n"
+SNAPSHOTS = {
+    "2021_06_01_tickets.csv": "ABC-1,First,To Do,\nABC-2,Second,In Progress,\n",
+    "2021_06_02_tickets.csv": "ABC-1,First,To Do,\nABC-2,Second,Done,1000\n",
+    "2021_06_04_tickets.csv": "ABC-2,Second,Done,1000\nABC-3,Third,To Do,\n"
+}
+
+
+class jira_history_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filter_folder = os.path.join(self.folder.name, "Some Filter")
+        os.makedirs(self.filter_folder)
+        for filename, rows in SNAPSHOTS.items():
+            with open(os.path.join(self.filter_folder, filename), "w", encoding="UTF-8") as file:
+                file.write(COLUMNS + rows)
+        self.history = jira_history(os.path.join(self.folder.name, "history.db"))
+        self.imported = self.history.import_folders([self.filter_folder])
+
+
+    def tearDown(self):
+        self.history.close()
+        self.folder.cleanup()
+
+
+    def __import_day(self, filename, columns, rows):
+        with open(os.path.join(self.filter_folder, filename), "w", encoding="UTF-8") as file:
+            file.write(columns + rows)
+        return self.history.import_folders([self.filter_folder])
+
+
+    def test_unchanged_tickets_stored_once(self):
+        self.assertEqual(self.imported, 3)
+        self.assertEqual(self.history.get_interval_count("Some Filter"), 4)
+
+
+    def test_state_on_day_matches_snapshot(self):
+        actual = self.history.read_state("Some Filter", "2021-06-02")
+        self.assertEqual(list(actual["Key"]), ["ABC-1", "ABC-2"])
+        self.assertEqual(list(actual["Status"]), ["To Do", "Done"])
+        self.assertEqual(actual["Lead Time"].iloc[1], 1000)
+
+
+    def test_state_between_snapshots_uses_previous_day(self):
+        actual = self.history.read_state("Some Filter", "2021-06-03")
+        self.assertEqual(list(actual["Key"]), ["ABC-1", "ABC-2"])
+
+
+    def test_cumulative_flow_counts_each_status(self):
+        actual = self.history.cumulative_flow("Some Filter")
+        self.assertEqual(list(actual["To Do"]), [1, 1, 1])
+        self.assertEqual(list(actual["Done"]), [0, 1, 1])
+        self.assertEqual(list(actual["In Progress"]), [1, 0, 0])
+
+
+    def test_imported_days_are_skipped(self):
+        actual = self.history.import_folders([self.filter_folder])
+        self.assertEqual(actual, 0)
+        self.assertEqual(self.history.get_days("Some Filter"), ["2021-06-01", "2021-06-02", "2021-06-04"])
+
+
+
+    def test_ticket_back_in_filter_starts_new_interval(self):
+        # ABC-1 left the filter on the 4th
+        self.__import_day("2021_06_05_tickets.csv", COLUMNS, "ABC-1,First,To Do,\nABC-2,Second,Done,1000\nABC-3,Third,To Do,\n")
+        self.assertEqual(self.history.get_interval_count("Some Filter"), 5)
+        self.assertEqual(list(self.history.read_state("Some Filter", "2021-06-04")["Key"]), ["ABC-2", "ABC-3"])
+        self.assertEqual(list(self.history.read_state("Some Filter", "2021-06-05")["Key"]), ["ABC-1", "ABC-2", "ABC-3"])
+
+
+    def test_changed_columns_start_new_intervals(self):
+        self.__import_day("2021_06_05_tickets.csv", "Key,Summary,Status,Lead Time,Team\n", "ABC-2,Second,Done,1000,Team 1\nABC-3,Third,To Do,,Team 2\n")
+        self.assertEqual(self.history.get_interval_count("Some Filter"), 6)
+        self.assertEqual(list(self.history.read_state("Some Filter", "2021-06-04").columns), ["Key", "Summary", "Status", "Lead Time"])
+        self.assertEqual(list(self.history.read_state("Some Filter", "2021-06-05")["Team"]), ["Team 1", "Team 2"])
+
+
+    def test_unchanged_tickets_stored_once_after_reopening(self):
+        self.history.close()
+        self.history = jira_history(os.path.join(self.folder.name, "history.db"))
+        self.__import_day("2021_06_05_tickets.csv", COLUMNS, "ABC-2,Second,Done,1000\nABC-3,Third,In Progress,\n")
+        self.assertEqual(self.history.get_interval_count("Some Filter"), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,20 @@
+import re
+
+ORDER_BY = re.compile(r"\s+ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+
+
+def split_order_by(jql):
+    match = ORDER_BY.search(jql)
+    if match:
+        return jql[:match.start()], jql[match.start():]
+    return jql, ""
+
+
+def add_condition(jql, condition):
+    # Keep the ORDER BY at the end so the results are returned in the same order as the filter
+    query, order_by = split_order_by(jql)
+    return "({0}) AND ({1}){2}".format(query, condition, order_by)
+
+
+def keys_condition(keys):
+    return "key in ({0})".format(", ".join(keys))
\ No newline at end of file
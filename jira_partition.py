@@ -0,0 +1,95 @@
+from jira_jql import add_condition
+from datetime import date
+import math
+
+DATE_FIELDS = ["created", "resolutiondate", "updated"]
+PROJECT = "project"
+
+
+class jira_partition(object):
+
+
+    def __init__(self, settings):
+        self.__field = settings["field"]
+        self.__slices = settings.get("slices", 4)
+        # Without "months" the width is set from the filter's oldest date, when it's known
+        self.__months = settings.get("months", 1)
+        self.__months_configured = "months" in settings
+        self.__values = settings.get("values", [])
+        self.__workers = settings.get("workers")
+
+        if self.__field != PROJECT and self.__field not in DATE_FIELDS:
+            raise ValueError("Unsupported partition field: {0}".format(self.__field))
+        if self.__field == PROJECT and len(self.__values) == 0:
+            raise ValueError("Partitioning by project needs a list of values")
+
+
+    @property
+    def workers(self):
+        return self.__workers if self.__workers else len(self.get_conditions())
+
+
+    @property
+    def months(self):
+        return self.__months
+
+
+    @property
+    def date_field(self):
+        # The field to find the oldest date for, None when the slices don't depend on it
+        if self.__field in DATE_FIELDS and not self.__months_configured and self.__slices > 2:
+            return self.__field
+        return None
+
+
+    def set_oldest_date(self, oldest, today = None):
+        # The slices between the first and last are made wide enough to cover every month from the oldest date, so the first slice only has issues without a date
+        today = today if today else date.today()
+        months = (today.year - oldest.year) * 12 + today.month - oldest.month
+        self.__months = max(1, math.ceil(months / (self.__slices - 2)))
+
+
+    def __get_month_boundary(self, offset):
+        if offset == 0:
+            return "startOfMonth()"
+        return "startOfMonth({0})".format(offset)
+
+
+    def __get_date_conditions(self):
+        # Slices are ordered oldest first and together cover every issue, including those without a date
+        offsets = [-(index * self.__months) for index in range(self.__slices - 2, -1, -1)]
+        boundaries = [self.__get_month_boundary(offset) for offset in offsets]
+
+        conditions = ["{0} < {1} OR {0} is EMPTY".format(self.__field, boundaries[0])]
+        for start, end in zip(boundaries, boundaries[1:]):
+            conditions.append("{0} >= {1} AND {0} < {2}".format(self.__field, start, end))
+        conditions.append("{0} >= {1}".format(self.__field, boundaries[-1]))
+
+        return conditions
+
+
+    def __get_project_conditions(self):
+        conditions = ["{0} = \"{1}\"".format(PROJECT, value) for value in self.__values]
+        quoted_values = ", ".join("\"{0}\"".format(value) for value in self.__values)
+        conditions.append("{0} not in ({1})".format(PROJECT, quoted_values))
+
+        return conditions
+
+
+    def get_conditions(self):
+        if self.__field == PROJECT:
+            return self.__get_project_conditions()
+        if self.__slices < 2:
+            return [""]
+        return self.__get_date_conditions()
+
+
+    def get_slice_jql(self, jql):
+        slices = []
+        for condition in self.get_conditions():
+            if condition:
+                slices.append(add_condition(jql, condition))
+            else:
+                slices.append(jql)
+
+        return slices
\ No newline at end of file
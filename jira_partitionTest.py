@@ -0,0 +1,131 @@
+import unittest
+import contextlib
+import tempfile
+import io
+import os
+import re
+import yaml
+from jira_partition import jira_partition
+from datetime import date
+from jira_standin import jira_standin
+from jira_config import jira_config
+from jira_data import jira_data
+
+JQL = "project = ABC AND status = Done ORDER BY resolutiondate"
+
+
+class jira_partition_test(unittest.TestCase):
+
+
+    def test_date_slices_cover_all_issues(self):
+        partition = jira_partition({"field": "resolutiondate", "slices": 3})
+        actual = partition.get_conditions()
+        self.assertEqual(actual, ["resolutiondate < startOfMonth(-1) OR resolutiondate is EMPTY",
+                                  "resolutiondate >= startOfMonth(-1) AND resolutiondate < startOfMonth()",
+                                  "resolutiondate >= startOfMonth()"])
+
+
+    def test_date_slices_use_month_width(self):
+        partition = jira_partition({"field": "created", "slices": 3, "months": 6})
+        actual = partition.get_conditions()[1]
+        self.assertEqual(actual, "created >= startOfMonth(-6) AND created < startOfMonth()")
+
+
+    def test_date_slices_sized_from_oldest_date(self):
+        partition = jira_partition({"field": "created", "slices": 4})
+        partition.set_oldest_date(date(2019, 3, 15), date(2026, 10, 18))
+        actual = partition.get_conditions()
+        self.assertEqual(partition.months, 46)
+        self.assertEqual(actual[0:2], ["created < startOfMonth(-92) OR created is EMPTY", "created >= startOfMonth(-92) AND created < startOfMonth(-46)"])
+
+
+    def test_oldest_date_only_needed_without_months(self):
+        self.assertEqual(jira_partition({"field": "updated", "slices": 4}).date_field, "updated")
+        self.assertIsNone(jira_partition({"field": "updated", "slices": 4, "months": 2}).date_field)
+        self.assertIsNone(jira_partition({"field": "project", "values": ["ABC"]}).date_field)
+
+
+    def test_project_slices_include_remainder(self):
+        partition = jira_partition({"field": "project", "values": ["ABC", "DEF"]})
+        actual = partition.get_conditions()
+        self.assertEqual(actual, ["project = \"ABC\"", "project = \"DEF\"", "project not in (\"ABC\", \"DEF\")"])
+
+
+    def test_slice_jql_keeps_order_by(self):
+        partition = jira_partition({"field": "project", "values": ["ABC"]})
+        actual = partition.get_slice_jql(JQL)[0]
+        self.assertEqual(actual, "(project = ABC AND status = Done) AND (project = \"ABC\") ORDER BY resolutiondate")
+
+
+    def test_single_slice_returns_original_jql(self):
+        partition = jira_partition({"field": "created", "slices": 1})
+        actual = partition.get_slice_jql(JQL)
+        self.assertEqual(actual, [JQL])
+
+
+    def test_workers_default_to_number_of_slices(self):
+        partition = jira_partition({"field": "created", "slices": 5})
+        self.assertEqual(partition.workers, 5)
+
+
+    def test_unsupported_field_raises_error(self):
+        with self.assertRaises(ValueError):
+            jira_partition({"field": "labels"})
+
+
+
+class jira_partition_extract_test(unittest.TestCase):
+    # Every issue is in the first two slices, and the stand-in returns every issue for slice conditions it doesn't understand
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+        self.standin = jira_standin({"size": 300})
+        self.standin.start()
+
+
+    def tearDown(self):
+        self.standin.stop()
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+
+    def __extract(self, partition, extract_settings):
+        config = {
+            "jira": {"url": self.standin.url, "user": "user", "token": "token"},
+            "team": {"team1": "Team 1", "team2": "Team 2"},
+            "category": {"bau": "BAU,tab:blue", "project": "Project,peru"},
+            "filter": {"stand_in": 1},
+            "extract": extract_settings
+        }
+        if partition:
+            config["partition"] = {"stand_in": partition}
+        with open("jira_conf.yaml", "w") as config_file:
+            yaml.safe_dump(config, config_file)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            filename = jira_data(jira_config()).save_filter_data(1)
+        # Slices are fetched at the same time, an issue in more than one slice is kept in the slice that returned it first
+        with open(filename, "r", encoding="UTF-8") as csv_file:
+            rows = sorted(csv_file.read().splitlines())
+        os.remove(filename)
+        return rows, re.search(r"Team Not Found for (\d+) tickets", output.getvalue()).group(1)
+
+
+    def test_issues_in_several_slices_counted_once(self):
+        expected = self.__extract(None, {})
+        actual = self.__extract({"field": "project", "values": ["BENCH", "BENCH"]}, {})
+        self.assertEqual(actual, expected)
+
+
+    def test_streamed_issues_in_several_slices_counted_once(self):
+        expected = self.__extract(None, {})
+        actual = self.__extract({"field": "project", "values": ["BENCH", "BENCH"]}, {"streaming": True})
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
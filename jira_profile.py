@@ -0,0 +1,224 @@
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+import threading
+import cProfile
+import json
+import time
+import sys
+import os
+
+MEGABYTE = 1024 * 1024
+# Spans directly below the command, each one can be profiled with cProfile
+PHASE_DEPTH = 2
+NO_SPAN = nullcontext()
+
+
+class jira_profile(object):
+    __active = None
+    __default_settings = {"path": ".//data//profile", "sample_interval": 0.05, "cprofile": False}
+
+
+    def __init__(self, name, settings = None, args = None):
+        self.__name = name
+        self.__args = args if args else []
+        self.__settings = dict(self.__default_settings)
+        if settings:
+            self.__settings.update(settings)
+
+        self.__spans = {}
+        self.__counters = {}
+        self.__open_spans = {}
+        self.__phase_profiles = {}
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__main_stack = []
+        self.__stopped = threading.Event()
+        self.__sampler = None
+        self.__current_rss = None
+        self.__peak_rss = None
+        self.__started = None
+        self.__start = None
+
+
+    @classmethod
+    def span(cls, name):
+        # Times the code in a with block, doing nothing unless a profile has been started
+        if cls.__active is None:
+            return NO_SPAN
+        return cls.__active.__timed_span(name)
+
+
+    @classmethod
+    def count(cls, name, value = 1):
+        if cls.__active is not None:
+            cls.__active.__add_count(name, value)
+
+
+    @property
+    def spans(self):
+        return [dict(span) for span in self.__spans.values()]
+
+
+    @property
+    def counters(self):
+        return dict(self.__counters)
+
+
+    def __read_rss(self):
+        # Current resident memory in MB, Linux only (None elsewhere, the peak from resource is still recorded)
+        try:
+            with open("/proc/self/statm", "r") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MEGABYTE
+        except (OSError, ValueError, AttributeError):
+            return None
+
+
+    def __get_max_rss(self):
+        try:
+            import resource
+        except ImportError:
+            return None
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        return max_rss / MEGABYTE if sys.platform == "darwin" else max_rss / 1024
+
+
+    def __sample_rss(self):
+        rss = self.__read_rss()
+        if rss is None:
+            return
+        with self.__lock:
+            self.__current_rss = rss
+            self.__peak_rss = rss if self.__peak_rss is None else max(self.__peak_rss, rss)
+            for path in self.__open_spans:
+                span = self.__spans[path]
+                span["peak_rss_mb"] = rss if span["peak_rss_mb"] is None else max(span["peak_rss_mb"], rss)
+
+
+    def __run_sampler(self):
+        while not self.__stopped.wait(self.__settings["sample_interval"]):
+            self.__sample_rss()
+
+
+    def __get_stack(self):
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            # Spans in worker threads are nested under whatever the main thread is doing when they start
+            is_main = threading.current_thread() is threading.main_thread()
+            stack = self.__main_stack if is_main else list(self.__main_stack)
+            self.__local.stack = stack
+        return stack
+
+
+    def __open_span(self, path, name, depth):
+        with self.__lock:
+            span = self.__spans.get(path)
+            if span is None:
+                span = {"path": path, "name": name, "depth": depth, "calls": 0, "seconds": 0.0, "peak_rss_mb": self.__current_rss}
+                self.__spans[path] = span
+            span["calls"] += 1
+            self.__open_spans[path] = self.__open_spans.get(path, 0) + 1
+
+
+    def __close_span(self, path, seconds):
+        with self.__lock:
+            self.__spans[path]["seconds"] += seconds
+            self.__open_spans[path] -= 1
+            if self.__open_spans[path] == 0:
+                del self.__open_spans[path]
+
+
+    def __start_phase_profile(self, path, depth):
+        if not self.__settings["cprofile"] or depth != PHASE_DEPTH or threading.current_thread() is not threading.main_thread():
+            return None
+
+        phase_profile = self.__phase_profiles.setdefault(path, cProfile.Profile())
+        try:
+            phase_profile.enable()
+        except ValueError:
+            # Another profiler is already running
+            return None
+        return phase_profile
+
+
+    @contextmanager
+    def __timed_span(self, name):
+        stack = self.__get_stack()
+        stack.append(name)
+        path = "/".join(stack)
+        self.__open_span(path, name, len(stack))
+        phase_profile = self.__start_phase_profile(path, len(stack))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if phase_profile:
+                phase_profile.disable()
+            self.__close_span(path, seconds)
+            stack.pop()
+
+
+    def __add_count(self, name, value):
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+
+    def start(self):
+        self.__started = datetime.now()
+        self.__start = time.perf_counter()
+        self.__sample_rss()
+        if self.__settings["sample_interval"]:
+            self.__sampler = threading.Thread(target=self.__run_sampler, daemon=True)
+            self.__sampler.start()
+        jira_profile.__active = self
+        return self
+
+
+    def __get_filename(self, suffix):
+        path = self.__settings["path"]
+        if not os.path.exists(path):
+            os.makedirs(path)
+        return "{0}//{1:%Y_%m_%d_%H%M%S}_{2}{3}".format(path, self.__started, self.__name, suffix)
+
+
+    def __save_hottest_phase(self):
+        phases = [path for path in self.__phase_profiles if path in self.__spans]
+        if len(phases) == 0:
+            return None
+
+        hottest = max(phases, key=lambda path: self.__spans[path]["seconds"])
+        filename = self.__get_filename("_{0}.prof".format(self.__spans[hottest]["name"]))
+        self.__phase_profiles[hottest].dump_stats(filename)
+        return {"phase": hottest, "file": filename}
+
+
+    def stop(self):
+        # Returns the name of the trace file (None if the profile wasn't started)
+        if self.__start is None:
+            return None
+        jira_profile.__active = None
+        self.__stopped.set()
+        if self.__sampler:
+            self.__sampler.join()
+        self.__sample_rss()
+
+        trace = {
+            "command": self.__name,
+            "args": self.__args,
+            "started": self.__started.isoformat(),
+            "seconds": time.perf_counter() - self.__start,
+            "peak_rss_mb": self.__peak_rss,
+            "max_rss_mb": self.__get_max_rss(),
+            "spans": self.spans,
+            "counters": self.counters,
+            "cprofile": self.__save_hottest_phase()
+        }
+
+        self.__start = None
+
+        filename = self.__get_filename(".json")
+        with open(filename, "w") as trace_file:
+            json.dump(trace, trace_file, indent=2)
+        return filename
\ No newline at end of file
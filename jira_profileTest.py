@@ -0,0 +1,57 @@
+import unittest
+import tempfile
+import json
+from jira_profile import jira_profile
+
+
+class jira_profile_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.profile = jira_profile("test", {"path": self.folder.name, "sample_interval": 0})
+
+
+    def tearDown(self):
+        self.profile.stop()
+        self.folder.cleanup()
+
+
+    def test_nothing_recorded_when_not_started(self):
+        with jira_profile.span("http"):
+            jira_profile.count("http_bytes", 10)
+        self.assertEqual(self.profile.spans, [])
+        self.assertEqual(self.profile.counters, {})
+
+
+    def test_nested_spans_recorded_by_path(self):
+        self.profile.start()
+        with jira_profile.span("extract"):
+            for _ in range(3):
+                with jira_profile.span("http"):
+                    pass
+        actual = [(span["path"], span["depth"], span["calls"]) for span in self.profile.spans]
+        self.assertEqual(actual, [("extract", 1, 1), ("extract/http", 2, 3)])
+
+
+    def test_counters_added_together(self):
+        self.profile.start()
+        jira_profile.count("rows_extracted", 100)
+        jira_profile.count("rows_extracted", 50)
+        jira_profile.count("http_requests")
+        self.assertEqual(self.profile.counters, {"rows_extracted": 150, "http_requests": 1})
+
+
+    def test_trace_saved_when_stopped(self):
+        self.profile.start()
+        with jira_profile.span("report"):
+            jira_profile.count("png_bytes", 1024)
+        with open(self.profile.stop(), "r") as trace_file:
+            trace = json.load(trace_file)
+        self.assertEqual(trace["command"], "test")
+        self.assertEqual(trace["spans"][0]["path"], "report")
+        self.assertEqual(trace["counters"], {"png_bytes": 1024})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,37 +1,242 @@
+from requests.adapters import HTTPAdapter
+from jira_cache import jira_metadata_cache, jira_response_cache
+from jira_profile import jira_profile
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 import requests
+import threading
+import time
 import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RETRY_STATUS_CODES = [429, 502, 503, 504]
+RESPONSE_CACHE_MODES = ["off", "record", "replay", "refresh"]
 
 
 class jira_request(object):
     __base_api3_url = "{0}/rest/api/3/{1}"
     __statuses = {}
+    __default_settings = {
+        "pool_size": 10,
+        "connect_timeout": 10,
+        "read_timeout": 60,
+        "max_retries": 5,
+        "backoff": 1,
+        "max_backoff": 60,
+        "json_decoder": "auto"
+    }
 
 
-    def __init__(self, base_url, auth_values):
+    def __init__(self, base_url, auth_values, settings = None, metadata_settings = None, response_cache_settings = None):
         self.__base_url = base_url
         self.__auth_values = auth_values
+        self.__settings = dict(self.__default_settings)
+        if settings:
+            self.__settings.update(settings)
+
+        self.__metadata_cache = None
+        if metadata_settings:
+            self.__metadata_cache = jira_metadata_cache(metadata_settings.get("path", ".//data//metadata.json"),
+                                                        metadata_settings.get("ttl", 3600), metadata_settings.get("offline", False))
+
+        self.__response_cache = None
+        self.__response_cache_mode = "off"
+        if response_cache_settings:
+            self.__response_cache_mode = response_cache_settings.get("mode", "record")
+            if self.__response_cache_mode not in RESPONSE_CACHE_MODES:
+                print("Unknown response cache mode: \"{0}\". Options are: {1}".format(self.__response_cache_mode, ", ".join(RESPONSE_CACHE_MODES)))
+                self.__response_cache_mode = "off"
+            if self.__response_cache_mode != "off":
+                self.__response_cache = jira_response_cache(response_cache_settings.get("path", ".//data//responses"), response_cache_settings.get("max_size_mb", 1024))
+
+        self.__decode_json = self.__get_json_decoder(self.__settings["json_decoder"])
+        self.__retries = 0
+        self.__throttled_seconds = 0
+        self.__counter_lock = threading.Lock()
+        self.__session = self.__create_session()
+
+
+    def __create_session(self):
+        # Keep-alive is on by default for a session, the adapter controls how many connections are pooled
+        session = requests.Session()
+        session.auth = self.__auth_values
+        session.headers.update({"Accept": "application/json"})
+
+        pool_size = self.__settings["pool_size"]
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+
+    def __get_json_decoder(self, json_decoder):
+        # orjson is optional, it decodes the search pages several times faster when it's installed
+        if json_decoder in ["auto", "orjson"] and orjson:
+            return orjson.loads
+        if json_decoder == "orjson":
+            print("orjson is not installed, using json")
+        return json.loads
+
+
+    @property
+    def retries(self):
+        return self.__retries
+
+
+    @property
+    def throttled_seconds(self):
+        return self.__throttled_seconds
+
+
+    @property
+    def response_cache(self):
+        return self.__response_cache
 
 
     def __load_statuses(self):
-        data = self.get_api3_request("status")
+        data = self.get_api3_metadata("status")
         for status in data:
             self.__statuses[status["id"]] = status["name"]
 
 
-    def get_status_name(self, status_id):
+    def get_statuses(self):
         if len(self.__statuses) == 0:
-            self.__load_statuses()        
+            self.__load_statuses()
 
-        return self.__statuses.get(status_id)
+        return self.__statuses
 
 
-    def __get_request(self, url):
-        response = requests.get(url, auth=self.__auth_values)
-        if response.ok:
-            return json.loads(response.content)
-        else:
-            response.raise_for_status()
+    def get_status_name(self, status_id):
+        return self.get_statuses().get(status_id)
+
+
+    def __get_retry_after(self, retry_after):
+        # The number of seconds, or an HTTP date. None when the header can't be read
+        try:
+            seconds = float(retry_after)
+            return None if math.isnan(seconds) else max(0, seconds)
+        except ValueError:
+            pass
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+            if retry_date.tzinfo is None:
+                # A "-0000" zone has no timezone, it's treated as UTC
+                retry_date = retry_date.replace(tzinfo=timezone.utc)
+            return max(0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+    def __get_retry_delay(self, response, attempt):
+        # Never longer than max_backoff, and the exponential backoff is used when Retry-After is missing or can't be read
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            delay = self.__get_retry_after(retry_after) if retry_after else None
+            if delay is not None:
+                return min(delay, self.__settings["max_backoff"])
+
+        return min(self.__settings["backoff"] * (2 ** attempt), self.__settings["max_backoff"])
+
+
+    def __wait_before_retry(self, delay):
+        with self.__counter_lock:
+            self.__retries += 1
+            self.__throttled_seconds += delay
+        with jira_profile.span("retry_wait"):
+            time.sleep(delay)
+
+
+    def __send_request(self, url, body = None):
+        # A GET request, or a POST request when there is a body
+        timeout = (self.__settings["connect_timeout"], self.__settings["read_timeout"])
+        max_retries = self.__settings["max_retries"]
+
+        attempt = 0
+        while True:
+            try:
+                with jira_profile.span("http"):
+                    if body is None:
+                        response = self.__session.get(url, timeout=timeout)
+                    else:
+                        response = self.__session.post(url, json=body, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= max_retries:
+                    raise
+                self.__wait_before_retry(self.__get_retry_delay(None, attempt))
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+                self.__wait_before_retry(self.__get_retry_delay(response, attempt))
+                attempt += 1
+                continue
+
+            if response.ok:
+                jira_profile.count("http_requests")
+                jira_profile.count("http_bytes", len(response.content))
+                return response.content
+            else:
+                response.raise_for_status()
+
+
+    def __get_cached_response(self, url_path, url, body = None):
+        # Record uses the saved response when there is one, replay never calls Jira and refresh always does
+        key = url if body is None else "{0} {1}".format(url, json.dumps(body, sort_keys=True))
+        if self.__response_cache_mode != "refresh":
+            content = self.__response_cache.get(key)
+            if content is not None:
+                jira_profile.count("response_cache_hits")
+                return content
+            if self.__response_cache_mode == "replay":
+                raise requests.HTTPError("{0} is not in the response cache (replay)".format(url_path))
+
+        content = self.__send_request(url, body)
+        self.__response_cache.set(key, content)
+        return content
 
 
     def get_api3_request(self, url_path):
-        return self.__get_request(self.__base_api3_url.format(self.__base_url, url_path))
\ No newline at end of file
+        return self.__api3_request(url_path, None)
+
+
+    def post_api3_request(self, url_path, body):
+        return self.__api3_request(url_path, body)
+
+
+    def __api3_request(self, url_path, body):
+        url = self.__base_api3_url.format(self.__base_url, url_path)
+        if self.__response_cache:
+            content = self.__get_cached_response(url_path, url, body)
+        else:
+            content = self.__send_request(url, body)
+
+        with jira_profile.span("json_decode"):
+            return self.__decode_json(content)
+
+
+    def get_api3_metadata(self, url_path):
+        # Reference data (statuses, filters) changes rarely, so it can be cached between runs
+        if self.__metadata_cache is None:
+            return self.get_api3_request(url_path)
+
+        key = self.__base_api3_url.format(self.__base_url, url_path)
+        data = self.__metadata_cache.get(key)
+        if data is None:
+            if self.__metadata_cache.offline:
+                raise requests.HTTPError("{0} is not in the metadata cache (offline)".format(url_path))
+            data = self.get_api3_request(url_path)
+            self.__metadata_cache.set(key, data)
+
+        return data
+
+
+    def clear_metadata_cache(self):
+        if self.__metadata_cache:
+            self.__metadata_cache.clear()
+        self.__statuses.clear()
\ No newline at end of file
@@ -0,0 +1,93 @@
+import unittest
+import tempfile
+import os.path
+from requests import HTTPError
+from jira_standin import jira_standin
+from jira_request import jira_request
+
+FILTER = "filter/1"
+SEARCH = "search/jql?jql=project%20%3D%20BENCH&maxResults=500&fields=summary"
+
+
+class jira_request_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.standin = jira_standin({"size": 10})
+        self.url = self.standin.start()
+
+
+    def tearDown(self):
+        self.standin.stop()
+        self.folder.cleanup()
+
+
+    def __get_metadata(self, ttl, offline = False):
+        # A new jira_request for each call, like separate runs of extract.py
+        metadata_settings = {"path": os.path.join(self.folder.name, "metadata.json"), "ttl": ttl, "offline": offline}
+        return jira_request(self.url, ("user", "token"), None, metadata_settings).get_api3_metadata(FILTER)
+
+
+    def __search(self, mode):
+        response_cache_settings = {"mode": mode, "path": os.path.join(self.folder.name, "responses")}
+        api = jira_request(self.url, ("user", "token"), None, None, response_cache_settings)
+        return api.get_api3_request(SEARCH), api.response_cache
+
+
+    def test_metadata_cached_between_runs(self):
+        expected = self.__get_metadata(60)
+        actual = self.__get_metadata(60)
+        self.assertEqual(actual, expected)
+        self.assertEqual(self.standin.requests, 1)
+
+
+    def test_expired_metadata_requested_again(self):
+        self.__get_metadata(0)
+        self.__get_metadata(0)
+        self.assertEqual(self.standin.requests, 2)
+
+
+    def test_expired_metadata_used_when_offline(self):
+        expected = self.__get_metadata(0)
+        actual = self.__get_metadata(0, True)
+        self.assertEqual(actual, expected)
+        self.assertEqual(self.standin.requests, 1)
+
+
+    def test_uncached_metadata_fails_when_offline(self):
+        with self.assertRaises(HTTPError):
+            self.__get_metadata(60, True)
+        self.assertEqual(self.standin.requests, 0)
+
+
+
+    def test_recorded_response_used_by_next_run(self):
+        expected, _ = self.__search("record")
+        actual, response_cache = self.__search("record")
+        self.assertEqual(actual, expected)
+        self.assertEqual((response_cache.hits, response_cache.misses, self.standin.requests), (1, 0, 1))
+
+
+    def test_replay_uses_recorded_response(self):
+        expected, _ = self.__search("record")
+        actual, _ = self.__search("replay")
+        self.assertEqual(actual, expected)
+        self.assertEqual(self.standin.requests, 1)
+
+
+    def test_replay_miss_fails_without_calling_jira(self):
+        with self.assertRaises(HTTPError):
+            self.__search("replay")
+        self.assertEqual(self.standin.requests, 0)
+
+
+    def test_refresh_calls_jira_and_saves_response(self):
+        self.__search("record")
+        _, response_cache = self.__search("refresh")
+        self.__search("replay")
+        self.assertEqual((response_cache.hits, self.standin.requests), (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
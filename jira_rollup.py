@@ -0,0 +1,212 @@
+from datetime import date, timedelta
+import calendar
+import json
+import os.path
+import os
+
+TEAM = "Team"
+CATEGORY = "Category"
+STATUS = "Status"
+RESOLVED = "Resolved"
+STORY_POINTS = "Story Points"
+LEAD_DAYS = "Lead Days"
+CYCLE_DAYS = "Cycle Days"
+EPIC = "Epic"
+EPIC_ID = "Epic ID"
+TICKETS = "Tickets"
+POSITION = "Position"
+GRAIN = "Grain"
+MONTH = "month"
+WEEK = "week"
+
+# The columns each kind of rollup needs, a rollup only covers a report when the extract had all of them
+CELL_COLUMNS = [TEAM, CATEGORY, STATUS, RESOLVED, STORY_POINTS, LEAD_DAYS, CYCLE_DAYS]
+EPIC_COLUMNS = [STATUS, EPIC, EPIC_ID]
+MEASURES = [TICKETS, STORY_POINTS, "Lead Days sum", "Lead Days min", "Lead Days max", "Lead Days count", "Cycle Days sum", "Cycle Days min", "Cycle Days max", "Cycle Days count"]
+ROLLUP_VERSION = 1
+
+
+def get_rollup_filename(csv_filename):
+    # Next to the .CSV file (or where it would be when only the store is used), with the same name
+    return "{0}.rollup.json".format(csv_filename[0:len(csv_filename) - 4])
+
+
+class jira_rollup(object):
+    # Ticket counts, story point sums and lead/cycle day sum/min/max/count for each team, category, status and month or week (ending on Sunday)
+    # the ticket was resolved, and ticket counts for each epic and status. Rows can be added a batch at a time
+
+
+    def __init__(self, columns):
+        self.__columns = list(columns)
+        self.__rows = 0
+        self.__cells = {}
+        self.__epics = {}
+        self.__periods = {}
+
+
+    @property
+    def columns(self):
+        return self.__columns
+
+
+    @property
+    def rows(self):
+        return self.__rows
+
+
+    def covers(self, columns):
+        return all(column in self.__columns for column in columns)
+
+
+    def __get_periods(self, resolved):
+        # The end of the month and week each resolved date is in, most tickets share a small number of dates
+        if resolved in self.__periods:
+            return self.__periods[resolved]
+
+        periods = ("", "")
+        if resolved:
+            try:
+                day = date.fromisoformat(str(resolved)[0:10])
+                month_end = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+                week_end = day + timedelta(days=6 - day.weekday())
+                periods = (month_end.isoformat(), week_end.isoformat())
+            except ValueError:
+                pass
+        self.__periods[resolved] = periods
+        return periods
+
+
+    def __to_float(self, value):
+        if value is None or value == "":
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if value != value else value
+
+
+    def __to_text(self, value):
+        if value is None or value != value:
+            return ""
+        return str(value)
+
+
+    def __add_value(self, cell, index, value):
+        if value is None:
+            return
+        cell[index] += value
+        cell[index + 1] = value if cell[index + 1] is None else min(cell[index + 1], value)
+        cell[index + 2] = value if cell[index + 2] is None else max(cell[index + 2], value)
+        cell[index + 3] += 1
+
+
+    def __add_cells(self, rows, indexes):
+        team_index, category_index, status_index, resolved_index, points_index, lead_index, cycle_index = indexes
+        for row in rows:
+            points = self.__to_float(row[points_index])
+            lead_days = self.__to_float(row[lead_index])
+            cycle_days = self.__to_float(row[cycle_index])
+            dimensions = (self.__to_text(row[team_index]), self.__to_text(row[category_index]), self.__to_text(row[status_index]))
+            for grain, period in zip([MONTH, WEEK], self.__get_periods(row[resolved_index])):
+                key = dimensions + (grain, period)
+                cell = self.__cells.get(key)
+                if cell is None:
+                    cell = [0, 0.0, 0.0, None, None, 0, 0.0, None, None, 0]
+                    self.__cells[key] = cell
+                cell[0] += 1
+                if points is not None:
+                    cell[1] += points
+                self.__add_value(cell, 2, lead_days)
+                self.__add_value(cell, 6, cycle_days)
+
+
+    def __add_epics(self, rows, indexes):
+        # The position and Epic ID of the first ticket for each epic and status are kept, so epics can be ordered as they're first seen
+        status_index, epic_index, epic_id_index = indexes
+        for position, row in enumerate(rows, self.__rows):
+            key = (self.__to_text(row[epic_index]), self.__to_text(row[status_index]))
+            epic = self.__epics.get(key)
+            if epic is None:
+                self.__epics[key] = [1, position, self.__to_text(row[epic_id_index])]
+            else:
+                epic[0] += 1
+
+
+    def add_rows(self, rows):
+        # rows are lists of values in the order of the columns, as they're written to the .CSV file
+        if self.covers(CELL_COLUMNS):
+            self.__add_cells(rows, [self.__columns.index(column) for column in CELL_COLUMNS])
+        if self.covers(EPIC_COLUMNS):
+            self.__add_epics(rows, [self.__columns.index(column) for column in EPIC_COLUMNS])
+        self.__rows += len(rows)
+
+
+    def save(self, csv_filename):
+        filename = get_rollup_filename(csv_filename)
+        data = {
+            "version": ROLLUP_VERSION,
+            "columns": self.__columns,
+            "rows": self.__rows,
+            "cells": [list(key) + cell for key, cell in self.__cells.items()],
+            "epics": [list(key) + epic for key, epic in self.__epics.items()]
+        }
+        # Written to a temporary file first, so a report never reads a partly written rollup
+        with open(filename + ".tmp", "w", encoding="UTF-8") as rollup_file:
+            json.dump(data, rollup_file, separators=(",", ":"))
+        os.replace(filename + ".tmp", filename)
+
+        return filename
+
+
+    @classmethod
+    def load(cls, csv_filename):
+        # Only a rollup written at the same time or after the .CSV file is used
+        filename = get_rollup_filename(csv_filename)
+        if not os.path.exists(filename):
+            return None
+        if os.path.exists(csv_filename) and os.path.getmtime(filename) < os.path.getmtime(csv_filename):
+            return None
+
+        try:
+            with open(filename, "r", encoding="UTF-8") as rollup_file:
+                data = json.load(rollup_file)
+        except ValueError:
+            return None
+        if data.get("version") != ROLLUP_VERSION:
+            return None
+
+        rollup = cls(data["columns"])
+        rollup.__rows = data["rows"]
+        rollup.__cells = {tuple(values[0:5]): values[5:] for values in data["cells"]}
+        rollup.__epics = {tuple(values[0:2]): values[2:] for values in data["epics"]}
+        return rollup
+
+
+    def read_cells(self, status = None):
+        # One row for each cell, empty values are missing (NaN)
+        import pandas as pd
+
+        rows = [list(key) + cell for key, cell in self.__cells.items() if status is None or key[2] == status]
+        data = pd.DataFrame(rows, columns=[TEAM, CATEGORY, STATUS, GRAIN, RESOLVED] + MEASURES)
+        for column in [TEAM, CATEGORY, STATUS]:
+            data[column] = data[column].where(data[column] != "", None)
+        data[RESOLVED] = pd.to_datetime(data[RESOLVED].where(data[RESOLVED] != "", None))
+        data[TICKETS] = data[TICKETS].astype("int64")
+        for column in MEASURES[1:]:
+            data[column] = data[column].astype("float64")
+
+        return data
+
+
+    def read_epics(self):
+        # One row for each epic and status, in the order they're first seen
+        import pandas as pd
+
+        rows = sorted((epic[1], key[0], key[1], epic[2], epic[0]) for key, epic in self.__epics.items())
+        data = pd.DataFrame(rows, columns=[POSITION, EPIC, STATUS, EPIC_ID, TICKETS])
+        for column in [EPIC, STATUS, EPIC_ID]:
+            data[column] = data[column].where(data[column] != "", None)
+        data[TICKETS] = data[TICKETS].astype("int64")
+
+        return data
\ No newline at end of file
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import os.path
+import os
+import pandas as pd
+from jira_rollup import jira_rollup
+from jira_aggregate import jira_aggregate
+
+COLUMNS = ["Key", "Category", "Team", "Status", "Resolved", "Epic", "Epic ID", "Story Points", "Lead Days", "Cycle Days"]
+ROWS = [
+    ["ABC-1", "BAU", "My team", "Done", "2021-01-04", "First", "ABC-10", "1.0", "2.0", "1.0"],
+    ["ABC-2", "BAU", "Another team", "Done", "2021-01-05", "", "", "2.0", "4.0", ""],
+    ["ABC-3", "Project", "My team", "Done", "2021-01-06", "Second", "ABC-20", "", "6.0", ""],
+    ["ABC-4", "BAU", "My team", "To Do", "", "First", "ABC-10", "3.0", "", ""],
+    ["ABC-5", "BAU", "My team", "Done", "2021-03-10", "First", "ABC-10", "3.0", "10.0", "5.0"]
+]
+
+
+class jira_rollup_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.rollup = jira_rollup(COLUMNS)
+        self.rollup.add_rows(ROWS[0:2])
+        self.rollup.add_rows(ROWS[2:])
+
+
+    def test_cells_count_tickets_by_month(self):
+        cells = self.rollup.read_cells(status="Done")
+        months = cells.loc[(cells["Grain"] == "month") & (cells["Team"] == "My team")].sort_values(["Resolved", "Category"])
+        self.assertEqual(months["Tickets"].tolist(), [1, 1, 1])
+        self.assertEqual(months["Lead Days max"].tolist(), [2.0, 6.0, 10.0])
+
+
+    def test_weeks_end_on_sunday(self):
+        cells = self.rollup.read_cells(status="Done")
+        weeks = cells.loc[cells["Grain"] == "week", "Resolved"].dt.strftime("%Y-%m-%d")
+        self.assertEqual(sorted(weeks.unique()), ["2021-01-10", "2021-03-14"])
+
+
+    def test_epics_in_order_first_seen(self):
+        epics = self.rollup.read_epics()
+        self.assertEqual(epics["Epic"].fillna("").tolist(), ["First", "", "Second", "First"])
+        self.assertEqual(epics["Status"].tolist(), ["Done", "Done", "Done", "To Do"])
+        self.assertEqual(epics["Tickets"].tolist(), [2, 1, 1, 1])
+
+
+    def test_aggregate_from_cells_matches_rows(self):
+        data = pd.DataFrame(ROWS, columns=COLUMNS).replace("", None)
+        data = data.loc[data["Status"] == "Done"].astype({"Story Points": "float64", "Lead Days": "float64", "Cycle Days": "float64"})
+        data["Resolved"] = pd.to_datetime(data["Resolved"])
+        expected = jira_aggregate(data)
+        actual = jira_aggregate(None, self.rollup.read_cells(status="Done"))
+
+        self.assertEqual(actual.team_average("My team", "Lead Days"), expected.team_average("My team", "Lead Days"))
+        pd.testing.assert_frame_equal(actual.monthly_totals("My team"), expected.monthly_totals("My team"), check_index_type=False)
+        for aggregate in ["Average", "mean", "min", "max"]:
+            pd.testing.assert_frame_equal(actual.weekly_stats("My team", "Cycle Days", aggregate), expected.weekly_stats("My team", "Cycle Days", aggregate), check_index_type=False, check_freq=False)
+
+
+    def test_rollup_older_than_csv_not_loaded(self):
+        with tempfile.TemporaryDirectory() as folder:
+            csv_filename = os.path.join(folder, "2021_06_24_tickets.csv")
+            rollup_filename = self.rollup.save(csv_filename)
+            self.assertEqual(jira_rollup.load(csv_filename).rows, 5)
+
+            with open(csv_filename, "w") as csv_file:
+                csv_file.write("Key\n")
+            os.utime(rollup_filename, (0, 0))
+            self.assertIsNone(jira_rollup.load(csv_filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import pandas as pd
+import os.path
+
+DATE_COLUMNS = ["Created", "Resolved"]
+CATEGORY_COLUMNS = ["Category", "Team", "Status", "Issue Type"]
+FLOAT_COLUMNS = ["Story Points", "Lead Days", "Cycle Days"]
+TEXT_COLUMNS = ["Key", "Summary", "Epic", "Epic ID"]
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+ROWS_PER_BATCH = 50000
+
+
+class jira_snapshot(object):
+
+
+    def __get_snapshot_filename(self, csv_filename, snapshot_format):
+        return "{0}{1}".format(csv_filename[0:len(csv_filename) - 4], SNAPSHOT_FORMATS[snapshot_format])
+
+
+    def __apply_schema(self, data, categories = None):
+        # categories are the values seen in earlier batches, each batch's categories start with them so every batch can share one dictionary
+        for column in data.columns:
+            if column in DATE_COLUMNS:
+                data[column] = pd.to_datetime(data[column], errors="coerce")
+            elif column in CATEGORY_COLUMNS and categories is not None:
+                known = categories.setdefault(column, [])
+                seen = set(known)
+                known.extend(value for value in pd.unique(data[column].dropna()) if value not in seen)
+                data[column] = pd.Categorical(data[column], categories=list(known))
+            elif column in CATEGORY_COLUMNS:
+                data[column] = data[column].astype("category")
+            elif column in FLOAT_COLUMNS:
+                data[column] = pd.to_numeric(data[column], errors="coerce").astype("float64")
+            elif column in TEXT_COLUMNS:
+                data[column] = data[column].where(data[column] != "", None)
+            else:
+                # Lead Time and the time in status columns are whole milliseconds
+                data[column] = pd.to_numeric(data[column], errors="coerce").astype("Int64")
+
+        return data
+
+
+    def write(self, rows, columns, csv_filename, snapshot_format):
+        return self.__write_data(pd.DataFrame(rows, columns=columns), csv_filename, snapshot_format)
+
+
+    def __read_csv(self, csv_filename, chunksize = None):
+        # Read every value as text, the schema then sets the types
+        return pd.read_csv(csv_filename, delimiter=',', encoding="UTF-8", dtype=str, keep_default_na=False, chunksize=chunksize)
+
+
+    def write_from_csv(self, csv_filename, snapshot_format):
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            print("Unknown snapshot format: \"{0}\". Options are: {1}".format(snapshot_format, ", ".join(SNAPSHOT_FORMATS)))
+            return ""
+
+        try:
+            import pyarrow
+        except ImportError:
+            # Without pyarrow the whole file is converted at once
+            return self.__write_data(self.__read_csv(csv_filename), csv_filename, snapshot_format)
+
+        filename = self.__get_snapshot_filename(csv_filename, snapshot_format)
+        self.__write_batches(pyarrow, self.__read_csv(csv_filename, ROWS_PER_BATCH), filename, snapshot_format)
+        return filename
+
+
+    def __write_batches(self, pyarrow, batches, filename, snapshot_format):
+        # The .CSV file is converted a batch of rows at a time, so memory use doesn't grow with the number of tickets
+        import pyarrow.parquet
+        import pyarrow.ipc
+
+        categories = {}
+        schema = None
+        writer = None
+        try:
+            for batch in batches:
+                data = self.__apply_schema(batch, categories)
+                if writer is None:
+                    schema = self.__get_arrow_schema(pyarrow, pyarrow.Schema.from_pandas(data, preserve_index=False))
+                    if snapshot_format == "parquet":
+                        writer = pyarrow.parquet.ParquetWriter(filename, schema)
+                    else:
+                        # Each batch's categories extend the last batch's, which the file format allows as a dictionary delta
+                        writer = pyarrow.ipc.new_file(filename, schema, options=pyarrow.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+                writer.write_table(pyarrow.Table.from_pandas(data, schema=schema, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+    def __get_arrow_schema(self, pyarrow, schema):
+        # The first batch sets the types, a text column that's empty in it would otherwise have no type, and the number of categories can grow
+        fields = []
+        for field in schema:
+            if pyarrow.types.is_dictionary(field.type):
+                field = field.with_type(pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+            elif pyarrow.types.is_null(field.type):
+                field = field.with_type(pyarrow.string())
+            fields.append(field)
+        return pyarrow.schema(fields, metadata=schema.metadata)
+
+
+    def __write_data(self, data, csv_filename, snapshot_format):
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            print("Unknown snapshot format: \"{0}\". Options are: {1}".format(snapshot_format, ", ".join(SNAPSHOT_FORMATS)))
+            return ""
+
+        filename = self.__get_snapshot_filename(csv_filename, snapshot_format)
+        data = self.__apply_schema(data)
+        try:
+            if snapshot_format == "parquet":
+                data.to_parquet(filename, index=False)
+            else:
+                data.to_feather(filename)
+        except ImportError as err:
+            print("Failed to create \"{0}\" - {1}".format(filename, err))
+            return ""
+
+        return filename
+
+
+    def __find_snapshot(self, csv_filename):
+        # Only use a snapshot written at the same time or after the .CSV file
+        csv_modified = os.path.getmtime(csv_filename) if os.path.exists(csv_filename) else 0
+        for snapshot_format in SNAPSHOT_FORMATS:
+            filename = self.__get_snapshot_filename(csv_filename, snapshot_format)
+            if os.path.exists(filename) and os.path.getmtime(filename) >= csv_modified:
+                return filename, snapshot_format
+
+        return None, None
+
+
+    def __sort_categories(self, data):
+        # Categories are stored in the order they were first seen, sort them so grouping orders match the .CSV
+        for column in CATEGORY_COLUMNS:
+            if column in data.columns and isinstance(data[column].dtype, pd.CategoricalDtype):
+                data[column] = data[column].cat.reorder_categories(sorted(data[column].cat.categories))
+
+        return data
+
+
+    def __format_dates(self, data, parse_dates):
+        # Dates that aren't parsed from the .CSV file are text there, so they're returned as the same text
+        for column in DATE_COLUMNS:
+            if column in data.columns and column not in (parse_dates or []):
+                data[column] = data[column].dt.strftime("%Y-%m-%d")
+
+        return data
+
+
+    def read(self, csv_filename, parse_dates = None):
+        # The data is the same whether it's read from the snapshot or the .CSV file
+        filename, snapshot_format = self.__find_snapshot(csv_filename)
+        if filename:
+            try:
+                if snapshot_format == "parquet":
+                    data = pd.read_parquet(filename)
+                else:
+                    data = pd.read_feather(filename)
+                return self.__format_dates(self.__sort_categories(data), parse_dates)
+            except ImportError:
+                pass
+
+        return pd.read_csv(csv_filename, delimiter=',', encoding="UTF-8", parse_dates=parse_dates)
\ No newline at end of file
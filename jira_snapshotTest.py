@@ -0,0 +1,129 @@
+import unittest
+import tempfile
+import shutil
+import os
+import os.path
+import glob
+import pandas as pd
+import jira_snapshot as snapshot_module
+from jira_snapshot import jira_snapshot
+from jira_config import jira_config
+from jira_graph import jira_graph
+
+
+class jira_snapshot_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.csv_filename = os.path.join(self.folder.name, "2021_06_01_tickets.csv")
+        shutil.copyfile("test_tickets.csv", self.csv_filename)
+        self.rows_per_batch = snapshot_module.ROWS_PER_BATCH
+
+
+    def tearDown(self):
+        snapshot_module.ROWS_PER_BATCH = self.rows_per_batch
+        self.folder.cleanup()
+
+
+    def __touch_csv(self, seconds):
+        modified = os.path.getmtime(self.csv_filename) + seconds
+        os.utime(self.csv_filename, (modified, modified))
+
+
+    def test_columns_typed_by_schema(self):
+        jira_snapshot().write_from_csv(self.csv_filename, "parquet")
+        actual = jira_snapshot().read(self.csv_filename, parse_dates=["Resolved"])
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(actual["Resolved"]))
+        self.assertIsInstance(actual["Team"].dtype, pd.CategoricalDtype)
+        self.assertEqual(actual["Story Points"].dtype, "float64")
+        self.assertEqual(actual["Lead Time"].dtype, "Int64")
+        self.assertTrue(pd.isna(actual["Epic"].iloc[0]))
+
+
+    def test_snapshot_matches_csv_values(self):
+        jira_snapshot().write_from_csv(self.csv_filename, "parquet")
+        actual = jira_snapshot().read(self.csv_filename)
+        expected = pd.read_csv(self.csv_filename)
+
+        self.assertEqual(list(actual["Key"]), list(expected["Key"]))
+        pd.testing.assert_series_equal(actual["Lead Days"], expected["Lead Days"])
+
+
+    def test_dates_not_parsed_read_as_csv_text(self):
+        jira_snapshot().write_from_csv(self.csv_filename, "parquet")
+        actual = jira_snapshot().read(self.csv_filename, parse_dates=["Resolved"])
+        expected = pd.read_csv(self.csv_filename, parse_dates=["Resolved"])
+
+        pd.testing.assert_series_equal(actual["Created"], expected["Created"])
+
+
+    def test_report_export_same_from_snapshot_and_csv(self):
+        # Reports use the snapshot when there is one, the exported sheets shouldn't change
+        working_folder = os.getcwd()
+        config = jira_config("test_conf.yaml")
+        os.makedirs(os.path.join(self.folder.name, "data", "F"))
+        shutil.copyfile("test_tickets.csv", os.path.join(self.folder.name, "data", "F", "2021_06_01_tickets.csv"))
+        os.chdir(self.folder.name)
+        try:
+            input_file = ".//data//F//2021_06_01_tickets.csv"
+            jira_graph(config).create_ticket_graphs_by_team(input_file, config.teams)
+            output_file = glob.glob(os.path.join("data", "F", "*.xlsx"))[0]
+            expected = pd.read_excel(output_file, sheet_name=None)
+
+            jira_snapshot().write_from_csv(input_file, "parquet")
+            jira_graph(config).create_ticket_graphs_by_team(input_file, config.teams)
+            actual = pd.read_excel(output_file, sheet_name=None)
+        finally:
+            os.chdir(working_folder)
+
+        self.assertEqual(list(actual), list(expected))
+        for sheet in expected:
+            pd.testing.assert_frame_equal(actual[sheet], expected[sheet])
+
+
+    def test_snapshot_used_when_not_older_than_csv(self):
+        filename = jira_snapshot().write_from_csv(self.csv_filename, "feather")
+        self.__touch_csv(-10)
+
+        actual = jira_snapshot().read(self.csv_filename)
+        self.assertTrue(filename.endswith(".feather"))
+        self.assertIsInstance(actual["Status"].dtype, pd.CategoricalDtype)
+
+
+    def test_snapshot_older_than_csv_ignored(self):
+        jira_snapshot().write_from_csv(self.csv_filename, "parquet")
+        self.__touch_csv(10)
+
+        actual = jira_snapshot().read(self.csv_filename)
+        self.assertNotIsInstance(actual["Status"].dtype, pd.CategoricalDtype)
+
+
+    def test_categories_sorted_on_read(self):
+        jira_snapshot().write_from_csv(self.csv_filename, "parquet")
+        actual = jira_snapshot().read(self.csv_filename)
+
+        self.assertEqual(list(actual["Team"].cat.categories), sorted(actual["Team"].dropna().unique()))
+        self.assertEqual(list(actual["Status"].cat.categories), sorted(actual["Status"].cat.categories))
+
+
+    def test_batches_read_back_same_as_one_write(self):
+        snapshot_module.ROWS_PER_BATCH = 2
+        jira_snapshot().write_from_csv(self.csv_filename, "feather")
+        batched = jira_snapshot().read(self.csv_filename)
+
+        rows = pd.read_csv(self.csv_filename, dtype=str, keep_default_na=False)
+        jira_snapshot().write(rows.values.tolist(), list(rows.columns), self.csv_filename, "feather")
+        actual = jira_snapshot().read(self.csv_filename)
+
+        pd.testing.assert_frame_equal(batched, actual)
+
+
+    def test_unknown_format_not_written(self):
+        actual = jira_snapshot().write_from_csv(self.csv_filename, "orc")
+        self.assertEqual(actual, "")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,374 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime, timedelta, timezone
+import threading
+import random
+import json
+import time
+import re
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.{0:03d}+0000"
+TIME_IN_STATUS_SEPARATOR = "_*|*_"
+
+
+class jira_standin(object):
+    __default_settings = {
+        "size": 1000,
+        "seed": 1,
+        "projects": ["BENCH"],
+        "labels": {"team1": 4, "team2": 3, "team3": 2, "team4": 1, "bau": 3, "project": 3, "improvement": 2, "misc": 1},
+        "statuses": {"1": "To Do", "3": "In Progress", "10001": "Done", "10002": "Rejected"},
+        "done_ratio": 0.7,
+        "epics": 20,
+        "time_in_status": True,
+        "time_in_status_statuses": None,
+        "time_in_status_visits": 3,
+        "time_in_status_days": 30,
+        "recently_updated": 0,
+        "days": 730,
+        "page_size": 100,
+        "key_page_size": 5000,
+        "latency": 0,
+        "throttle_rate": 0,
+        "retry_after": 1,
+        "broken_from": None,
+        "filters": {}
+    }
+    __key_list = re.compile(r"key in \(([^)]*)\)")
+    __project_list = re.compile(r"project in \(([^)]*)\)")
+    # The date conditions partitions and incremental extracts add, "<field> < <date> OR <field> is EMPTY" is the only OR that's understood
+    __date_or_empty = re.compile(r"(created|resolutiondate|updated) < (startOfMonth\((-?\d*)\)) OR \1 is EMPTY")
+    __date_compare = re.compile(r"(created|resolutiondate|updated) (<|>=) (?:startOfMonth\((-?\d*)\)|-(\d+)m)")
+    __date_empty = re.compile(r"(created|resolutiondate|updated) is (not )?EMPTY")
+    __order_by_date = re.compile(r"ORDER BY (created|resolutiondate|updated)(?: (ASC|DESC))?", re.IGNORECASE)
+    __date_fields = ["created", "resolutiondate", "updated"]
+
+
+    def __init__(self, settings = None):
+        self.__settings = dict(self.__default_settings)
+        if settings:
+            self.__settings.update(settings)
+
+        self.__labels = list(self.__settings["labels"].keys())
+        self.__label_weights = list(self.__settings["labels"].values())
+        self.__status_ids = list(self.__settings["statuses"].keys())
+        self.__done_id = [status_id for status_id, name in self.__settings["statuses"].items() if name == "Done"][0]
+        self.__start_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        self.__throttle_random = random.Random(self.__settings["seed"])
+        self.__lock = threading.Lock()
+        self.__search_indexes = {}
+        self.__requests = 0
+        self.__throttled = 0
+        self.__server = None
+
+
+    @property
+    def url(self):
+        return "http://{0}:{1}".format(*self.__server.server_address[0:2])
+
+
+    @property
+    def requests(self):
+        return self.__requests
+
+
+    @property
+    def throttled(self):
+        return self.__throttled
+
+
+    def __get_key(self, index):
+        projects = self.__settings["projects"]
+        return "{0}-{1}".format(projects[index % len(projects)], index + 1)
+
+
+    def __get_index(self, key):
+        try:
+            index = int(key.split("-")[1]) - 1
+        except (IndexError, ValueError):
+            return None
+        return index if 0 <= index < self.__settings["size"] and self.__get_key(index) == key else None
+
+
+    def __format_date(self, date, generator):
+        return date.strftime(DATE_FORMAT.format(generator.randint(0, 999)))
+
+
+    def __get_time_in_status(self, generator, is_done):
+        # The same "id_*:*_count_*:*_milliseconds" format Jira uses, separated by "_*|*_". The statuses, number of visits and days in each can be set
+        status_ids = self.__settings["time_in_status_statuses"] or self.__status_ids
+        visited = generator.sample(status_ids, generator.randint(1, len(status_ids)))
+        if is_done and self.__done_id not in visited:
+            visited.append(self.__done_id)
+        max_milliseconds = max(60000, int(self.__settings["time_in_status_days"] * 86400000))
+        entries = ["{0}_*:*_{1}_*:*_{2}".format(status_id, generator.randint(1, self.__settings["time_in_status_visits"]), generator.randint(60000, max_milliseconds))
+                   for status_id in visited]
+        return TIME_IN_STATUS_SEPARATOR.join(entries)
+
+
+    def __generate(self, index):
+        # The random values every issue has, in the order they're drawn. Searches only need the dates, so they don't generate the rest of the issue
+        generator = random.Random(self.__settings["seed"] * 1000003 + index)
+        is_done = generator.random() < self.__settings["done_ratio"]
+        status_id = self.__done_id if is_done else generator.choice([status_id for status_id in self.__status_ids if status_id != self.__done_id])
+
+        created = self.__start_date + timedelta(seconds=generator.randint(0, self.__settings["days"] * 86400))
+        resolved = created + timedelta(seconds=generator.randint(3600, 120 * 86400)) if is_done else None
+
+        epic = None
+        if self.__settings["epics"] and generator.random() < 0.8:
+            epic = generator.randint(1, self.__settings["epics"])
+        updated = (resolved if resolved else created) + timedelta(seconds=generator.randint(0, 5 * 86400))
+        if self.__settings["recently_updated"] and random.Random(self.__settings["seed"] * 31 + index).random() < self.__settings["recently_updated"]:
+            # Updated in the last hour, so incremental extracts have changes to fetch
+            updated = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(seconds=generator.randint(60, 3600))
+
+        return generator, is_done, status_id, created, resolved, epic, updated
+
+
+    def get_dates(self, index):
+        _, _, _, created, resolved, _, updated = self.__generate(index)
+        return {"created": created, "resolutiondate": resolved, "updated": updated}
+
+
+    def get_issue(self, index):
+        # Each issue is generated from its index, so any page can be served without keeping the issues in memory
+        generator, is_done, status_id, created, resolved, epic, updated = self.__generate(index)
+        parent = {"key": "EPIC-{0}".format(epic), "fields": {"summary": "Epic {0}".format(epic)}} if epic else None
+
+        return {
+            "id": str(10000 + index),
+            "key": self.__get_key(index),
+            "fields": {
+                "summary": "Synthetic issue {0}".format(index + 1),
+                "status": {"name": self.__settings["statuses"][status_id]},
+                "created": self.__format_date(created, generator),
+                "resolutiondate": self.__format_date(resolved, generator) if resolved else None,
+                "labels": list(dict.fromkeys(generator.choices(self.__labels, self.__label_weights, k=2))),
+                "issuetype": {"name": generator.choice(["Story", "Bug", "Task"])},
+                "parent": parent,
+                "customfield_10014": None,
+                "customfield_10016": generator.choice([None, 1, 2, 3, 5, 8]),
+                "customfield_10023": self.__get_time_in_status(generator, is_done) if self.__settings["time_in_status"] else None,
+                "customfield_10024": None,
+                "updated": self.__format_date(updated, generator)
+            }
+        }
+
+
+    def get_changelog(self, index):
+        # Status changes from "To Do" to the issue's status, between when it was created and last updated
+        issue = self.get_issue(index)
+        generator = random.Random(self.__settings["seed"] * 7919 + index)
+        status = issue["fields"]["status"]["name"]
+        statuses = ["To Do"]
+        if status != "To Do":
+            statuses += ["In Progress"] * generator.randint(1, 2)
+            if status != "In Progress":
+                statuses.append(status)
+        elif generator.random() < 0.2:
+            statuses += ["In Progress", "To Do"]
+
+        created = datetime.strptime(issue["fields"]["created"], "%Y-%m-%dT%H:%M:%S.%f%z")
+        updated = datetime.strptime(issue["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z")
+        seconds = sorted(generator.randint(0, max(1, int((updated - created).total_seconds()))) for _ in statuses[1:])
+        histories = []
+        for position, (from_status, to_status) in enumerate(zip(statuses, statuses[1:])):
+            if from_status == to_status:
+                continue
+            histories.append({
+                "id": str(index * 10 + position),
+                "created": self.__format_date(created + timedelta(seconds=seconds[position]), generator),
+                "items": [{"field": "status", "fieldId": "status", "fromString": from_status, "toString": to_status}]
+            })
+        return {"issueId": issue["id"], "changeHistories": histories}
+
+
+    def __get_boundary(self, month_offset, minutes, now):
+        # startOfMonth(offset) or -<minutes>m, relative to now
+        if minutes is not None:
+            return now - timedelta(minutes=int(minutes))
+        month = now.year * 12 + now.month - 1 + int(month_offset or 0)
+        return datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+    def __get_date_conditions(self, jql):
+        # Each condition is a function of an issue's dates, they must all be true
+        now = datetime.now(timezone.utc)
+        conditions = []
+        for field, _, month_offset in self.__date_or_empty.findall(jql):
+            boundary = self.__get_boundary(month_offset, None, now)
+            conditions.append(lambda dates, field=field, boundary=boundary: dates[field] is None or dates[field] < boundary)
+        jql = self.__date_or_empty.sub("", jql)
+
+        for field, operator, month_offset, minutes in self.__date_compare.findall(jql):
+            boundary = self.__get_boundary(month_offset, minutes if minutes else None, now)
+            if operator == "<":
+                conditions.append(lambda dates, field=field, boundary=boundary: dates[field] is not None and dates[field] < boundary)
+            else:
+                conditions.append(lambda dates, field=field, boundary=boundary: dates[field] is not None and dates[field] >= boundary)
+        for field, is_not in self.__date_empty.findall(jql):
+            conditions.append(lambda dates, field=field, is_not=is_not: (dates[field] is not None) == bool(is_not))
+
+        return conditions
+
+
+    def __find_indexes(self, jql):
+        # Only the JQL used by filters, partitions and incremental extracts is understood, anything else returns every issue
+        key_list = self.__key_list.search(jql)
+        project_list = self.__project_list.search(jql)
+        if key_list:
+            indexes = [self.__get_index(key.strip().strip("\"")) for key in key_list.group(1).split(",")]
+            indexes = sorted(index for index in indexes if index is not None)
+        elif project_list:
+            projects = self.__settings["projects"]
+            project_indexes = [projects.index(project.strip()) for project in project_list.group(1).split(",") if project.strip() in projects]
+            indexes = [index for index in range(self.__settings["size"]) if index % len(projects) in project_indexes]
+        else:
+            indexes = range(self.__settings["size"])
+
+        conditions = self.__get_date_conditions(jql)
+        order_by = self.__order_by_date.search(jql)
+        if not conditions and not order_by:
+            return indexes
+
+        dates = {index: self.get_dates(index) for index in indexes}
+        indexes = [index for index in indexes if all(condition(dates[index]) for condition in conditions)]
+        if order_by:
+            # Issues without a date are last
+            field = order_by.group(1).lower()
+            descending = (order_by.group(2) or "ASC").upper() == "DESC"
+            dated = sorted((index for index in indexes if dates[index][field] is not None), key=lambda index: dates[index][field], reverse=descending)
+            indexes = dated + [index for index in indexes if dates[index][field] is None]
+        return indexes
+
+
+    def __get_search_indexes(self, jql):
+        # The issues for each query are found once, and kept for the pages after the first
+        with self.__lock:
+            indexes = self.__search_indexes.get(jql)
+        if indexes is None:
+            indexes = self.__find_indexes(jql)
+            with self.__lock:
+                if len(self.__search_indexes) >= 64:
+                    self.__search_indexes.clear()
+                self.__search_indexes[jql] = indexes
+        return indexes
+
+
+    def __search(self, query):
+        jql = query.get("jql", [""])[0]
+        keys_only = query.get("fields", [""])[0] == "id"
+        page_size = self.__settings["key_page_size"] if keys_only else self.__settings["page_size"]
+        page_size = min(page_size, int(query.get("maxResults", [page_size])[0]))
+        start = int(query.get("nextPageToken", ["0"])[0])
+
+        indexes = self.__get_search_indexes(jql)
+
+        page_indexes = indexes[start:start + page_size]
+        if keys_only:
+            issues = [{"id": str(10000 + index), "key": self.__get_key(index)} for index in page_indexes]
+        else:
+            issues = [self.get_issue(index) for index in page_indexes]
+            if self.__settings["broken_from"] is not None:
+                # Issues after this one are returned without their fields, so an extract fails part way through
+                issues = [issue if index < self.__settings["broken_from"] else {"id": issue["id"], "key": issue["key"]} for index, issue in zip(page_indexes, issues)]
+
+        page = {"issues": issues, "isLast": start + page_size >= len(indexes)}
+        if not page["isLast"]:
+            page["nextPageToken"] = str(start + page_size)
+        return page
+
+
+    def __bulk_fetch_changelogs(self, body):
+        # Whole issues are added to a page until it has at least maxResults changes
+        indexes = []
+        for issue in body.get("issueIdsOrKeys", []):
+            index = int(issue) - 10000 if str(issue).isdigit() else self.__get_index(issue)
+            if index is not None and 0 <= index < self.__settings["size"]:
+                indexes.append(index)
+
+        start = int(body.get("nextPageToken", 0))
+        max_results = int(body.get("maxResults", 1000))
+        changelogs, changes = [], 0
+        position = start
+        while position < len(indexes) and changes < max_results:
+            changelog = self.get_changelog(indexes[position])
+            changelogs.append(changelog)
+            changes += len(changelog["changeHistories"])
+            position += 1
+
+        page = {"issueChangeLogs": changelogs}
+        if position < len(indexes):
+            page["nextPageToken"] = str(position)
+        return page
+
+
+    def handle_request(self, path, body = None):
+        # Returns the HTTP status, headers and body for a GET request, or a POST request with a body
+        with self.__lock:
+            self.__requests += 1
+            throttle = self.__throttle_random.random() < self.__settings["throttle_rate"]
+            if throttle:
+                self.__throttled += 1
+
+        if self.__settings["latency"]:
+            time.sleep(self.__settings["latency"])
+        if throttle:
+            return 429, {"Retry-After": str(self.__settings["retry_after"])}, {"errorMessages": ["Rate limit exceeded"]}
+
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if url.path.endswith("/status"):
+            return 200, {}, [{"id": status_id, "name": name} for status_id, name in self.__settings["statuses"].items()]
+        if "/filter/" in url.path:
+            # Filters can be given their own projects, by default every filter is for all the projects
+            filter_id = url.path.rsplit("/", 1)[1]
+            projects = self.__settings["filters"].get(filter_id, self.__settings["projects"])
+            return 200, {}, {"id": filter_id, "name": "Stand-in {0}".format(filter_id), "jql": "project in ({0}) ORDER BY Rank ASC".format(", ".join(projects))}
+        if url.path.endswith("/search/jql"):
+            return 200, {}, self.__search(query)
+        if url.path.endswith("/changelog/bulkfetch") and body is not None:
+            return 200, {}, self.__bulk_fetch_changelogs(body)
+
+        return 404, {}, {"errorMessages": ["Not found"]}
+
+
+    def start(self, host = "127.0.0.1", port = 0):
+        standin = self
+
+        class standin_handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.__respond(*standin.handle_request(self.path))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.__respond(*standin.handle_request(self.path, json.loads(self.rfile.read(length)) if length else {}))
+
+            def __respond(self, status, headers, data):
+                body = json.dumps(data).encode("UTF-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer((host, port), standin_handler)
+        self.__server.daemon_threads = True
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        return self.url
+
+
+    def stop(self):
+        if self.__server:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
\ No newline at end of file
@@ -0,0 +1,107 @@
+import unittest
+from jira_standin import jira_standin
+from jira_request import jira_request
+from jira_partition import jira_partition
+from urllib.parse import urlencode
+from datetime import date
+
+SEARCH = "search/jql?jql=project%20%3D%20BENCH&maxResults=500&fields=summary"
+
+
+class jira_standin_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.standin = None
+
+
+    def tearDown(self):
+        if self.standin:
+            self.standin.stop()
+
+
+    def __get_all_issues(self, settings):
+        self.standin = jira_standin(settings)
+        api = jira_request(self.standin.start(), ("user", "token"), {"backoff": 0})
+        issues = []
+        next_page_token = None
+        while True:
+            page = api.get_api3_request(SEARCH + ("&nextPageToken={0}".format(next_page_token) if next_page_token else ""))
+            issues.extend(page["issues"])
+            next_page_token = page.get("nextPageToken")
+            if not next_page_token:
+                return issues, api
+
+
+    def test_issues_returned_in_pages(self):
+        issues, _ = self.__get_all_issues({"size": 250, "page_size": 100})
+        self.assertEqual(len(issues), 250)
+        self.assertEqual(self.standin.requests, 3)
+        self.assertEqual(issues[-1]["key"], "BENCH-250")
+
+
+    def test_issues_are_the_same_for_the_same_seed(self):
+        first = jira_standin({"seed": 5}).get_issue(42)
+        second = jira_standin({"seed": 5}).get_issue(42)
+        self.assertEqual(first, second)
+
+
+    def test_time_in_status_can_be_turned_off(self):
+        issue = jira_standin({"time_in_status": False}).get_issue(0)
+        self.assertIsNone(issue["fields"]["customfield_10023"])
+
+
+    def test_time_in_status_contents_can_be_set(self):
+        issue = jira_standin({"time_in_status_statuses": ["3"], "time_in_status_visits": 1, "time_in_status_days": 0}).get_issue(1)
+        entries = [entry.split("_*:*_") for entry in issue["fields"]["customfield_10023"].split("_*|*_")]
+        self.assertTrue(all(status_id in ["3", "10001"] and visits == "1" and milliseconds == "60000" for status_id, visits, milliseconds in entries))
+
+
+    def __search_keys(self, standin, jql):
+        _, _, page = standin.handle_request("/rest/api/3/search/jql?" + urlencode({"jql": jql, "fields": "id"}))
+        return [issue["key"] for issue in page["issues"]]
+
+
+    def test_date_slices_return_each_issue_once(self):
+        standin = jira_standin({"size": 500})
+        partition = jira_partition({"field": "resolutiondate", "slices": 4})
+        partition.set_oldest_date(date(2020, 1, 1))
+        slice_keys = [self.__search_keys(standin, jql) for jql in partition.get_slice_jql("project in (BENCH) ORDER BY Rank ASC")]
+
+        self.assertEqual(sorted(key for keys in slice_keys for key in keys), sorted(self.__search_keys(standin, "project in (BENCH)")))
+        self.assertTrue(all(standin.get_dates(int(key.split("-")[1]) - 1)["resolutiondate"] is None for key in slice_keys[0]))
+        self.assertGreater(len(slice_keys[1]), 0)
+
+
+    def test_updated_window_returns_recently_updated_issues(self):
+        standin = jira_standin({"size": 200, "recently_updated": 0.1})
+        actual = self.__search_keys(standin, "(project in (BENCH)) AND (updated >= -70m)")
+        expected = [key for index, key in enumerate(self.__search_keys(standin, "project in (BENCH)")) if standin.get_dates(index)["updated"].year > 2022]
+        self.assertEqual(actual, expected)
+        self.assertGreater(len(actual), 0)
+
+
+    def test_order_by_date_returns_oldest_first(self):
+        standin = jira_standin({"size": 100})
+        keys = self.__search_keys(standin, "(project in (BENCH)) AND created is not EMPTY ORDER BY created ASC")
+        created = [standin.get_dates(int(key.split("-")[1]) - 1)["created"] for key in keys]
+        self.assertEqual(created, sorted(created))
+
+
+    def test_throttled_requests_are_retried(self):
+        issues, api = self.__get_all_issues({"size": 500, "page_size": 50, "throttle_rate": 0.3, "retry_after": 0})
+        self.assertEqual(len(issues), 500)
+        self.assertGreater(self.standin.throttled, 0)
+        self.assertEqual(api.retries, self.standin.throttled)
+
+
+
+    def test_filters_return_their_projects_issues(self):
+        standin = jira_standin({"size": 9, "projects": ["A", "B", "C"], "filters": {"2": ["A", "C"]}})
+        _, _, data = standin.handle_request("/rest/api/3/filter/2")
+        _, _, page = standin.handle_request("/rest/api/3/search/jql?" + urlencode({"jql": data["jql"], "fields": "id"}))
+        self.assertEqual([issue["key"] for issue in page["issues"]], ["A-1", "C-3", "A-4", "C-6", "A-7", "C-9"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+from datetime import date, datetime
+import hashlib
+import sqlite3
+import os.path
+import os
+
+KEY = "Key"
+INDEXED_COLUMNS = ["Team", "Status", "Resolved", "Epic"]
+TEXT_COLUMNS = ["Key", "Summary", "Category", "Team", "Status", "Created", "Resolved", "Epic", "Epic ID", "Issue Type"]
+
+
+class jira_store(object):
+    __create_issues = "CREATE TABLE IF NOT EXISTS issues (\"Key\" TEXT PRIMARY KEY)"
+    __create_filter_issues = "CREATE TABLE IF NOT EXISTS filter_issues (filter TEXT, key TEXT, position INTEGER, PRIMARY KEY (filter, key))"
+    __create_filter_index = "CREATE INDEX IF NOT EXISTS idx_filter_issues_position ON filter_issues (filter, position)"
+    __create_column_index = "CREATE INDEX IF NOT EXISTS \"idx_issues_{0}\" ON issues (\"{1}\")"
+    __select_filter_issues = "SELECT {0} FROM filter_issues JOIN issues ON issues.\"Key\" = filter_issues.key WHERE filter_issues.filter = ?"
+
+
+    def __init__(self, filename):
+        folder = os.path.dirname(filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.__filename = filename
+        self.__connection = sqlite3.connect(filename, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        with self.__connection:
+            self.__connection.execute(self.__create_issues)
+            self.__connection.execute(self.__create_filter_issues)
+            self.__connection.execute(self.__create_filter_index)
+
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    def close(self):
+        self.__connection.close()
+
+
+    def __quote(self, column):
+        return "\"{0}\"".format(column)
+
+
+    def __get_columns(self):
+        return [row[1] for row in self.__connection.execute("PRAGMA table_info(issues)")]
+
+
+    def __add_columns(self, columns):
+        # Columns have no declared type, so values are stored exactly as they were extracted
+        existing_columns = self.__get_columns()
+        for column in columns:
+            if column not in existing_columns:
+                self.__connection.execute("ALTER TABLE issues ADD COLUMN {0}".format(self.__quote(column)))
+                if column in INDEXED_COLUMNS:
+                    index_name = column.lower().replace(" ", "_")
+                    self.__connection.execute(self.__create_column_index.format(index_name, column))
+
+
+    def __to_value(self, value):
+        if value == "":
+            return None
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+
+    def __from_csv_value(self, value, is_text):
+        # Values read back from a .CSV file are stored with the same types as the extracted values
+        if value == "" or is_text:
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+    def __from_csv_rows(self, columns, rows):
+        is_text = [column in TEXT_COLUMNS for column in columns]
+        return [[self.__from_csv_value(value, is_text[index]) for index, value in enumerate(row)] for row in rows]
+
+
+    def __upsert_rows(self, filter_name, columns, rows, first_position):
+        column_list = ", ".join(self.__quote(column) for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        upsert = "INSERT OR REPLACE INTO issues ({0}) VALUES ({1})".format(column_list, placeholders)
+
+        self.__add_columns(columns)
+        self.__connection.executemany(upsert, ([self.__to_value(value) for value in row] for row in rows))
+        self.__connection.executemany("INSERT OR IGNORE INTO filter_issues (filter, key, position) VALUES (?, ?, ?)",
+                                      ((filter_name, row[0], first_position + index) for index, row in enumerate(rows)))
+
+
+    def save_filter_batches(self, filter_name, columns, batches, from_csv = False):
+        # Batches of rows are saved in one transaction, so a failure part way through leaves the filter as it was
+        with self.__connection:
+            self.__connection.execute("DELETE FROM filter_issues WHERE filter = ?", (filter_name,))
+            rows = 0
+            for batch in batches:
+                self.__upsert_rows(filter_name, columns, self.__from_csv_rows(columns, batch) if from_csv else batch, rows)
+                rows += len(batch)
+
+        return rows
+
+
+    def save_filter_rows(self, filter_name, columns, rows):
+        with self.__connection:
+            self.__connection.execute("DELETE FROM filter_issues WHERE filter = ?", (filter_name,))
+            self.__upsert_rows(filter_name, columns, rows, 0)
+
+
+    def has_filter(self, filter_name):
+        row = self.__connection.execute("SELECT 1 FROM filter_issues WHERE filter = ? LIMIT 1", (filter_name,)).fetchone()
+        return row is not None
+
+
+    def read_filter_rows(self, filter_name, columns):
+        if not self.has_filter(filter_name):
+            return None
+
+        column_list = ", ".join("issues.{0}".format(self.__quote(column)) for column in columns)
+        query = self.__select_filter_issues.format(column_list) + " ORDER BY filter_issues.position"
+
+        rows_by_key = {}
+        for row in self.__connection.execute(query, (filter_name,)):
+            rows_by_key[row[0]] = ["" if value is None else value for value in row]
+        return rows_by_key
+
+
+    def get_filter_hash(self, filter_name):
+        # Changes when any ticket in the filter changes, or the tickets (or their order) change
+        filter_hash = hashlib.sha256()
+        query = self.__select_filter_issues.format("issues.*") + " ORDER BY filter_issues.position"
+        for row in self.__connection.execute(query, (filter_name,)):
+            filter_hash.update(repr(row).encode("UTF-8"))
+        return filter_hash.hexdigest()
+
+
+    def read_filter_data(self, filter_name, status = None, parse_dates = None):
+        import pandas as pd
+
+        query = self.__select_filter_issues.format("issues.*")
+        params = [filter_name]
+        if status:
+            query += " AND issues.\"Status\" = ?"
+            params.append(status)
+        query += " ORDER BY filter_issues.position"
+
+        data = pd.read_sql_query(query, self.__connection, params=params, parse_dates=parse_dates)
+        for column in data.columns:
+            if column not in TEXT_COLUMNS:
+                data[column] = pd.to_numeric(data[column], errors="coerce")
+
+        return data
+
+
+    def get_snapshot_filename(self, filter_name):
+        # Same name as the .CSV file jira_data creates, so report outputs are named the same way
+        path = ".//data//{0}".format(filter_name.replace("/", "_"))
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        return "{0}//{1:%Y_%m_%d}_tickets.csv".format(path, datetime.now())
\ No newline at end of file
@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import os.path
+from datetime import date
+from jira_store import jira_store
+
+COLUMNS = ["Key", "Summary", "Status", "Resolved", "Story Points"]
+FILTER = "Work Done"
+
+
+class jira_store_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = jira_store(os.path.join(self.folder.name, "jira.db"))
+        self.store.save_filter_rows(FILTER, COLUMNS, [["ABC-2", "Second", "Done", date(2021, 6, 1), 3],
+                                                      ["ABC-1", "First", "To Do", "", ""]])
+
+
+    def tearDown(self):
+        self.store.close()
+        self.folder.cleanup()
+
+
+    def test_rows_read_in_filter_order(self):
+        actual = self.store.read_filter_rows(FILTER, COLUMNS)
+        self.assertEqual(list(actual), ["ABC-2", "ABC-1"])
+
+
+    def test_empty_values_round_trip(self):
+        actual = self.store.read_filter_rows(FILTER, COLUMNS)
+        self.assertEqual(actual["ABC-1"], ["ABC-1", "First", "To Do", "", ""])
+
+
+    def test_dates_stored_as_iso_strings(self):
+        actual = self.store.read_filter_rows(FILTER, COLUMNS)
+        self.assertEqual(actual["ABC-2"][3], "2021-06-01")
+
+
+    def test_save_replaces_filter_membership(self):
+        self.store.save_filter_rows(FILTER, COLUMNS, [["ABC-1", "First", "Done", "2021-06-02", 1]])
+        actual = self.store.read_filter_rows(FILTER, COLUMNS)
+        self.assertEqual(actual, {"ABC-1": ["ABC-1", "First", "Done", "2021-06-02", 1]})
+
+
+    def test_unknown_filter_returns_none(self):
+        actual = self.store.read_filter_rows("Another Filter", COLUMNS)
+        self.assertIsNone(actual)
+
+
+    def test_read_filter_data_by_status(self):
+        actual = self.store.read_filter_data(FILTER, status="Done")
+        self.assertEqual(list(actual["Key"]), ["ABC-2"])
+        self.assertEqual(actual["Story Points"].iloc[0], 3)
+
+
+    def test_filter_hash_changes_when_ticket_changes(self):
+        before = self.store.get_filter_hash(FILTER)
+        self.store.save_filter_rows(FILTER, COLUMNS, [["ABC-2", "Second", "Done", date(2021, 6, 1), 5],
+                                                      ["ABC-1", "First", "To Do", "", ""]])
+        self.assertNotEqual(self.store.get_filter_hash(FILTER), before)
+
+
+    def test_filter_hash_unchanged_for_same_tickets(self):
+        before = self.store.get_filter_hash(FILTER)
+        self.store.save_filter_rows(FILTER, COLUMNS, [["ABC-2", "Second", "Done", date(2021, 6, 1), 3],
+                                                      ["ABC-1", "First", "To Do", "", ""]])
+        self.assertEqual(self.store.get_filter_hash(FILTER), before)
+
+
+
+    def test_csv_batches_stored_with_extracted_types(self):
+        expected = self.store.get_filter_hash(FILTER)
+        self.store.save_filter_batches(FILTER, COLUMNS, [[["ABC-2", "Second", "Done", "2021-06-01", "3"]], [["ABC-1", "First", "To Do", "", ""]]], from_csv=True)
+        self.assertEqual(self.store.get_filter_hash(FILTER), expected)
+
+
+    def test_failed_batches_leave_filter_unchanged(self):
+        def batches():
+            yield [["ABC-3", "Third", "Done", "2021-06-03", "1"]]
+            raise IOError("Failed to read the .CSV file")
+
+        with self.assertRaises(IOError):
+            self.store.save_filter_batches(FILTER, COLUMNS, batches(), from_csv=True)
+        actual = self.store.read_filter_rows(FILTER, COLUMNS)
+        self.assertEqual(list(actual), ["ABC-2", "ABC-1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
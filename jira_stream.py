@@ -0,0 +1,122 @@
+import csv
+import os
+import os.path
+import yaml
+
+
+class jira_stream_writer(object):
+
+
+    def __init__(self, filename, columns):
+        self.__filename = filename
+        self.__part_filename = "{0}.part".format(filename)
+        self.__checkpoint_filename = "{0}.checkpoint".format(filename)
+        self.__columns = columns
+        self.__file = None
+        self.__writer = None
+        self.__jql = None
+        self.__rows = 0
+        self.__complete = False
+
+
+    @property
+    def rows(self):
+        return self.__rows
+
+
+    @property
+    def complete(self):
+        return self.__complete
+
+
+    def __load_checkpoint(self, jql):
+        if not (os.path.exists(self.__checkpoint_filename) and os.path.exists(self.__part_filename)):
+            return None
+
+        with open(self.__checkpoint_filename, "r") as checkpoint_file:
+            checkpoint = yaml.safe_load(checkpoint_file) or {}
+        return checkpoint if checkpoint.get("jql") == jql else None
+
+
+    def __save_checkpoint(self, next_page_token):
+        checkpoint = {
+            "jql": self.__jql,
+            "next_page_token": next_page_token,
+            "rows": self.__rows,
+            "offset": os.fstat(self.__file.fileno()).st_size,
+            "complete": self.__complete
+        }
+
+        # Replace the checkpoint in one step, so a failure never leaves a partly written file
+        temp_filename = "{0}.tmp".format(self.__checkpoint_filename)
+        with open(temp_filename, "w") as checkpoint_file:
+            yaml.safe_dump(checkpoint, checkpoint_file)
+        os.replace(temp_filename, self.__checkpoint_filename)
+
+
+    def open(self, jql, resume = True):
+        # Returns the page token to continue from, or None to start from the first page
+        self.__jql = jql
+        checkpoint = self.__load_checkpoint(jql) if resume else None
+
+        if checkpoint:
+            # Drop anything written after the last completed page
+            os.truncate(self.__part_filename, checkpoint["offset"])
+            self.__file = open(self.__part_filename, "a", newline='', encoding="UTF-8")
+            self.__writer = csv.writer(self.__file)
+            self.__rows = checkpoint["rows"]
+            self.__complete = checkpoint["complete"]
+            print("Resuming \"{0}\" after {1} tickets".format(self.__filename, self.__rows))
+            return checkpoint["next_page_token"]
+
+        self.__file = open(self.__part_filename, "w", newline='', encoding="UTF-8")
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(self.__columns)
+        self.__rows = 0
+        self.__complete = False
+        return None
+
+
+    def write_page(self, rows, next_page_token):
+        self.__writer.writerows(rows)
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+        self.__rows += len(rows)
+        self.__complete = next_page_token is None
+        self.__save_checkpoint(next_page_token)
+
+
+    def write_row(self, row):
+        self.__writer.writerow(row)
+        self.__rows += 1
+
+
+    def close(self):
+        if self.__file:
+            self.__file.close()
+            self.__file = None
+
+
+    def read_rows(self):
+        with open(self.__part_filename, "r", newline='', encoding="UTF-8") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                yield row
+
+
+    def discard(self):
+        self.close()
+        for filename in [self.__part_filename, self.__checkpoint_filename]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+    def commit(self):
+        self.close()
+        os.replace(self.__part_filename, self.__filename)
+        if os.path.exists(self.__checkpoint_filename):
+            os.remove(self.__checkpoint_filename)
+
+        return self.__filename
\ No newline at end of file
@@ -0,0 +1,161 @@
+import unittest
+import tempfile
+import os.path
+import yaml
+from jira_stream import jira_stream_writer
+
+COLUMNS = ["Key", "Summary", "Status"]
+JQL = "project = ABC"
+PAGES = [([["ABC-{0}".format(page * 2 + row), "Issue, {0}".format(page * 2 + row), "Done"] for row in range(2)], "token{0}".format(page + 1)) for page in range(5)]
+PAGES[-1] = (PAGES[-1][0], None)
+
+
+class jira_stream_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, "2021_06_01_tickets.csv")
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    def __write_pages(self, writer, pages):
+        for rows, next_page_token in pages:
+            writer.write_page(rows, next_page_token)
+
+
+    def __read_file(self, filename):
+        with open(filename, "r", newline='', encoding="UTF-8") as file:
+            return file.read()
+
+
+    def __read_checkpoint(self):
+        with open("{0}.checkpoint".format(self.filename), "r") as checkpoint_file:
+            return yaml.safe_load(checkpoint_file)
+
+
+    def __write_uninterrupted(self):
+        filename = os.path.join(self.folder.name, "expected.csv")
+        writer = jira_stream_writer(filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES)
+        return self.__read_file(writer.commit())
+
+
+    def __write_until_crash(self):
+        # Three pages are completed, then part of the fourth is written before the extract fails
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES[0:3])
+        writer.write_row(PAGES[3][0][0])
+        writer.close()
+
+
+    def test_new_extract_starts_from_first_page(self):
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        self.assertIsNone(writer.open(JQL))
+        writer.close()
+
+
+    def test_checkpoint_saved_after_each_page(self):
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES[0:3])
+        writer.close()
+
+        checkpoint = self.__read_checkpoint()
+        self.assertEqual((checkpoint["next_page_token"], checkpoint["rows"], checkpoint["complete"]), ("token3", 6, False))
+        self.assertEqual(checkpoint["offset"], os.path.getsize("{0}.part".format(self.filename)))
+
+
+    def test_resume_continues_from_saved_token(self):
+        self.__write_until_crash()
+
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        actual = writer.open(JQL)
+        writer.close()
+
+        self.assertEqual((actual, writer.rows, writer.complete), ("token3", 6, False))
+
+
+    def test_resume_drops_rows_after_checkpoint(self):
+        self.__write_until_crash()
+        offset = self.__read_checkpoint()["offset"]
+
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        writer.close()
+
+        self.assertEqual(os.path.getsize("{0}.part".format(self.filename)), offset)
+        self.assertEqual([row[0] for row in writer.read_rows()], ["ABC-0", "ABC-1", "ABC-2", "ABC-3", "ABC-4", "ABC-5"])
+
+
+    def test_resumed_file_matches_uninterrupted_extract(self):
+        expected = self.__write_uninterrupted()
+        self.__write_until_crash()
+
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES[3:])
+        actual = self.__read_file(writer.commit())
+
+        self.assertEqual(actual, expected)
+
+
+    def test_changed_jql_starts_again(self):
+        self.__write_until_crash()
+
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        actual = writer.open("project = ABC AND status = Done")
+        writer.close()
+
+        self.assertEqual((actual, writer.rows), (None, 0))
+        self.assertEqual(list(writer.read_rows()), [])
+
+
+    def test_resume_disabled_starts_again(self):
+        self.__write_until_crash()
+
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        actual = writer.open(JQL, resume=False)
+        writer.close()
+
+        self.assertEqual((actual, writer.rows), (None, 0))
+
+
+    def test_last_page_marks_extract_complete(self):
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES)
+        writer.close()
+
+        resumed = jira_stream_writer(self.filename, COLUMNS)
+        actual = resumed.open(JQL)
+        resumed.close()
+
+        self.assertEqual((writer.complete, actual, resumed.complete, resumed.rows), (True, None, True, 10))
+
+
+    def test_commit_replaces_file_and_removes_checkpoint(self):
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES)
+        writer.commit()
+
+        self.assertEqual([os.path.exists(filename) for filename in [self.filename, "{0}.part".format(self.filename), "{0}.checkpoint".format(self.filename)]], [True, False, False])
+
+
+    def test_discard_removes_part_and_checkpoint(self):
+        writer = jira_stream_writer(self.filename, COLUMNS)
+        writer.open(JQL)
+        self.__write_pages(writer, PAGES[0:2])
+        writer.discard()
+
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
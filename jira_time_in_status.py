@@ -0,0 +1,59 @@
+import re
+import threading
+
+TO_DO = "To Do"
+IN_PROGRESS = "In Progress"
+
+
+class jira_time_in_status(object):
+    # '3_*:*_1_*:*_256892526_*|*_10000_*:*_1_*:*_258319828_*|*_10001_*:*_1_*:*_0' (status id, times in status, milliseconds)
+    __entry = re.compile(r"(?:^|_\*\|\*_)([^_]+)_\*:\*_[^_]*_\*:\*_(\d+)")
+
+
+    def __init__(self, buckets, get_statuses):
+        self.__buckets = list(buckets)
+        self.__bucket_statuses = buckets
+        self.__get_statuses = get_statuses
+        self.__status_buckets = None
+        self.__table_lock = threading.Lock()
+
+
+    @property
+    def buckets(self):
+        return self.__buckets
+
+
+    def __get_status_buckets(self):
+        # Status ids are resolved to a bucket index once, rather than for every issue. The lock is only needed while the table is built
+        status_buckets = self.__status_buckets
+        if status_buckets is not None:
+            return status_buckets
+
+        with self.__table_lock:
+            if self.__status_buckets is None:
+                bucket_index = {}
+                for index, bucket in enumerate(self.__buckets):
+                    for status in self.__bucket_statuses[bucket]:
+                        bucket_index[status.casefold()] = index
+
+                status_buckets = {}
+                for status_id, status_name in self.__get_statuses().items():
+                    index = bucket_index.get(status_name.casefold())
+                    if index is not None:
+                        status_buckets[status_id] = index
+                self.__status_buckets = status_buckets
+
+        return self.__status_buckets
+
+
+    def decode(self, time_in_status):
+        # Milliseconds for each bucket, empty if the issue has never been in one of its statuses
+        times = [""] * len(self.__buckets)
+        if time_in_status:
+            status_buckets = self.__get_status_buckets()
+            for status_id, milliseconds in self.__entry.findall(time_in_status):
+                index = status_buckets.get(status_id)
+                if index is not None:
+                    times[index] = int(milliseconds) if times[index] == "" else times[index] + int(milliseconds)
+
+        return times
\ No newline at end of file
@@ -0,0 +1,41 @@
+import unittest
+from jira_time_in_status import jira_time_in_status
+
+STATUSES = {"1": "To Do", "2": "Backlog", "3": "In Progress", "4": "In Review", "5": "Done"}
+TIME_IN_STATUS = "1_*:*_1_*:*_100_*|*_2_*:*_2_*:*_50_*|*_3_*:*_1_*:*_300_*|*_4_*:*_3_*:*_0_*|*_5_*:*_1_*:*_0"
+
+
+class jira_time_in_status_test(unittest.TestCase):
+
+
+    def setUp(self):
+        buckets = {"To Do": ["to do", "backlog"], "In Progress": ["in progress"], "Review": ["in review"], "Blocked": ["blocked"]}
+        self.decoder = jira_time_in_status(buckets, lambda: STATUSES)
+
+
+    def test_statuses_in_same_bucket_are_added(self):
+        actual = self.decoder.decode(TIME_IN_STATUS)
+        self.assertEqual(actual[0], 150)
+
+
+    def test_one_value_for_each_bucket(self):
+        actual = self.decoder.decode(TIME_IN_STATUS)
+        self.assertEqual(actual, [150, 300, 0, ""])
+
+
+    def test_unknown_status_ignored(self):
+        actual = self.decoder.decode("99_*:*_1_*:*_100")
+        self.assertEqual(actual, ["", "", "", ""])
+
+
+    def test_empty_value_returns_empty_buckets(self):
+        actual = self.decoder.decode(None)
+        self.assertEqual(actual, ["", "", "", ""])
+
+
+    def test_buckets_returned_in_config_order(self):
+        self.assertEqual(self.decoder.buckets, ["To Do", "In Progress", "Review", "Blocked"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
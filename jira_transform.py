@@ -0,0 +1,166 @@
+from jira_time_in_status import jira_time_in_status
+import pandas as pd
+import threading
+import time
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+MILLISECONDS_PER_DAY = 1000 * 60 * 60 * 24
+# Columns that need a lead time (Resolved is only set for issues with a lead time)
+LEAD_TIME_COLUMNS = ["Resolved", "Lead Time", "Lead Days", "Cycle Days"]
+
+
+class jira_transform(object):
+
+
+    def __init__(self, jira_config, get_statuses):
+        self.__config = jira_config
+        self.__time_in_status = jira_time_in_status(jira_config.time_in_status_buckets, get_statuses)
+        custom_fields = jira_config.custom_fields
+        self.__story_points_field = custom_fields["story_points"]
+        self.__story_point_estimate_field = custom_fields["story_point_estimate"]
+        self.__time_in_status_field = custom_fields["time_in_status"]
+        self.__timings = {}
+        self.__timings_lock = threading.Lock()
+
+
+    @property
+    def timings(self):
+        return dict(self.__timings)
+
+
+    @property
+    def time_in_status_columns(self):
+        return self.__time_in_status.buckets
+
+
+    def __add_timing(self, stage, start):
+        now = time.perf_counter()
+        with self.__timings_lock:
+            self.__timings[stage] = self.__timings.get(stage, 0) + (now - start)
+        return now
+
+
+    def __get_epic(self, fields):
+        epic_id, epic_name = "", ""
+        try:
+            parent = fields["parent"]
+            if parent:
+                epic_id = parent["key"]
+                epic_name = parent["fields"]["summary"]
+        except KeyError:
+            pass
+
+        return epic_id, epic_name
+
+
+    def __get_story_points(self, fields):
+        # for team-managed projects, story point estimate is now in custom field 16
+        story_points = fields[self.__story_points_field]
+        if not story_points:
+            story_points = fields[self.__story_point_estimate_field]
+        return story_points
+
+
+    def __calc_lead_times(self, created, resolved):
+        # The same float steps as int(timedelta.total_seconds() * 1000), so values match the original row by row calculation
+        created_dates = pd.to_datetime(pd.Series(created, dtype=object), format=DATE_FORMAT, utc=True)
+        resolved_dates = pd.to_datetime(pd.Series(resolved, dtype=object), format=DATE_FORMAT, utc=True)
+        microseconds = (resolved_dates - created_dates).to_numpy(dtype="timedelta64[us]").astype("int64")
+        lead_times = (microseconds / 1e6 * 1000).astype("int64")
+
+        is_resolved = resolved_dates.notna().to_numpy()
+        return lead_times.tolist(), is_resolved.tolist()
+
+
+    def __calc_days(self, milliseconds):
+        # Python's round() is used, numpy rounds some halves differently
+        return [round(days, 2) for days in (pd.Series(milliseconds, dtype="float64") / MILLISECONDS_PER_DAY).tolist()]
+
+
+    def get_fields(self, columns):
+        # The Jira fields needed to create the columns, custom field ids come from the configuration
+        column_fields = {
+            "Summary": ["summary"],
+            "Category": ["labels"],
+            "Team": ["labels"],
+            "Status": ["status"],
+            "Created": ["created"],
+            "Epic": ["parent"],
+            "Epic ID": ["parent"],
+            "Issue Type": ["issuetype"],
+            "Story Points": [self.__story_points_field, self.__story_point_estimate_field]
+        }
+        for column in LEAD_TIME_COLUMNS:
+            column_fields[column] = ["created", "resolutiondate"]
+        for column in self.__time_in_status.buckets + ["Cycle Days"]:
+            column_fields[column] = column_fields.get(column, []) + [self.__time_in_status_field]
+
+        fields = []
+        for column in columns:
+            for field in column_fields.get(column, []):
+                if field not in fields:
+                    fields.append(field)
+        return fields
+
+
+    def transform_page(self, issues, columns = None):
+        # Only the columns given (all of them by default) are set, the others are left empty
+        def needs(*needed):
+            return columns is None or any(column in columns for column in needed)
+
+        start = time.perf_counter()
+        blanks = [""] * len(issues)
+        fields = [issue["fields"] for issue in issues]
+        keys = [issue["key"] for issue in issues]
+        summaries = [issue_fields["summary"] for issue_fields in fields] if needs("Summary") else blanks
+        statuses = [issue_fields["status"]["name"] for issue_fields in fields] if needs("Status") else blanks
+        issue_types = [issue_fields["issuetype"]["name"] for issue_fields in fields] if needs("Issue Type") else blanks
+        created = [issue_fields["created"] for issue_fields in fields] if needs("Created", *LEAD_TIME_COLUMNS) else blanks
+        resolved = [issue_fields["resolutiondate"] for issue_fields in fields] if needs(*LEAD_TIME_COLUMNS) else blanks
+        epics = [self.__get_epic(issue_fields) for issue_fields in fields] if needs("Epic", "Epic ID") else [("", "")] * len(issues)
+        story_points = [self.__get_story_points(issue_fields) for issue_fields in fields] if needs("Story Points") else blanks
+        start = self.__add_timing("fields", start)
+
+        categories, teams = blanks, blanks
+        if needs("Category", "Team"):
+            categories, teams = [], []
+            for key, issue_fields in zip(keys, fields):
+                category, team = self.__config.resolve(key, issue_fields["labels"])
+                categories.append(category)
+                teams.append(team)
+        start = self.__add_timing("lookups", start)
+
+        empty_times = [""] * len(self.__time_in_status.buckets)
+        if needs("Cycle Days", *self.__time_in_status.buckets):
+            times_in_status = [self.__time_in_status.decode(issue_fields[self.__time_in_status_field]) for issue_fields in fields]
+        else:
+            times_in_status = [empty_times] * len(issues)
+        start = self.__add_timing("statuses", start)
+
+        lead_times, is_resolved, lead_days, to_do_days = blanks, [False] * len(issues), blanks, blanks
+        if needs(*LEAD_TIME_COLUMNS):
+            lead_times, is_resolved = self.__calc_lead_times(created, resolved)
+            lead_days = self.__calc_days(lead_times)
+            # "To Do" is always the first bucket
+            to_do_days = self.__calc_days([times[0] if times[0] else 0 for times in times_in_status])
+        start = self.__add_timing("durations", start)
+
+        rows = []
+        for index in range(len(issues)):
+            times = times_in_status[index]
+            to_do = times[0]
+            resolution_date, lead_time, lead_day, cycle_days = "", "", "", ""
+            if is_resolved[index]:
+                # The date part of the string is the date in the timezone Jira returned
+                resolution_date = resolved[index][0:10]
+                lead_time = lead_times[index]
+                lead_day = lead_days[index]
+                if to_do:
+                    cycle_days = lead_day - to_do_days[index]
+
+            epic_id, epic_name = epics[index]
+            rows.append([keys[index], summaries[index], categories[index], teams[index], statuses[index], created[index][0:10], resolution_date,
+                         epic_name, epic_id, issue_types[index], story_points[index], lead_time] + times + [lead_day, cycle_days])
+        self.__add_timing("rows", start)
+
+        return rows
\ No newline at end of file
@@ -0,0 +1,64 @@
+import unittest
+import json
+import csv
+import io
+from jira_config import jira_config
+from jira_transform import jira_transform
+
+
+class jira_transform_test(unittest.TestCase):
+
+
+    def setUp(self):
+        with open("test_issues.json", "r", encoding="UTF-8") as issues_file:
+            test_data = json.load(issues_file)
+        self.issues = test_data["issues"]
+        statuses = {status["id"]: status["name"] for status in test_data["statuses"]}
+        self.transform = jira_transform(jira_config("test_conf.yaml"), lambda: statuses)
+
+
+    def __to_csv(self, rows):
+        output = io.StringIO(newline='')
+        csv.writer(output).writerows(rows)
+        return output.getvalue()
+
+
+    def test_rows_match_expected_csv(self):
+        with open("test_tickets.csv", "r", newline='', encoding="UTF-8") as expected_file:
+            expected = expected_file.read().split("\r\n", 1)[1]
+
+        actual = self.__to_csv(self.transform.transform_page(self.issues))
+        self.assertEqual(actual, expected)
+
+
+    def test_dates_use_timezone_returned_by_jira(self):
+        actual = self.transform.transform_page(self.issues[0:1])[0]
+        self.assertEqual(actual[5:7], ["2021-03-31", "2021-04-02"])
+
+
+    def test_empty_page_returns_no_rows(self):
+        actual = self.transform.transform_page([])
+        self.assertEqual(actual, [])
+
+
+    def test_timings_recorded_for_each_stage(self):
+        self.transform.transform_page(self.issues)
+        actual = list(self.transform.timings)
+        self.assertEqual(actual, ["fields", "lookups", "statuses", "durations", "rows"])
+
+
+
+    def test_only_fields_for_columns_requested(self):
+        actual = self.transform.get_fields(["Key", "Status", "Epic", "Epic ID"])
+        self.assertEqual(actual, ["status", "parent"])
+
+
+    def test_columns_not_requested_left_empty(self):
+        issues = [{"key": issue["key"], "fields": {"status": issue["fields"]["status"]}} for issue in self.issues[0:1]]
+        actual = self.transform.transform_page(issues, {"Key", "Status"})[0]
+        self.assertEqual(actual[0:5], [self.issues[0]["key"], "", "", "", self.issues[0]["fields"]["status"]["name"]])
+        self.assertEqual(set(actual[5:]), {""})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
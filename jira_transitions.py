@@ -0,0 +1,66 @@
+import sqlite3
+import os.path
+import os
+
+
+class jira_transitions(object):
+    # Keyed by issue, can share a database file with jira_store
+    __create_issues = "CREATE TABLE IF NOT EXISTS changelog_issues (key TEXT PRIMARY KEY, id TEXT, updated TEXT) WITHOUT ROWID"
+    __create_transitions = "CREATE TABLE IF NOT EXISTS transitions (key TEXT, position INTEGER, changed TEXT, from_status TEXT, to_status TEXT, PRIMARY KEY (key, position)) WITHOUT ROWID"
+    __select_transitions = "SELECT key AS \"Key\", position AS \"Position\", changed AS \"Changed\", from_status AS \"From\", to_status AS \"To\" FROM transitions"
+
+
+    def __init__(self, filename):
+        folder = os.path.dirname(filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.__filename = filename
+        self.__connection = sqlite3.connect(filename, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        with self.__connection:
+            self.__connection.execute(self.__create_issues)
+            self.__connection.execute(self.__create_transitions)
+
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    def close(self):
+        self.__connection.close()
+
+
+    def get_updated(self):
+        # The "updated" date of each issue when its changelog was last fetched
+        return dict(self.__connection.execute("SELECT key, updated FROM changelog_issues"))
+
+
+    def save_transitions(self, issues, transitions):
+        # issues is a list of (key, id, updated), transitions has a list of (changed, from status, to status) for each key
+        with self.__connection:
+            self.__connection.executemany("DELETE FROM transitions WHERE key = ?", ((key,) for key, _, _ in issues))
+            self.__connection.executemany("INSERT INTO transitions (key, position, changed, from_status, to_status) VALUES (?, ?, ?, ?, ?)",
+                                          ((key, position, changed, from_status, to_status)
+                                           for key, _, _ in issues for position, (changed, from_status, to_status) in enumerate(transitions.get(key, []))))
+            self.__connection.executemany("INSERT OR REPLACE INTO changelog_issues (key, id, updated) VALUES (?, ?, ?)", issues)
+
+
+    def read_transitions(self, keys = None):
+        import pandas as pd
+
+        if keys is None:
+            query = self.__select_transitions + " ORDER BY key, position"
+            return pd.read_sql_query(query, self.__connection, parse_dates=["Changed"])
+
+        # Only the issues given, in batches to stay under SQLite's limit on parameters
+        keys = list(keys)
+        batches = []
+        for index in range(0, len(keys), 500):
+            batch = keys[index:index + 500]
+            query = "{0} WHERE key IN ({1}) ORDER BY key, position".format(self.__select_transitions, ", ".join("?" for _ in batch))
+            batches.append(pd.read_sql_query(query, self.__connection, params=batch, parse_dates=["Changed"]))
+        if len(batches) == 0:
+            return pd.read_sql_query(self.__select_transitions + " WHERE 0", self.__connection)
+        return pd.concat(batches, ignore_index=True)
\ No newline at end of file
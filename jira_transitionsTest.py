@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+import os.path
+from jira_transitions import jira_transitions
+
+UPDATED = "2021-06-01T10:00:00.000+0000"
+CHANGES = {"ABC-1": [("2021-05-01T09:00:00.000+00:00", "To Do", "In Progress"), ("2021-05-03T12:30:00.000+00:00", "In Progress", "Done")],
+           "ABC-2": []}
+
+
+class jira_transitions_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.transitions = jira_transitions(os.path.join(self.folder.name, "transitions.db"))
+        self.transitions.save_transitions([("ABC-1", "10001", UPDATED), ("ABC-2", "10002", None)], CHANGES)
+
+
+    def tearDown(self):
+        self.transitions.close()
+        self.folder.cleanup()
+
+
+    def test_updated_date_saved_for_each_issue(self):
+        actual = self.transitions.get_updated()
+        self.assertEqual(actual, {"ABC-1": UPDATED, "ABC-2": None})
+
+
+    def test_transitions_read_in_order(self):
+        actual = self.transitions.read_transitions()
+        self.assertEqual(list(actual["To"]), ["In Progress", "Done"])
+        self.assertEqual(list(actual["Position"]), [0, 1])
+
+
+    def test_transitions_replaced_when_saved_again(self):
+        self.transitions.save_transitions([("ABC-1", "10001", UPDATED)], {"ABC-1": [("2021-05-04T08:00:00.000+00:00", "Done", "To Do")]})
+        actual = self.transitions.read_transitions(["ABC-1"])
+        self.assertEqual(list(actual["From"]), ["Done"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
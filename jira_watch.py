@@ -0,0 +1,187 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from datetime import datetime, timezone
+from jira_data import jira_data
+import threading
+import hashlib
+import json
+import time
+
+
+class jira_watch(object):
+    __default_settings = {
+        "interval": 900,
+        "filters": None,
+        "report": True,
+        "epics": False,
+        "host": "127.0.0.1",
+        "port": 8765
+    }
+
+
+    def __init__(self, jira_config):
+        self.__config = jira_config
+        self.__settings = dict(self.__default_settings)
+        self.__settings.update(jira_config.watch_settings)
+
+        # One extractor is kept for the life of the watch, so the HTTP session and statuses are reused
+        self.__jira_query = jira_data(jira_config)
+        self.__stop = threading.Event()
+        self.__lock = threading.Lock()
+        self.__server = None
+        self.__status = {
+            "started": datetime.now(timezone.utc).isoformat(),
+            "cycles": 0,
+            "next_refresh": None,
+            "filters": {}
+        }
+
+
+    @property
+    def status(self):
+        with self.__lock:
+            return json.loads(json.dumps(self.__status))
+
+
+    @property
+    def url(self):
+        # The status server's address, None until it's started
+        if self.__server is None:
+            return None
+        return "http://{0}:{1}".format(*self.__server.server_address[0:2])
+
+
+    def __get_filter_ids(self):
+        filters = self.__settings["filters"]
+        if filters is None:
+            return self.__config.filter_ids
+
+        # Filters can be listed by name or id
+        return [self.__config.find_filter_id(filter) or filter for filter in filters]
+
+
+    def __get_data_hash(self, filename, filter_name):
+        data_hash = hashlib.sha256()
+        if filename:
+            with open(filename, "rb") as data_file:
+                for block in iter(lambda: data_file.read(1024 * 1024), b""):
+                    data_hash.update(block)
+        elif self.__jira_query.store:
+            data_hash.update(self.__jira_query.store.get_filter_hash(filter_name).encode())
+        else:
+            return None
+
+        return data_hash.hexdigest()
+
+
+    def __create_outputs(self, filename, filter_name):
+        # pandas and matplotlib stay loaded between refreshes
+        if self.__settings["report"]:
+            from jira_graph import jira_graph
+            plotter = jira_graph(self.__config)
+            if filename:
+                plotter.create_ticket_graphs_by_team(filename, self.__config.teams)
+            else:
+                plotter.create_ticket_graphs_from_store(self.__jira_query.store, filter_name, self.__config.teams)
+
+        if self.__settings["epics"]:
+            from jira_epic import jira_epic
+            epic = jira_epic(self.__config)
+            if filename:
+                epic.get_filter_data_and_plot(filename)
+            else:
+                epic.get_store_data_and_plot(self.__jira_query.store, filter_name)
+
+
+    def __refresh_filter(self, filter_id):
+        with self.__lock:
+            filter_status = self.__status["filters"].setdefault(str(filter_id), {"data_hash": None, "changes": 0})
+            last_hash = filter_status["data_hash"]
+
+        start = time.perf_counter()
+        update = {"last_refresh": datetime.now(timezone.utc).isoformat(), "error": None}
+        try:
+            filename = self.__jira_query.save_filter_data(filter_id)
+            filter_name = self.__jira_query.filter_name
+            update["name"] = filter_name
+            update["extract_seconds"] = round(time.perf_counter() - start, 3)
+
+            data_hash = self.__get_data_hash(filename, filter_name) if filter_name else None
+            if data_hash is None:
+                update["error"] = "Extract failed"
+            elif data_hash != last_hash:
+                # Only regenerate the graphs when the extracted tickets have changed
+                self.__create_outputs(filename, filter_name)
+                update["data_hash"] = data_hash
+                update["last_change"] = update["last_refresh"]
+            else:
+                print("No changes for filter {0}".format(filter_id))
+        except Exception as err:
+            # Keep watching, the error is shown in the status
+            print("Failed to refresh filter {0} - {1}".format(filter_id, err))
+            update["error"] = str(err)
+
+        update["refresh_seconds"] = round(time.perf_counter() - start, 3)
+        with self.__lock:
+            if "last_change" in update:
+                filter_status["changes"] += 1
+            filter_status.update(update)
+
+
+    def refresh(self):
+        for filter_id in self.__get_filter_ids():
+            if self.__stop.is_set():
+                break
+            self.__refresh_filter(filter_id)
+
+        with self.__lock:
+            self.__status["cycles"] += 1
+
+
+    def __start_server(self):
+        watch = self
+
+        class status_handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.rstrip("/") not in ["", "/status"]:
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(watch.status, indent=2).encode("UTF-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer((self.__settings["host"], self.__settings["port"]), status_handler)
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        print("Status available at http://{0}:{1}/status".format(self.__settings["host"], self.__server.server_port))
+
+
+    def run(self, cycles = None):
+        # Refreshes every filter, then waits for the interval, until stopped (or the number of cycles is reached)
+        if self.__settings["port"] is not None:
+            self.__start_server()
+
+        try:
+            while not self.__stop.is_set():
+                self.refresh()
+                if cycles is not None and self.__status["cycles"] >= cycles:
+                    break
+
+                next_refresh = time.time() + self.__settings["interval"]
+                with self.__lock:
+                    self.__status["next_refresh"] = datetime.fromtimestamp(next_refresh, timezone.utc).isoformat()
+                self.__stop.wait(self.__settings["interval"])
+        finally:
+            if self.__server:
+                self.__server.shutdown()
+                self.__server.server_close()
+
+
+    def stop(self):
+        self.__stop.set()
\ No newline at end of file
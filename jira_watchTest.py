@@ -0,0 +1,103 @@
+import unittest
+import threading
+import tempfile
+import urllib.request
+import urllib.error
+import json
+import glob
+import time
+import os
+import os.path
+import yaml
+from jira_standin import jira_standin
+from jira_config import jira_config
+from jira_watch import jira_watch
+
+
+class jira_watch_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+        self.standin = jira_standin({"size": 200})
+        self.standin.start()
+
+
+    def tearDown(self):
+        self.standin.stop()
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+
+    def __create_watch(self, watch_settings):
+        config = {
+            "jira": {"url": self.standin.url, "user": "user", "token": "token"},
+            "request": {"max_retries": 0},
+            "team": {"team1": "Team 1", "team2": "Team 2"},
+            "category": {"bau": "BAU,tab:blue", "project": "Project,peru"},
+            "status": {"Done": "tab:green"},
+            "filter": {"stand_in": 1},
+            "watch": watch_settings
+        }
+        with open("jira_conf.yaml", "w") as config_file:
+            yaml.safe_dump(config, config_file)
+        return jira_watch(jira_config())
+
+
+    def __find_outputs(self):
+        return glob.glob(os.path.join("data", "**", "*.png"), recursive=True)
+
+
+    def test_outputs_only_created_when_data_changes(self):
+        watch = self.__create_watch({"port": None})
+        watch.refresh()
+        created = self.__find_outputs()
+        for filename in created:
+            os.remove(filename)
+
+        watch.refresh()
+        actual = watch.status
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(self.__find_outputs(), [])
+        self.assertEqual((actual["cycles"], actual["filters"]["1"]["changes"], actual["filters"]["1"]["error"]), (2, 1, None))
+
+
+    def test_error_shown_when_extract_fails(self):
+        # Connections to the stopped stand-in are refused
+        watch = self.__create_watch({"port": None, "report": False})
+        self.standin.stop()
+
+        watch.refresh()
+        actual = watch.status
+
+        self.assertIsNotNone(actual["filters"]["1"]["error"])
+        self.assertEqual((actual["cycles"], actual["filters"]["1"]["changes"], actual["filters"]["1"]["data_hash"]), (1, 0, None))
+
+
+    def test_status_returned_by_server(self):
+        watch = self.__create_watch({"port": 0, "report": False, "interval": 3600})
+        thread = threading.Thread(target=watch.run)
+        thread.start()
+        try:
+            for _ in range(100):
+                if watch.status["cycles"] == 1:
+                    break
+                time.sleep(0.1)
+            with urllib.request.urlopen("{0}/status".format(watch.url)) as response:
+                actual = json.loads(response.read())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen("{0}/unknown".format(watch.url))
+        finally:
+            watch.stop()
+            thread.join()
+
+        self.assertEqual(actual["cycles"], 1)
+        self.assertEqual((actual["filters"]["1"]["name"], actual["filters"]["1"]["changes"], actual["filters"]["1"]["error"]), ("Stand-in 1", 1, None))
+        self.assertIsNotNone(actual["next_refresh"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+import math
+import os.path
+import yaml
+
+
+def find_missing_keys(previous_rows, changed_rows, filter_keys):
+    # Issues in the filter that weren't in the last extract and haven't been updated since, in the filter's order
+    changed_keys = set(row[0] for row in changed_rows)
+    return [key for key in filter_keys if key not in previous_rows and key not in changed_keys]
+
+
+def merge_rows(previous_rows, new_rows, filter_keys):
+    # New rows replace the issue's previous row, issues no longer in the filter are dropped. Returns the rows in the filter's order and the number removed
+    rows_by_key = dict(previous_rows)
+    for row in new_rows:
+        rows_by_key[row[0]] = row
+
+    removed = len(set(previous_rows) - set(filter_keys))
+    return [rows_by_key[key] for key in filter_keys if key in rows_by_key], removed
+
+
+class jira_watermark(object):
+    __watermark_file = "{0}//watermark.yaml"
+
+
+    def __init__(self, path):
+        self.__filename = self.__watermark_file.format(path)
+        self.__values = {}
+        if os.path.exists(self.__filename):
+            with open(self.__filename, "r") as watermark_file:
+                self.__values = yaml.safe_load(watermark_file) or {}
+
+
+    def is_valid_for(self, jql):
+        # A changed filter could include issues that haven't been updated, so a full extract is needed
+        return self.__values.get("jql") == jql and "extracted" in self.__values
+
+
+    @property
+    def snapshot(self):
+        return self.__values.get("snapshot")
+
+
+    def minutes_since(self, overlap_minutes):
+        extracted = datetime.fromisoformat(self.__values["extracted"])
+        elapsed = datetime.now(timezone.utc) - extracted
+        return math.ceil(elapsed.total_seconds() / 60) + overlap_minutes
+
+
+    def save(self, jql, extracted, snapshot):
+        self.__values = {"jql": jql, "extracted": extracted.isoformat(), "snapshot": snapshot}
+        with open(self.__filename, "w") as watermark_file:
+            yaml.safe_dump(self.__values, watermark_file)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+from datetime import datetime, timedelta, timezone
+from jira_watermark import jira_watermark, find_missing_keys, merge_rows
+
+JQL = "project = ABC ORDER BY Rank"
+PREVIOUS = {"ABC-1": ["ABC-1", "First", "To Do"], "ABC-2": ["ABC-2", "Second", "To Do"], "ABC-3": ["ABC-3", "Third", "Done"]}
+
+
+class jira_watermark_test(unittest.TestCase):
+
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    def __save(self, extracted):
+        jira_watermark(self.folder.name).save(JQL, extracted, "2021_06_01_tickets.csv")
+        return jira_watermark(self.folder.name)
+
+
+    def test_no_watermark_is_not_valid(self):
+        self.assertFalse(jira_watermark(self.folder.name).is_valid_for(JQL))
+
+
+    def test_saved_watermark_valid_for_same_jql(self):
+        watermark = self.__save(datetime.now(timezone.utc))
+        self.assertTrue(watermark.is_valid_for(JQL))
+        self.assertEqual(watermark.snapshot, "2021_06_01_tickets.csv")
+
+
+    def test_changed_jql_is_not_valid(self):
+        watermark = self.__save(datetime.now(timezone.utc))
+        self.assertFalse(watermark.is_valid_for("project = ABC AND status = Done ORDER BY Rank"))
+
+
+    def test_minutes_since_rounded_up_with_overlap(self):
+        watermark = self.__save(datetime.now(timezone.utc) - timedelta(minutes=29, seconds=30))
+        self.assertEqual(watermark.minutes_since(10), 40)
+
+
+    def test_changed_rows_replace_previous_rows(self):
+        changed = [["ABC-2", "Second", "Done"]]
+        actual, removed = merge_rows(PREVIOUS, changed, ["ABC-1", "ABC-2", "ABC-3"])
+        self.assertEqual(actual, [PREVIOUS["ABC-1"], ["ABC-2", "Second", "Done"], PREVIOUS["ABC-3"]])
+        self.assertEqual(removed, 0)
+
+
+    def test_previous_rows_not_changed_by_merge(self):
+        merge_rows(PREVIOUS, [["ABC-2", "Second", "Done"]], ["ABC-1", "ABC-2", "ABC-3"])
+        self.assertEqual(PREVIOUS["ABC-2"], ["ABC-2", "Second", "To Do"])
+
+
+    def test_missing_keys_are_new_to_the_filter_and_not_changed(self):
+        changed = [["ABC-5", "Fifth", "To Do"]]
+        actual = find_missing_keys(PREVIOUS, changed, ["ABC-4", "ABC-1", "ABC-5", "ABC-2", "ABC-6"])
+        self.assertEqual(actual, ["ABC-4", "ABC-6"])
+
+
+    def test_added_rows_included_in_filter_order(self):
+        added = [["ABC-4", "Fourth", "To Do"]]
+        actual, _ = merge_rows(PREVIOUS, added, ["ABC-4", "ABC-1", "ABC-2", "ABC-3"])
+        self.assertEqual([row[0] for row in actual], ["ABC-4", "ABC-1", "ABC-2", "ABC-3"])
+
+
+    def test_keys_missing_from_sweep_removed(self):
+        changed = [["ABC-1", "First", "Done"]]
+        actual, removed = merge_rows(PREVIOUS, changed, ["ABC-3", "ABC-1"])
+        self.assertEqual(actual, [PREVIOUS["ABC-3"], ["ABC-1", "First", "Done"]])
+        self.assertEqual(removed, 1)
+
+
+    def test_changed_row_outside_filter_not_included(self):
+        changed = [["ABC-9", "Moved", "Done"]]
+        actual, _ = merge_rows(PREVIOUS, changed, ["ABC-1", "ABC-2", "ABC-3"])
+        self.assertEqual([row[0] for row in actual], ["ABC-1", "ABC-2", "ABC-3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,29 +1,62 @@
-from jira_config import jira_config
-from jira_data import jira_data
-from jira_graph import jira_graph
+from jira_config import get_lookup
 import sys
 
-jira_lookup = jira_config()
 
-
-def extract_csv_data_and_plot(filename, teams):
-    plotter = jira_graph(jira_lookup)
+def extract_csv_data_and_plot(filename, teams, export_format = None):
+    # pandas and matplotlib are only imported when a graph is created
+    from jira_graph import jira_graph
+    plotter = jira_graph(get_lookup(), export_format)
     plotter.create_ticket_graphs_by_team(filename, teams)
 
 
-def get_filter_data_and_plot(filter_id, teams):
-    jira_query = jira_data(jira_lookup)
+def extract_store_data_and_plot(filter_name, teams, export_format = None):
+    from jira_graph import jira_graph
+    from jira_store import jira_store
+
+    store_path = get_lookup().store_settings.get("path")
+    if store_path:
+        plotter = jira_graph(get_lookup(), export_format)
+        plotter.create_ticket_graphs_from_store(jira_store(store_path), filter_name, teams)
+    else:
+        print("Error: no store is configured")
+
+
+def get_filter_data_and_plot(filter_id, teams, export_format = None):
+    from jira_data import jira_data
+    jira_query = jira_data(get_lookup())
     filename = jira_query.save_filter_data(filter_id)
 
-    extract_csv_data_and_plot(filename, teams)
+    if len(filename) == 0 and jira_query.filter_name:
+        # The .CSV export is turned off, so use the store
+        extract_store_data_and_plot(jira_query.filter_name, teams, export_format)
+    else:
+        extract_csv_data_and_plot(filename, teams, export_format)
+
+
+def get_filters_data_and_plot(filter_ids, teams, export_format = None):
+    # Tickets in more than one of the filters are only extracted once
+    from jira_data import jira_data
+    jira_query = jira_data(get_lookup())
+    for filter_name, filename in jira_query.save_filters_data(filter_ids):
+        if len(filename) == 0:
+            extract_store_data_and_plot(filter_name, teams, export_format)
+        else:
+            extract_csv_data_and_plot(filename, teams, export_format)
 
 
 def get_filter_id(filter_param):
     # Try to lookup as filter name, otherwise assume it's an id
-    filter_id = jira_lookup.find_filter_id(filter_param)
+    filter_id = get_lookup().find_filter_id(filter_param)
     return filter_id if filter_id else filter_param
 
 
+def get_filter_ids(filters_param = None):
+    # All the configured filters, or a comma separated list of filter names or ids
+    if filters_param is None:
+        return get_lookup().filter_ids
+    return [get_filter_id(filter_param.strip()) for filter_param in filters_param.split(",")]
+
+
 def parse_teams(configured_teams, teams):
     teams_to_show = []
     for team_name in teams:
@@ -41,7 +74,7 @@ def parse_teams(configured_teams, teams):
 
 
 def get_default_filter_id():
-    filter_id = jira_lookup.first_filter_id
+    filter_id = get_lookup().first_filter_id
     if filter_id:
         return filter_id
     else:
@@ -56,32 +89,51 @@ def show_usage():
     print("  report.py -t \"<teams>\"")
     print("  report.py -f \"<csv_filename>\"")
     print("  report.py -f \"<csv_filename>\" \"<teams>\"")
+    print("  report.py -s \"<filter_name>\"")
+    print("  report.py -s \"<filter_name>\" \"<teams>\"")
+    print("  report.py -b")
+    print("  report.py -b \"<filters>\"")
+    print("  report.py -e <xlsx|csv|parquet|json|none> <any of the above options>")
 
 
-def main():
-    configured_teams = jira_lookup.teams
+def main(args = None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) == 1 and (args[0] == "-h" or args[0] == "-help"):
+        show_usage()
+        return
+
+    configured_teams = get_lookup().teams
+    export_format = None
+    if len(args) >= 2 and args[0] == "-e":
+        # Choose how the report data is saved, "none" only creates the graph
+        export_format = args[1]
+        args = args[2:]
 
-    args = sys.argv[1:]
     if len(args) == 0:
         # Try using the first filter configured
-        get_filter_data_and_plot(get_default_filter_id(), configured_teams)
+        get_filter_data_and_plot(get_default_filter_id(), configured_teams, export_format)
+    elif len(args) == 1 and args[0] == "-b":
+        get_filters_data_and_plot(get_filter_ids(), configured_teams, export_format)
     elif len(args) == 1:
-        if args[0] == "-h" or args[0] == "-help":
-            show_usage()
-        else:
-            # Assume filter id passed
-            get_filter_data_and_plot(get_filter_id(args[0]), configured_teams)
+        # Assume filter id passed
+        get_filter_data_and_plot(get_filter_id(args[0]), configured_teams, export_format)
     elif len(args) == 2:
         if args[0] == "-t":
-            get_filter_data_and_plot(get_default_filter_id(), parse_teams(configured_teams, args[1].split(",")))
+            get_filter_data_and_plot(get_default_filter_id(), parse_teams(configured_teams, args[1].split(",")), export_format)
         elif args[0] == "-f":
-            extract_csv_data_and_plot(args[1], configured_teams)
+            extract_csv_data_and_plot(args[1], configured_teams, export_format)
+        elif args[0] == "-s":
+            extract_store_data_and_plot(args[1], configured_teams, export_format)
+        elif args[0] == "-b":
+            get_filters_data_and_plot(get_filter_ids(args[1]), configured_teams, export_format)
         else:
             # Assume filter id and teams passed
-            get_filter_data_and_plot(get_filter_id(args[0]), parse_teams(configured_teams, args[1].split(",")))
+            get_filter_data_and_plot(get_filter_id(args[0]), parse_teams(configured_teams, args[1].split(",")), export_format)
     elif len(args) == 3:
         if args[0] == "-f":
-            extract_csv_data_and_plot(args[1], parse_teams(configured_teams, args[2].split(",")))
+            extract_csv_data_and_plot(args[1], parse_teams(configured_teams, args[2].split(",")), export_format)
+        elif args[0] == "-s":
+            extract_store_data_and_plot(args[1], parse_teams(configured_teams, args[2].split(",")), export_format)
         else:
             print("Unknown args: " + str(args))
             show_usage()
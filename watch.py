@@ -0,0 +1,31 @@
+from jira_config import get_lookup
+import sys
+
+
+def show_usage():
+    print("Usage:\r\n======")
+    print("  watch.py")
+    print("  watch.py -n <cycles>")
+
+
+def main(args = None):
+    args = sys.argv[1:] if args is None else args
+    cycles = None
+    if len(args) == 2 and args[0] == "-n" and args[1].isdigit():
+        cycles = int(args[1])
+    elif len(args) > 0:
+        show_usage()
+        return
+
+    # Imported here so showing the usage doesn't load pandas
+    from jira_watch import jira_watch
+    watch = jira_watch(get_lookup())
+    try:
+        watch.run(cycles)
+    except KeyboardInterrupt:
+        watch.stop()
+        print("Stopped watching")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file